@@ -0,0 +1,170 @@
+"""Times calendar loading, expansion, filtering and calendar_events tool on synthetic calendars.
+
+Run from repository root, results are written as JSON so runs of different versions can be compared:
+
+    python -m benchmarks.calendar_benchmark --events 2000 --calendars 3 --parse-workers 1 3 --output calendar.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+from src.pkg.my_calendar import Calendar
+from src.tools.my_calendar import CalendarEventTool
+from .ics_generator import CalendarSpec, generate_ics
+
+
+def calendar_options(directory: str, calendars: int, parse_workers: int) -> dict:
+    return {
+        "ics": [
+            {
+                "type": "zip_dir", "directory": directory, "file": f"calendar{i}", "calendar_name": f"calendar{i}",
+                "name": f"Calendar {i}", "private": False, "origin": "benchmark",
+            }
+            for i in range(calendars)
+        ],
+        "cache": {"enabled": "Yes", "file": os.path.join(directory, "calendar_cache.json")},
+        "days": 7,
+        "filter_status": ["CONFIRMED"],
+        "ignore_event_names": ["Synthetic event 0"],
+        "emails": ["person1@example.com", "person2@example.com"],
+        "parse_workers": parse_workers,
+    }
+
+
+# methods get_events calls, timed inside it so the benchmark runs the real code path
+GET_EVENTS_STEPS: List[str] = ["load_cache", "load_ics_files", "load_calendar_events", "save_cache"]
+
+
+def timed(results: Dict[str, float], name: str, func: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    value = func()
+    results[name] = round(results.get(name, 0.0) + time.perf_counter() - started, 6)
+    return value
+
+
+def add_timing_hooks(calendar: Calendar, results: Dict[str, Any]) -> Calendar:
+    """Wraps steps of Calendar.get_events on this instance, their times are added to results."""
+    def hook(name: str, method: Callable) -> Callable:
+        def timed_method(*args, **kwargs):
+            return timed(results, name, lambda: method(*args, **kwargs))
+        return timed_method
+
+    for name in GET_EVENTS_STEPS:
+        setattr(calendar, name, hook(name, getattr(calendar, name)))
+    return calendar
+
+
+def run_steps(calendar: Calendar) -> Dict[str, Any]:
+    """Calendar.get_events with its steps timed, filtering, then calendar_events tool end to end."""
+    results: Dict[str, Any] = {}
+    add_timing_hooks(calendar, results)
+    try:
+        events = timed(results, "get_events", calendar.get_events)
+    finally:
+        for name in GET_EVENTS_STEPS:
+            delattr(calendar, name)
+    results["filtered_events"] = len(timed(results, "filter_and_sort_events", calendar.filter_and_sort_events))
+    results["events"] = len(events)
+    timed(results, "tool_today", lambda: CalendarEventTool(calendar=calendar)._run("today"))
+    timed(results, "tool_next_week", lambda: CalendarEventTool(calendar=calendar)._run(
+        (datetime.date.today() + datetime.timedelta(days=7)).isoformat()
+    ))
+    return results
+
+
+def run(spec: CalendarSpec, calendars: int = 1, repeat: int = 3, parse_workers: int = 1) -> Dict[str, Any]:
+    state = SimpleNamespace(is_quiet=True)
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        for i in range(calendars):
+            with open(os.path.join(directory, f"calendar{i}.ics"), "w", encoding="utf-8") as f:
+                f.write(generate_ics(spec.model_copy(update={"seed": spec.seed + i}), name=f"calendar{i}"))
+        generate_seconds = time.perf_counter() - started
+        options = calendar_options(directory, calendars, parse_workers)
+
+        cold, warm, hot = [], [], []
+        for _ in range(repeat):
+            if os.path.exists(options["cache"]["file"]):
+                os.remove(options["cache"]["file"])
+            # cold: nothing parsed, no cache file
+            calendar = Calendar(state, options)
+            cold.append(run_steps(calendar))
+            calendar.close()
+            # warm: new process would start like this, cache file is there
+            calendar = Calendar(state, options)
+            warm.append(run_steps(calendar))
+            # hot: same instance asked again during conversation
+            hot.append(run_steps(calendar))
+            calendar.close()
+
+    return {
+        "generate_seconds": round(generate_seconds, 6),
+        "cold": summarize(cold),
+        "warm": summarize(warm),
+        "hot": summarize(hot),
+    }
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Best time of every step, counts are taken from the first run."""
+    return {key: min(run[key] for run in runs) if isinstance(value, float) else value for key, value in runs[0].items()}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic calendar benchmark")
+    parser.add_argument("--events", type=int, nargs="+", default=[1000], help="events per calendar, several sizes allowed")
+    parser.add_argument("--calendars", type=int, default=1)
+    parser.add_argument("--rrule-ratio", type=float, default=0.2)
+    parser.add_argument("--attendees", type=int, default=3)
+    parser.add_argument("--timezones", nargs="+", default=CalendarSpec().timezones)
+    parser.add_argument("--span-days", type=int, default=365)
+    parser.add_argument("--parse-workers", type=int, nargs="+", default=[1, 2], help="worker processes, several counts allowed")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="", help="JSON file, stdout when empty")
+    args = parser.parse_args()
+
+    results = []
+    for events in args.events:
+        spec = CalendarSpec(
+            events=events, rrule_ratio=args.rrule_ratio, attendees=args.attendees,
+            timezones=args.timezones, span_days=args.span_days,
+        )
+        for parse_workers in args.parse_workers:
+            results.append({
+                "spec": spec.model_dump(),
+                "calendars": args.calendars,
+                "parse_workers": parse_workers,
+                **run(spec, calendars=args.calendars, repeat=args.repeat, parse_workers=parse_workers),
+            })
+
+    report = {
+        "benchmark": "calendar",
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
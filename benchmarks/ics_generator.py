@@ -0,0 +1,63 @@
+import datetime
+import random
+from typing import List
+from pydantic import BaseModel
+
+DEFAULT_TIMEZONES: List[str] = ["UTC", "Europe/Riga", "America/New_York", "Asia/Tokyo"]
+
+
+class CalendarSpec(BaseModel):
+    """Shape of one synthetic calendar."""
+
+    events: int = 1000
+    # share of events that repeat
+    rrule_ratio: float = 0.2
+    attendees: int = 3
+    timezones: List[str] = DEFAULT_TIMEZONES
+    # single events are spread over this many days around today, series start inside it too
+    span_days: int = 365
+    emails: int = 50
+    seed: int = 1
+
+
+RULES: List[str] = [
+    "FREQ=DAILY",
+    "FREQ=WEEKLY",
+    "FREQ=WEEKLY;BYDAY=MO,WE,FR",
+    "FREQ=MONTHLY",
+    "FREQ=DAILY;COUNT=20",
+    "FREQ=WEEKLY;UNTIL={until}",
+]
+STATUSES: List[str] = ["CONFIRMED", "CONFIRMED", "CONFIRMED", "TENTATIVE", "CANCELLED"]
+
+
+def generate_ics(spec: CalendarSpec, name: str = "Synthetic", today: datetime.date = None) -> str:
+    """ICS text with `spec.events` VEVENTs, deterministic for the same spec and day."""
+    rng = random.Random(spec.seed)
+    today = today or datetime.date.today()
+    first_day = today - datetime.timedelta(days=spec.span_days // 2)
+    emails = [f"person{i}@example.com" for i in range(spec.emails)]
+
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//bobik//benchmark//EN", f"X-WR-CALNAME:{name}"]
+    for uid in range(spec.events):
+        day = first_day + datetime.timedelta(days=rng.randrange(spec.span_days))
+        start = datetime.datetime.combine(day, datetime.time(rng.randrange(7, 19), rng.choice([0, 15, 30, 45])))
+        end = start + datetime.timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 120]))
+        zone = rng.choice(spec.timezones)
+        time_format = "%Y%m%dT%H%M%S"
+
+        lines += ["BEGIN:VEVENT", f"UID:{name}-{uid}@benchmark", f"SUMMARY:{name} event {uid % 97}"]
+        if zone == "UTC":
+            lines += [f"DTSTART:{start:{time_format}}Z", f"DTEND:{end:{time_format}}Z"]
+        else:
+            lines += [f"DTSTART;TZID={zone}:{start:{time_format}}", f"DTEND;TZID={zone}:{end:{time_format}}"]
+        if rng.random() < spec.rrule_ratio:
+            until = (today + datetime.timedelta(days=spec.span_days // 2)).strftime("%Y%m%dT000000Z")
+            lines.append(f"RRULE:{rng.choice(RULES).format(until=until)}")
+        organizer = rng.choice(emails)
+        lines.append(f"ORGANIZER:mailto:{organizer}")
+        for attendee in rng.sample(emails, min(spec.attendees, len(emails))):
+            lines.append(f"ATTENDEE;ROLE=REQ-PARTICIPANT:mailto:{attendee}")
+        lines += [f"STATUS:{rng.choice(STATUSES)}", f"DESCRIPTION:Generated event {uid}", "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
@@ -16,8 +16,8 @@ def main() -> None:
 
     input_question = sys.argv[1:]
 
-    question: str = " ".join(input_question) + app.stdin_input()
-    app.conversation(questions=[question])
+    question: str = " ".join(input_question)
+    app.pipe_conversation(question=question)
 
     # example of programmatic use
     # app.tool_provider.add_tool(mytool())
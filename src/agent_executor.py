@@ -0,0 +1,56 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Union
+from pydantic import PrivateAttr
+from langchain.agents import AgentExecutor
+from langchain_core.agents import AgentAction, AgentFinish, AgentStep
+from langchain_core.callbacks import CallbackManagerForChainRun
+from langchain_core.tools import BaseTool
+from .deadline import Deadline
+
+
+class ParallelAgentExecutor(AgentExecutor):
+    """AgentExecutor that runs all tool calls planned in one step at the same time.
+
+    Native tool calling models often ask for several independent tools at once (weather and calendar).
+    Stock executor runs them one after another in sync mode, async mode already gathers them.
+    """
+
+    max_parallel_tools: int = 4
+    _pool: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    _planned: List[AgentAction] = PrivateAttr(default_factory=list)
+    _running: Dict[int, Future] = PrivateAttr(default_factory=dict)
+
+    def _iter_next_step(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        inputs: Dict[str, str],
+        intermediate_steps: List[tuple],
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> Iterator[Union[AgentFinish, AgentAction, AgentStep]]:
+        # parent yields every planned action before performing the first one
+        self._planned = []
+        self._running = {}
+        for step in super()._iter_next_step(name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager):
+            if isinstance(step, AgentAction):
+                self._planned.append(step)
+            yield step
+
+    def _perform_agent_action(
+        self,
+        name_to_tool_map: Dict[str, BaseTool],
+        color_mapping: Dict[str, str],
+        agent_action: AgentAction,
+        run_manager: Optional[CallbackManagerForChainRun] = None,
+    ) -> AgentStep:
+        if len(self._planned) < 2 or id(agent_action) not in {id(action) for action in self._planned}:
+            return super()._perform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+
+        if not self._running:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_parallel_tools, thread_name_prefix="agent-tool")
+            for action in self._planned:
+                self._running[id(action)] = self._pool.submit(
+                    Deadline.bind(super()._perform_agent_action), name_to_tool_map, color_mapping, action, run_manager
+                )
+        return self._running.pop(id(agent_action)).result()
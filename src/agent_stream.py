@@ -0,0 +1,91 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from langchain_core.agents import AgentAction
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGenerationChunk, GenerationChunk
+from .deadline import Deadline
+
+# Text after these markers in ReAct output is the final answer.
+REACT_ANSWER_PREFIXES: List[str] = ["AI:", "Final Answer:"]
+
+
+class AgentStream(BaseCallbackHandler):
+    """Runs agent in background thread and yields final answer tokens as LLM produces them.
+
+    Tokens of every LLM call are buffered until one of `prefixes` shows up, everything after it is the answer.
+    Empty prefix is for tool calling agents, their tokens are yielded as they arrive. Once a chunk carries tool call
+    chunks the call is a tool step, not an answer, and the rest of its text is dropped.
+    Agent steps are reported to `on_step` as compact one-liners. If nothing was streamed, final output is yielded whole.
+    """
+
+    _END = object()
+
+    def __init__(self, prefixes: List[str], on_step: Callable[[str], None] = None):
+        self.prefixes = prefixes
+        self.on_step = on_step
+        self.streamed: bool = False
+        self._queue: queue.Queue = queue.Queue()
+        self._buffer: str = ""
+        self._in_answer: bool = False
+        self._calls_tools: bool = False
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], **kwargs: Any) -> None:
+        self._buffer = ""
+        self._in_answer = False
+        self._calls_tools = False
+
+    def on_llm_new_token(self, token: str, *, chunk: Optional[GenerationChunk | ChatGenerationChunk] = None, **kwargs: Any) -> None:
+        if getattr(getattr(chunk, "message", None), "tool_call_chunks", None):
+            self._calls_tools = True
+        if self._calls_tools:
+            return
+
+        if not self._in_answer:
+            self._buffer += token
+            for prefix in self.prefixes:
+                index = self._buffer.find(prefix)
+                if index >= 0:
+                    self._in_answer = True
+                    token = self._buffer[index + len(prefix):]
+                    break
+            else:
+                return
+
+        self._emit(token)
+
+    def on_agent_action(self, action: AgentAction, **kwargs: Any) -> None:
+        # ReAct text before Action was not an answer
+        self._in_answer = False
+        if self.on_step is not None:
+            self.on_step(f"-> {action.tool}({action.tool_input})")
+
+    def _emit(self, token: str) -> None:
+        if not self.streamed:
+            token = token.lstrip()
+        if token:
+            self.streamed = True
+            self._queue.put(token)
+
+    def run(self, invoke: Callable[[List[BaseCallbackHandler]], Any]) -> Iterator[Any]:
+        result: Dict[str, Any] = {}
+
+        def target():
+            try:
+                result["output"] = invoke([self])
+            except BaseException as e:
+                result["error"] = e
+            finally:
+                self._queue.put(self._END)
+
+        threading.Thread(target=Deadline.bind(target), name="agent-stream", daemon=True).start()
+        while True:
+            token = self._queue.get()
+            if token is self._END:
+                break
+            yield token
+
+        if "error" in result:
+            raise result["error"]
+        if not self.streamed:
+            yield result["output"]
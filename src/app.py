@@ -1,9 +1,10 @@
 import asyncio
+import itertools
 import yaml
 import os
 import sys
 from dotenv import load_dotenv
-from typing import List
+from typing import Iterator, List
 from .manager import ConversationManager
 from .io_output import TextToSpeech
 from .my_print import print_text
@@ -15,6 +16,7 @@ from .tool_loader import ToolLoader
 from .pkg.beep import BeepGenerator
 from .llm_agent import LargeLanguageModelAgent
 from .parsers import StateTransitionParser
+from .map_reduce import MapReduce, TextChunker
 import nest_asyncio
 
 load_dotenv()
@@ -100,24 +102,51 @@ class App:
                 print("Exiting...")
             quit(0)
 
+    def pipe_conversation(self, question: str):
+        """Start conversation with piped stdin appended to question. Input larger than one chunk is map-reduced."""
+        stdin_settings = self.settings.stdin
+        chunker = TextChunker(chunk_tokens=stdin_settings.chunk_tokens, overlap_tokens=stdin_settings.overlap_tokens)
+        chunks = chunker.chunks(self.stdin_lines())
+
+        first_chunk = next(chunks, "")
+        second_chunk = next(chunks, None)
+        if second_chunk is None:
+            stdin_input = "\n\n" + first_chunk if first_chunk else ""
+            self.conversation(questions=[question + stdin_input])
+            return
+
+        self.map_reduce(question=question, chunks=itertools.chain([first_chunk, second_chunk], chunks))
+        if not self.state.is_stopped:
+            self.conversation(questions=[])
+
+    def map_reduce(self, question: str, chunks: Iterator[str]) -> str:
+        """Answer question about input that does not fit into model context."""
+        manager = self.get_manager()
+        questions, found = manager.pre_parse_questions(questions=[question])
+        question = questions[0] if questions else ""
+        _, question = manager.parser.enrich(text=question)
+        manager.reload_agent()
+
+        map_reduce = MapReduce(
+            model=manager.agent.model,
+            max_workers=self.settings.stdin.max_workers,
+            reduce_batch=self.settings.stdin.reduce_batch,
+        )
+        answer = map_reduce.run(question=question, chunks=chunks)
+
+        manager.answer_text = answer
+        manager.user_input.set(question)
+        manager.response.write_response(stream=False, agent_response=answer)
+        manager.response.respond(answer)
+        manager.history.save(self.config.agent_name, answer, force=True)
+        return answer
+
     @staticmethod
-    def stdin_input() -> str:
-        if sys.stdin is None:
-            return ""
-
-        piped_input: List[str] = []
-        stdin_input: str = ""
-
-        if not sys.stdin.isatty():
-            for line in sys.stdin:
-                piped_input.append(line)
-            sys.stdin.close()
-            sys.stdin = open("/dev/tty")
-
-        stdin_input = ""
-        if piped_input:
-            stdin_input = "".join(piped_input)
-            if stdin_input:
-                stdin_input = "\n\n" + stdin_input
-
-        return stdin_input
+    def stdin_lines() -> Iterator[str]:
+        if sys.stdin is None or sys.stdin.isatty():
+            return
+
+        for line in sys.stdin:
+            yield line
+        sys.stdin.close()
+        sys.stdin = open("/dev/tty")
@@ -0,0 +1,115 @@
+import ctypes
+import os
+import sys
+import threading
+import pyperclip
+from typing import Callable, Optional
+
+
+class ClipboardWatcher:
+    """Keeps a snapshot of the clipboard up to date in a background thread while user is typing.
+
+    The snapshot is only a fast path. When typed input looks like a paste, or there is no snapshot yet,
+    the clipboard is read right away, so a stale snapshot is never appended to a question. Where the platform
+    exposes a clipboard change counter (Windows sequence number, macOS pasteboard change count) only that
+    counter is polled and the content is read when it changes. Polling is paused between prompts and when
+    the clipboard is not available the watcher backs off and retries.
+    """
+
+    def __init__(self, poll_interval: float = 0.5, max_backoff: float = 30.0):
+        self.poll_interval: float = poll_interval
+        self.max_backoff: float = max_backoff
+        self.generation: int = 0
+
+        self._content: str = ""
+        self._error: Optional[pyperclip.PyperclipException] = None
+        self._last_sequence: Optional[int] = None
+        self._sequence: Optional[Callable[[], int]] = self._get_sequence_reader()
+        self._lock: threading.Lock = threading.Lock()
+        self._read_lock: threading.Lock = threading.Lock()
+        self._ready: threading.Event = threading.Event()
+        self._active: threading.Event = threading.Event()
+        self._stopped: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts (or resumes) polling."""
+        self._active.set()
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._watch, name="clipboard-watcher", daemon=True)
+            self._thread.start()
+
+    def pause(self) -> None:
+        self._active.clear()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._active.set()
+
+    def paste(self, fresh: bool = False) -> str:
+        """Returns clipboard content. Snapshot is used unless fresh content is asked for, there is no snapshot yet
+        or last read failed. Raises PyperclipException if clipboard is not available."""
+        if fresh or not self._ready.is_set() or self._error is not None:
+            self._refresh()
+        if self._error is not None:
+            raise self._error
+        return self._content
+
+    def _watch(self) -> None:
+        failures = 0
+        while not self._stopped.is_set():
+            self._active.wait()
+            if self._stopped.is_set():
+                return
+            self._refresh()
+            failures = failures + 1 if self._error is not None else 0
+            self._stopped.wait(min(self.poll_interval * 2 ** min(failures, 16), self.max_backoff))
+
+    def _refresh(self) -> None:
+        with self._read_lock:
+            try:
+                if self._sequence is not None:
+                    sequence = self._sequence()
+                    if sequence == self._last_sequence and self._error is None:
+                        return
+                    self._last_sequence = sequence
+
+                content = pyperclip.paste()
+            except pyperclip.PyperclipException as e:
+                self._error = e
+                return
+
+            self._error = None
+            self._ready.set()
+            if content != self._content:
+                self._content = content
+                self.generation += 1
+
+    @staticmethod
+    def _get_sequence_reader() -> Optional[Callable[[], int]]:
+        if os.name == 'nt':
+            return ctypes.windll.user32.GetClipboardSequenceNumber
+
+        if sys.platform == 'darwin':
+            try:
+                from AppKit import NSPasteboard
+                return NSPasteboard.generalPasteboard().changeCount
+            except ImportError:
+                return None
+
+        return None
+
+
+def input_pending() -> bool:
+    """True when more input is already waiting on stdin, that is how the rest of a multi-line paste looks."""
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            return bool(msvcrt.kbhit())
+
+        import select
+        return bool(select.select([sys.stdin], [], [], 0)[0])
+    except (OSError, ValueError):
+        return False
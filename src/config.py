@@ -4,6 +4,8 @@ import time
 import datetime
 from typing import Optional, Dict, Union, List
 from .settings import Settings
+from .clipboard import ClipboardWatcher
+from .http_client import HttpClient
 
 
 class Configuration:
@@ -78,6 +80,18 @@ class Configuration:
 
         self.log_level: int = logging.ERROR
 
+        clipboard_poll_interval: float = settings.pre_parsers.clipboard.poll_interval if settings.pre_parsers else 0.5
+        self.clipboard: ClipboardWatcher = ClipboardWatcher(poll_interval=clipboard_poll_interval)
+
+        self.http: HttpClient = HttpClient(
+            timeout=settings.http.timeout,
+            connect_timeout=settings.http.connect_timeout,
+            host_timeouts=settings.http.host_timeouts,
+            retries=settings.http.retries,
+            backoff_factor=settings.http.backoff_factor,
+            pool_size=settings.http.pool_size,
+        )
+
     def _get_prompt_file(self, file: str) -> str:
         if not os.path.exists(file):
             file = os.path.join(self.directory, "..", "prompts", file)
@@ -0,0 +1,70 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+_current: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar("deadline", default=None)
+
+
+class Deadline:
+    """Time budget of one conversation turn.
+
+    Current deadline lives in a context variable, so LLM calls, tools, HTTP and TTS can read it without passing it around.
+    Threads started for the turn must run in a copied context (see `Deadline.bind`).
+    When less than `degrade_seconds` are left, optional work is skipped and agent is asked for final answer.
+    """
+
+    def __init__(self, seconds: Optional[float] = None, degrade_seconds: float = 0):
+        self.seconds = seconds
+        self.degrade_seconds = degrade_seconds
+        self.expires_at: Optional[float] = time.monotonic() + seconds if seconds else None
+
+    @staticmethod
+    def current() -> "Deadline":
+        """Deadline of current turn. Outside of a turn it is unbounded."""
+        return _current.get() or Deadline()
+
+    @staticmethod
+    @contextmanager
+    def start(seconds: Optional[float], degrade_seconds: float = 0) -> Iterator["Deadline"]:
+        deadline = Deadline(seconds, degrade_seconds)
+        token = _current.set(deadline)
+        try:
+            yield deadline
+        finally:
+            _current.reset(token)
+
+    @staticmethod
+    def bind(func: Callable) -> Callable:
+        """Wraps func to run with deadline of the caller. Use for every job handed to a thread."""
+        context = contextvars.copy_context()
+
+        def run(*args, **kwargs):
+            return context.run(func, *args, **kwargs)
+        return run
+
+    @property
+    def is_bounded(self) -> bool:
+        return self.expires_at is not None
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.is_bounded and self.remaining() <= 0
+
+    @property
+    def degraded(self) -> bool:
+        return self.is_bounded and self.remaining() <= self.degrade_seconds
+
+    def cap(self, timeout: Optional[float], minimum: float = 0.1) -> Optional[float]:
+        """Timeout that does not outlive the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        remaining = max(remaining, minimum)
+        return remaining if timeout is None else min(timeout, remaining)
+
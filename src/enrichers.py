@@ -1,7 +1,15 @@
 from abc import abstractmethod
-from typing import Tuple, Set
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Tuple, Set, List, Dict, Optional
 from .state import ApplicationState
+from .clipboard import ClipboardWatcher
 import pyperclip
+import fnmatch
+import glob
+import hashlib
+import math
+import threading
 import time
 from datetime import datetime
 from datetime import timezone
@@ -12,6 +20,13 @@ from pathlib import Path
 import base64
 
 IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.tif', '.webp', '.svg']
+GLOB_CHARACTERS = ['*', '?', '[']
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting prompts."""
+    return math.ceil(len(text) / 4)
+
 
 class PreParserInterface:
     @abstractmethod
@@ -30,6 +45,10 @@ class PreParserInterface:
     def phrases(self) -> Set[str]:
         pass
 
+    def is_optional(self) -> bool:
+        """Optional pre-parsers are skipped when turn deadline is near."""
+        return False
+
 
 def check_text_for_phrases(state: ApplicationState, question: str, phrases: Set[str], contains: bool = False) -> tuple[str, bool]:
     question: str = question.lower()
@@ -80,6 +99,9 @@ class CurrentTime(PreParserInterface):
         return found, question + f"\n- Today:\n-- Date: {current_date}\n-- Time: {current_time}\n-- Timezone: {self.timezone}" if found else (False, question)
 
 class Clipboard(PreParserInterface):
+    def __init__(self, watcher: ClipboardWatcher = None):
+        self.watcher = watcher
+
     def name(self) -> str:
         return "clipboard"
 
@@ -90,10 +112,13 @@ class Clipboard(PreParserInterface):
         return {"clipboard", "content", "copy"}
 
     def parse(self, question: str) -> Tuple[bool, str]:
+        _, found = check_text_for_phrases(None, question, self.phrases(), contains=True)
+        if not found:
+            return False, question
         try:
-            clipboard_content = pyperclip.paste().rstrip('\n')
-            _, found = check_text_for_phrases(None, question, self.phrases(), contains=True)
-            return found, question + f"\n# Clipboard Content:\n```\n{clipboard_content}\n```\n" if found else (False, question)
+            # asked for explicitly, so current content is read, not the snapshot
+            clipboard_content = (self.watcher.paste(fresh=True) if self.watcher else pyperclip.paste()).rstrip('\n')
+            return True, question + f"\n# Clipboard Content:\n```\n{clipboard_content}\n```\n"
         except pyperclip.PyperclipException:
             return False, question
 
@@ -170,3 +195,182 @@ class LocalFile(PreParserInterface):
                 except IOError:
                     pass
         return found, question
+
+
+class LocalDirectory(PreParserInterface):
+    """Adds the most relevant files of a local directory or glob to the question, within a token budget."""
+
+    def __init__(self, token_budget: int = 8000, ignore: List[str] = None, max_workers: int = 8, max_file_size: int = 262144, max_cached_files: int = 1024):
+        self.token_budget = token_budget
+        self.ignore = ignore or []
+        self.max_workers = max_workers
+        self.max_file_size = max_file_size
+        self.max_cached_files = max_cached_files
+        # path -> (mtime_ns, size, content hash); content hash -> (text, term counts), least recently used first
+        self._stats: OrderedDict[str, Tuple[int, int, str]] = OrderedDict()
+        self._contents: OrderedDict[str, Tuple[str, Dict[str, int]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def name(self) -> str:
+        return "localdirectory"
+
+    def description(self) -> str:
+        return "Adds most relevant files from local directory or glob to question."
+
+    def phrases(self) -> Set[str]:
+        return {"directory", "dir", "folder", "repo", "repository", "project", "files"}
+
+    def is_optional(self) -> bool:
+        return True
+
+    def parse(self, question: str) -> Tuple[bool, str]:
+        found = False
+        for token in re.findall(r'[\w\./\\*?\[\]-]+', question):
+            # "look at /home/me/src." ends a sentence, the dot is not part of the path
+            pattern = token.rstrip(".,;:!?")
+            if not os.path.isabs(pattern):
+                continue
+
+            is_glob = any(char in pattern for char in GLOB_CHARACTERS)
+            root = pattern
+            while any(char in root for char in GLOB_CHARACTERS):
+                root = os.path.dirname(root)
+            if self._is_too_broad(root):
+                continue
+
+            if is_glob:
+                patterns = self._ignore_patterns(root)
+                files = [
+                    file for file in glob.glob(pattern, recursive=True)
+                    if os.path.isfile(file) and not self._is_ignored(os.path.relpath(file, root), patterns)
+                ]
+            elif os.path.isdir(pattern):
+                files = self.find_files(root)
+            else:
+                continue
+
+            context = self.build_context(question=question, root=root, files=files)
+            if context:
+                found = True
+                question = question.replace(pattern, context)
+        return found, question
+
+    def find_files(self, root: str) -> List[str]:
+        patterns = self._ignore_patterns(root)
+        files: List[str] = []
+        for directory, dirs, filenames in os.walk(root):
+            relative_directory = os.path.relpath(directory, root)
+            dirs[:] = [d for d in dirs if not self._is_ignored(os.path.normpath(os.path.join(relative_directory, d)), patterns)]
+            for filename in filenames:
+                if not self._is_ignored(os.path.normpath(os.path.join(relative_directory, filename)), patterns):
+                    files.append(os.path.join(directory, filename))
+        return files
+
+    def build_context(self, question: str, root: str, files: List[str]) -> str:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            loaded = [item for item in executor.map(self._load, files) if item is not None]
+        if not loaded:
+            return ""
+
+        terms = self._terms(question)
+        ranked = sorted(loaded, key=lambda item: (-self._score(terms, os.path.relpath(item[0], root), item[2]), len(item[1])))
+
+        used_tokens = 0
+        parts: List[str] = []
+        skipped = 0
+        for path, text, _ in ranked:
+            part = f"\n## File: {os.path.relpath(path, root)}\n```\n{text}\n```\n"
+            tokens = estimate_tokens(part)
+            if used_tokens + tokens > self.token_budget:
+                skipped += 1
+                continue
+            used_tokens += tokens
+            parts.append(part)
+
+        header = f"\n# Directory: {root}\n"
+        if skipped:
+            header += f"({skipped} less relevant files omitted to fit into {self.token_budget} tokens)\n"
+        return header + "".join(parts)
+
+    def _load(self, path: str) -> Optional[Tuple[str, str, Dict[str, int]]]:
+        try:
+            stat = os.stat(path)
+            if stat.st_size == 0 or stat.st_size > self.max_file_size:
+                return None
+
+            with self._lock:
+                cached = self._stats.get(path)
+                if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size and cached[2] in self._contents:
+                    self._stats.move_to_end(path)
+                    self._contents.move_to_end(cached[2])
+                    text, counts = self._contents[cached[2]]
+                    return path, text, counts
+
+            with open(path, 'rb') as file:
+                content = file.read()
+        except OSError:
+            return None
+
+        if b"\0" in content[:1024]:
+            return None
+
+        digest = hashlib.sha1(content).hexdigest()
+        text = content.decode('utf-8', errors='replace')
+        counts: Dict[str, int] = {}
+        for term in re.findall(r'[a-z0-9_]{3,}', text.lower()):
+            counts[term] = counts.get(term, 0) + 1
+
+        with self._lock:
+            self._contents[digest] = (text, counts)
+            self._stats[path] = (stat.st_mtime_ns, stat.st_size, digest)
+            self._contents.move_to_end(digest)
+            self._stats.move_to_end(path)
+            while len(self._contents) > self.max_cached_files:
+                self._contents.popitem(last=False)
+            while len(self._stats) > self.max_cached_files:
+                self._stats.popitem(last=False)
+        return path, text, counts
+
+    @staticmethod
+    def _is_too_broad(root: str) -> bool:
+        """Filesystem root, home directory and directories above it are never walked."""
+        path = Path(os.path.normpath(root or os.sep))
+        if len(path.parts) < 2 or path == Path(path.anchor):
+            return True
+        home = Path(os.path.expanduser("~"))
+        return path == home or path in home.parents
+
+    def _ignore_patterns(self, root: str) -> List[str]:
+        patterns = list(self.ignore)
+        try:
+            with open(os.path.join(root, ".gitignore"), 'r') as file:
+                for line in file:
+                    line = line.strip()
+                    if line and not line.startswith("#") and not line.startswith("!"):
+                        patterns.append(line.strip("/"))
+        except OSError:
+            pass
+        return patterns
+
+    @staticmethod
+    def _is_ignored(relative_path: str, patterns: List[str]) -> bool:
+        parts = Path(relative_path).parts
+        for pattern in patterns:
+            if fnmatch.fnmatch(relative_path, pattern) or any(fnmatch.fnmatch(part, pattern) for part in parts):
+                return True
+        return False
+
+    @staticmethod
+    def _terms(question: str) -> Set[str]:
+        return set(re.findall(r'[a-z0-9_]{3,}', question.lower()))
+
+    @staticmethod
+    def _score(terms: Set[str], path: str, counts: Dict[str, int]) -> float:
+        path_terms = set(re.findall(r'[a-z0-9_]{3,}', path.lower()))
+        score = 0.0
+        for term in terms:
+            if term in path_terms:
+                score += 3
+            if term in counts:
+                score += 1 + math.log(counts[term])
+        return score
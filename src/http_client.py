@@ -0,0 +1,77 @@
+import asyncio
+import requests
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .deadline import Deadline
+
+
+class HttpClient:
+    """Shared HTTP client for built-in tools.
+
+    One pooled session with retry policy and per-host timeouts. Async methods run the same session
+    in a worker thread, so async callers share pool, retries and timeouts with sync ones.
+    """
+
+    def __init__(
+            self,
+            timeout: float = 10.0,
+            connect_timeout: float = 3.05,
+            host_timeouts: Dict[str, float] = None,
+            retries: int = 2,
+            backoff_factor: float = 0.5,
+            pool_size: int = 10,
+    ):
+        self.timeout: float = timeout
+        self.connect_timeout: float = connect_timeout
+        self.host_timeouts: Dict[str, float] = host_timeouts or {}
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session: requests.Session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # used when turn deadline is near, retries would not fit in it anyway
+        single_try = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.single_try_session: requests.Session = requests.Session()
+        self.single_try_session.mount("http://", single_try)
+        self.single_try_session.mount("https://", single_try)
+
+    def timeout_for(self, url: str) -> Tuple[float, float]:
+        host = urlparse(url).hostname or ""
+        deadline = Deadline.current()
+        return deadline.cap(self.connect_timeout), deadline.cap(self.host_timeouts.get(host, self.timeout))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        session = self.single_try_session if Deadline.current().degraded else self.session
+        return session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    async def arequest(self, method: str, url: str, **kwargs) -> requests.Response:
+        return await asyncio.to_thread(self.request, method, url, **kwargs)
+
+    async def aget(self, url: str, **kwargs) -> requests.Response:
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs) -> requests.Response:
+        return await self.arequest("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+        self.single_try_session.close()
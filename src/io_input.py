@@ -4,6 +4,7 @@ import threading
 import pyperclip
 import os
 from .alt import AltKeyDoublePressDetector
+from .clipboard import input_pending
 from .config import Configuration
 from .state import ApplicationState
 from .transcript import Transcript
@@ -130,12 +131,16 @@ class UserInput:
                 else:
                     self._ignore_next_questions = None
 
+            # Clipboard is read in background while user is typing, so checking it below is usually free.
+            self.config.clipboard.start()
             print(f"{Fore.YELLOW}{self.config.user_name}:{Fore.RESET} ", end="")
             text: str = input()
+            self.config.clipboard.pause()
 
             try:
                 # Check if clipboard content exists and appended it to the question.
-                clipboard = pyperclip.paste()
+                # Rest of a multi-line paste is already waiting on stdin, snapshot can be behind then, so read it again.
+                clipboard = self.config.clipboard.paste(fresh=input_pending())
                 if len(clipboard) > 0:
                     clipboard_parts = clipboard.split(os.linesep)
                     if len(clipboard_parts) > 1:
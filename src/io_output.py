@@ -1,6 +1,5 @@
 import shutil
 import subprocess
-import requests
 import json
 import threading
 from typing import List
@@ -9,6 +8,7 @@ from .config import Configuration
 from .state import ApplicationState
 from .parsers import print_text
 from .alt import AltKeyDoublePressDetector
+from .deadline import Deadline
 from langchain_core.messages import BaseMessage
 from langchain_core.runnables.utils import AddableDict
 from colorama import Fore, Style, init as colorama_init
@@ -32,10 +32,13 @@ class TextToSpeech:
         response: List[str] = []
 
         if stream:
-            if not self.state.is_quiet:
-                print(f"{Fore.MAGENTA}{self.config.agent_name}:{Style.RESET_ALL} ", end="")
+            named = self.state.is_quiet
             for chunk in agent_response:
                 txt = self._response_to_str(response=chunk, is_quiet=self.state.is_quiet)
+                # name goes before first answer text, agent steps may be printed before it
+                if txt and not named:
+                    print(f"{Fore.MAGENTA}{self.config.agent_name}:{Style.RESET_ALL} ", end="")
+                    named = True
                 print(txt, end="", flush=True)
                 response.append(txt)
             print("")
@@ -75,6 +78,10 @@ class TextToSpeech:
 
     def respond(self, text: str):
         if self.state.output_model != "text":
+            if Deadline.current().degraded:
+                # answer is already printed, speech would not fit in turn deadline
+                print_text(state=self.state, text="Speech skipped, no time left.")
+                return
             self._speak(text)
             self._wait_for_audio_process()
 
@@ -127,7 +134,7 @@ class TextToSpeech:
                     "sample_rate": self.state.output_model_options.sample_rate,
                 })
 
-                with requests.post(url, stream=True, headers=headers, json={"text": text}) as r:
+                with self.config.http.post(url, stream=True, headers=headers, json={"text": text}) as r:
                     for chunk in r.iter_content(chunk_size=1024):
                         if chunk:
                             if self.audio_process is not None:
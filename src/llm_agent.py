@@ -1,14 +1,28 @@
-from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from langchain_core.exceptions import OutputParserException
 import re
 from langchain_core.messages import HumanMessage
 from langchain.memory import ConversationBufferMemory
-from langchain.agents import initialize_agent, AgentExecutor
+from langchain.agents import initialize_agent, create_tool_calling_agent, AgentExecutor
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.tools import BaseTool
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from .agent_executor import ParallelAgentExecutor
+from .agent_stream import AgentStream, REACT_ANSWER_PREFIXES
+from .my_print import print_text
+from .deadline import Deadline
 from .config import Configuration
 from .state import ApplicationState
 from .tool_loader import ToolLoader
-from .llm_provider import LanguageModelProvider
+from .llm_provider import LanguageModelProvider, deadline_key
+from .tool_router import ToolRouter
+
+# Uses provider native tool calling instead of parsing ReAct text, so there are no parse-retry round-trips.
+TOOL_CALLING_AGENT = "tool-calling"
+
+# Built agents are kept by model, agent type and tool set, so switching back and forth costs nothing.
+MAX_CACHED_AGENTS = 8
 
 
 class LargeLanguageModelAgent:
@@ -23,6 +37,9 @@ class LargeLanguageModelAgent:
         self.chain = None
         self.agent: Optional[AgentExecutor] = None
         self.tools = None
+        self.router: Optional[ToolRouter] = self._create_router()
+        self._agents: OrderedDict[Tuple, AgentExecutor] = OrderedDict()
+        self._models: Dict[Tuple[str, float, Optional[float]], Any] = {}
 
     def get_memory(self) -> ConversationBufferMemory:
         if self.memory is None:
@@ -59,20 +76,86 @@ class LargeLanguageModelAgent:
             self.state.is_new_memory = False
 
         self.initialize_prompt()
-        self.model = self.llm_provider.get_model()
-        if not self.state.are_tools_enabled:
-            self.chain = self.model | StrOutputParser()
-        else:
+        self.model = self._get_model()
+        # chain is also used for tool-free questions when tools are enabled
+        self.chain = self.model | StrOutputParser()
+        if self.state.are_tools_enabled:
             self.function_provider.set_memory(self.memory)
             self.tools = self.function_provider.get_tools()
             self._reload_agent()
 
+    def _get_model(self) -> Any:
+        key = (self.state.llm_model, self.state.temperature, deadline_key())
+        if key not in self._models:
+            self._models[key] = self.llm_provider.get_model()
+        return self._models[key]
+
+    @property
+    def _verbose(self) -> bool:
+        # full agent trace, otherwise steps are printed as compact one-liners while streaming
+        return self.config.settings.agent.verbose and not self.state.is_quiet
+
+    def apply_verbosity(self) -> None:
+        """Verbosity is set on built agent instead of being part of it, so toggling quiet needs no rebuild."""
+        if self.memory is not None:
+            # tool calling prompt takes history as list of messages
+            self.memory.return_messages = not self.state.is_quiet or self.state.llm_agent_type == TOOL_CALLING_AGENT
+        if self.agent is not None:
+            self.agent.verbose = self._verbose
+            self.agent.return_intermediate_steps = not self.state.is_quiet
+
+    def _create_router(self) -> Optional[ToolRouter]:
+        routing = self.config.settings.routing
+        if not routing.enabled:
+            return None
+
+        embeddings = None
+        if routing.embeddings_model:
+            def embeddings():
+                from langchain_openai import OpenAIEmbeddings
+                return OpenAIEmbeddings(
+                    model=routing.embeddings_model,
+                    base_url=self.config.urls["ollama"] + "/v1/",
+                    api_key="ollama",
+                    check_embedding_ctx_length=False,
+                )
+
+        return ToolRouter(top_k=routing.top_k, always=routing.always, embeddings=embeddings, min_score=routing.min_score)
+
     def _reload_agent(self) -> None:
-        self.agent = initialize_agent(
+        self._use_agent(self.tools)
+
+    def route(self, question: str) -> List[str]:
+        """Switches to agent that knows only tools relevant for question. Returns names of those tools."""
+        if self.router is None or not self.tools:
+            return [tool.name for tool in self.tools or []]
+
+        tools = self.router.select(question, self.tools)
+        self._use_agent(tools)
+        return [tool.name for tool in tools]
+
+    def _use_agent(self, tools: List[BaseTool]) -> None:
+        key = (self.state.llm_model, self.state.temperature, deadline_key(), self.state.llm_agent_type, tuple(tool.name for tool in tools))
+        if key in self._agents:
+            self._agents.move_to_end(key)
+        else:
+            self._agents[key] = self._build_agent(tools)
+            if len(self._agents) > MAX_CACHED_AGENTS:
+                self._agents.popitem(last=False)
+        self.agent = self._agents[key]
+        # memory is replaced when chat is cleared
+        self.agent.memory = self.memory
+        self.apply_verbosity()
+
+    def _build_agent(self, tools: List[BaseTool]) -> AgentExecutor:
+        if self.state.llm_agent_type == TOOL_CALLING_AGENT:
+            return self._tool_calling_agent(tools)
+
+        return initialize_agent(
             agent=self.state.llm_agent_type,
-            llm=self.model,
-            tools=self.tools,
-            verbose=not self.state.is_quiet,
+            llm=self._agent_model(),
+            tools=tools,
+            verbose=self._verbose,
             handle_parsing_errors=self._handle_error,
             return_intermediate_steps=not self.state.is_quiet,
             early_stopping_method="generate",
@@ -82,11 +165,59 @@ class LargeLanguageModelAgent:
             max_execution_time=None,
         )
 
-    def ask_question(self, text: str, stream: bool = False) -> str:
-        question = self.prepare_question(question=text)
-        if self.state.are_tools_enabled:
-            return self.agent.stream(input=question) if stream else self.agent.invoke(input=question)
-        return self.chain.stream(question) if stream else self.model.invoke(question)
+    def _tool_calling_agent(self, tools: List[BaseTool]) -> AgentExecutor:
+        prompt = ChatPromptTemplate.from_messages([
+            MessagesPlaceholder("chat_history"),
+            ("human", "{input}"),
+            MessagesPlaceholder("agent_scratchpad"),
+        ])
+        return ParallelAgentExecutor(
+            agent=create_tool_calling_agent(llm=self._agent_model(), tools=tools, prompt=prompt),
+            tools=tools,
+            verbose=self._verbose,
+            handle_parsing_errors=True,
+            return_intermediate_steps=not self.state.is_quiet,
+            early_stopping_method="force",
+            memory=self.memory,
+            max_iterations=self.config.settings.agent.max_iterations,
+            max_execution_time=None,
+            max_parallel_tools=self.config.settings.agent.tool_workers,
+        )
+
+    def ask_question(self, text: str, stream: bool = False, use_tools: bool = None) -> str:
+        use_tools = self.state.are_tools_enabled if use_tools is None else use_tools
+        question = self.prepare_question(question=text, use_tools=use_tools)
+        if use_tools:
+            agent = self._turn_agent(Deadline.current())
+            return self._stream_agent(agent, question) if stream else agent.invoke(input=question)
+        return self._until_deadline(self.chain.stream(question), Deadline.current()) if stream else self.model.invoke(question)
+
+    def _until_deadline(self, tokens: Iterator[str], deadline: Deadline) -> Iterator[str]:
+        # request timeout bounds waiting for each chunk, not the whole answer
+        for token in tokens:
+            yield token
+            if deadline.expired:
+                tokens.close()
+                print_text(state=self.state, text="Answer cut short, no time left.")
+                return
+
+    def _turn_agent(self, deadline: Deadline) -> AgentExecutor:
+        """Executor limited by turn deadline. Cached executor is shared by turns, so the limit goes on a copy."""
+        if not deadline.is_bounded:
+            return self.agent
+        # leave time for forced final answer when agent runs out of time
+        return self.agent.model_copy(update={"max_execution_time": max(deadline.remaining() - deadline.degrade_seconds, 0.1)})
+
+    def _stream_agent(self, agent: AgentExecutor, question: Dict[str, Any]):
+        prefixes = [""] if self.state.llm_agent_type == TOOL_CALLING_AGENT else REACT_ANSWER_PREFIXES
+        stream = AgentStream(prefixes=prefixes, on_step=lambda step: print_text(state=self.state, text=step))
+        return stream.run(lambda callbacks: agent.invoke(input=question, config={"callbacks": callbacks}))
+
+    def _agent_model(self) -> Any:
+        # agent answer can be streamed only if model streams its tokens
+        if "streaming" in type(self.model).model_fields:
+            return self.model.model_copy(update={"streaming": True})
+        return self.model
 
     @staticmethod
     def _handle_error(error: Exception) -> str:
@@ -109,15 +240,16 @@ AI: [your response here]
 Please answer again while complying to rules and format just mentioned!
 """
 
-    def prepare_question(self, question: str):
+    def prepare_question(self, question: str, use_tools: bool = None):
+        use_tools = self.state.are_tools_enabled if use_tools is None else use_tools
         if "image_question" not in question:
-            if self.state.are_tools_enabled:
+            if use_tools:
                 question: Dict[str, Any] = {"input": question}
             return question
 
         data = re.search(r'(?P<before>.*)<image_question extension="(?P<extension>.*?)" title="(?P<title>.*?)" type="(?P<type>.*?)">(?P<image>.*?)</image_question>(?P<after>.*)', question, re.DOTALL)
         if not data:
-            if self.state.are_tools_enabled:
+            if use_tools:
                 question: Dict[str, Any] = {"input": question}
             return question
 
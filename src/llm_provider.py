@@ -1,7 +1,10 @@
 from typing import Any, Dict, Type, Optional, Union
+import httpx
 from .config import Configuration
+from .deadline import Deadline
 from .state import ApplicationState
 from .my_print import print_text
+from .settings import ModelConfig
 from langchain_groq import ChatGroq
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import GoogleGenerativeAI
@@ -9,6 +12,39 @@ from langchain_anthropic import ChatAnthropic
 from langchain_mistralai.chat_models import ChatMistralAI
 from langchain_community.llms import VLLMOpenAI
 
+# same as OpenAI and Anthropic SDK defaults, turn deadline lowers them
+LLM_REQUEST_TIMEOUT: float = 600.0
+LLM_CONNECT_TIMEOUT: float = 5.0
+# providers whose SDK sends requests with httpx and takes httpx timeout as model `timeout`
+HTTPX_TIMEOUT_PROVIDERS = ("openai", "deepseek", "openai_custom", "lm_studio", "ollama", "openrouter", "groq", "runpod")
+
+
+def _capped(name: str) -> property:
+    def get(self) -> Optional[float]:
+        return Deadline.current().cap(self.__dict__["_" + name])
+
+    def set(self, value: Optional[float]):
+        self.__dict__["_" + name] = value
+    return property(get, set)
+
+
+class DeadlineTimeout(httpx.Timeout):
+    """httpx timeout that does not outlive the turn deadline.
+
+    SDK clients copy their timeout into every request they build, so each LLM request is bounded by what is left of the turn.
+    """
+
+    connect = _capped("connect")
+    read = _capped("read")
+    write = _capped("write")
+    pool = _capped("pool")
+
+
+def deadline_key() -> Optional[float]:
+    """Part of built model and agent cache keys. Some SDKs take request timeout only when model is built,
+    models are built again when turn deadline length changes."""
+    return Deadline.current().seconds
+
 
 class LanguageModelProvider:
     def __init__(self, config: Configuration, state: ApplicationState):
@@ -25,6 +61,11 @@ class LanguageModelProvider:
             state=self.state,
             text=f"Model: {self.state.llm_model}, LLM: {model_name}, Provider: {provider_name}, Temp: {self.config.agent_temperature}"
         )
+        return self.create_model(self.state.llm_model_options, temperature)
+
+    def create_model(self, options: ModelConfig, temperature: float) -> Any:
+        provider_name: str = options.provider
+        model_name: str = options.model
 
         models: Dict[str, Type] = {
             "google": GoogleGenerativeAI,
@@ -78,16 +119,22 @@ class LanguageModelProvider:
                 "openai_api_key": self.config.api_keys["runpod"],
                 "openai_api_base": self.config.urls["runpod"].replace(
                     "{endpoint_id}",
-                    self.state.llm_model_options.endpoint_id if self.state.llm_model_options.endpoint_id else "unknown"
+                    options.endpoint_id if options.endpoint_id else "unknown"
                 ),
             }
         }
 
-        if self.state.llm_model_options.base_url is not None:
-            provider_specific_params[provider_name]["base_url"] = self.state.llm_model_options.base_url
+        if options.base_url is not None:
+            provider_specific_params[provider_name]["base_url"] = options.base_url
+
+        if provider_name in HTTPX_TIMEOUT_PROVIDERS:
+            common_params["timeout"] = DeadlineTimeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+        elif provider_name == "anthropic":
+            # takes only a number, model is built for the turn deadline length (see `deadline_key`)
+            seconds = Deadline.current().seconds
+            provider_specific_params[provider_name]["default_request_timeout"] = min(seconds, LLM_REQUEST_TIMEOUT) if seconds else LLM_REQUEST_TIMEOUT
 
         try:
-            model: Any = model_class(**common_params, **provider_specific_params[provider_name])
-            return model
+            return model_class(**common_params, **provider_specific_params[provider_name])
         except KeyError:
             raise ValueError(f"API key for provider {provider_name} is missing.")
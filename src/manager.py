@@ -1,5 +1,6 @@
 import time
 import traceback
+from typing import Optional
 from .parsers import StateTransitionParser
 from .tool_loader import ToolLoader
 from .config import Configuration
@@ -8,11 +9,13 @@ from .transcript import Transcript
 from .io_output import TextToSpeech
 from .llm_agent import LargeLanguageModelAgent
 from .pkg.beep import BeepGenerator
-from .llm_provider import LanguageModelProvider
+from .llm_provider import LanguageModelProvider, deadline_key
 from .io_input import UserInput
 from .my_print import print_text
 from .history import History
 from .settings import Settings
+from .deadline import Deadline
+from .tool_router import ToolNeedClassifier, ToolRouter
 from langchain_core.exceptions import OutputParserException
 from colorama import Fore, Style, init as colorama_init
 
@@ -67,14 +70,37 @@ class ConversationManager:
             parser=self.parser,
         )
         self._last_question: str = ""
+        self._task_name: Optional[str] = None
+        self.tool_classifier: Optional[ToolNeedClassifier] = self._create_tool_classifier()
 
     def reload_agent(self, force: bool = False) -> LargeLanguageModelAgent:
-        if self.current_state_hash != self.state.get_hash() or force:
-            self.current_state_hash = self.state.get_hash()
+        # turn deadline length is part of built models (see llm_provider.deadline_key)
+        agent_hash = f"{self.state.get_agent_hash()}:{deadline_key()}"
+        if self.current_state_hash != agent_hash or force:
+            self.current_state_hash = agent_hash
             print_text(state=self.state, text="Loading LLM...")
             self.agent.reload()
+        else:
+            self.agent.apply_verbosity()
         return self.agent
 
+    def _create_tool_classifier(self) -> Optional[ToolNeedClassifier]:
+        routing = self.config.settings.routing
+        if not routing.skip_agent:
+            return None
+
+        model = None
+        if routing.classifier_model:
+            options = self.config.settings.models[routing.classifier_model]
+            model = lambda: self.provider.create_model(options, temperature=0)
+
+        return ToolNeedClassifier(
+            router=self.agent.router or ToolRouter(),
+            threshold=routing.tool_score,
+            phrases=routing.tool_phrases,
+            model=model,
+        )
+
     def clear_memory(self):
         self.agent.get_memory().clear()
         self.agent.load_memory(force=True)
@@ -114,6 +140,11 @@ class ConversationManager:
         if await self._tasks(question):
             return False
 
+        deadline = self.config.settings.deadline
+        with Deadline.start(deadline.tasks.get(self._task_name, deadline.turn_seconds), deadline.degrade_seconds):
+            return await self._answer()
+
+    async def _answer(self) -> bool:
         clean_questions, found = self.pre_parse_questions(questions=[self.user_input.get()])
         if found:
             if self.state.is_stopped:
@@ -131,24 +162,42 @@ class ConversationManager:
             self.history.save(self.config.agent_name, tool_call_response)
             return False
 
+        if self.agent.model is None:
+            self.reload_agent(force=False)
+
+        use_tools = self.state.are_tools_enabled
+        if use_tools and self.tool_classifier is not None:
+            use_tools = self.tool_classifier.needs_tools(question, self.agent.tools)
+            if not use_tools:
+                print_text(state=self.state, text="Tools: none")
+
+        routed_tools = None
+        if use_tools and self.agent.router is not None:
+            routed_tools = self.agent.route(question)
+            print_text(state=self.state, text=f"Tools: {', '.join(routed_tools)}")
+
+        # only tools agent can call are prefetched, they run while pre-parsers enrich the question
+        if use_tools:
+            prefetched = self.tool_loader.prefetch(question, names=routed_tools)
+            if prefetched:
+                print_text(state=self.state, text=f"Prefetching: {', '.join(prefetched)}")
+
         was_changed, enriched_text = self.parser.enrich(text=question)
         self.user_input.set(enriched_text)
         who = self.config.user_name if not was_changed else "Pre-parser"
         self.history.save(who, self.user_input.get())
 
-        if self.agent.model is None:
-            self.reload_agent(force=False)
-
         tries = 0
         while tries < self.config.retry_settings["max_tries"]:
             try:
                 text = f"{self.config.user_name}: {self.user_input.get()}"
-                if not self.state.are_tools_enabled:
+                if not use_tools:
                     text = self.history.get_messages() + "\n\n" + text
 
-                self._process(question=text.lstrip())
+                self._process(question=text.lstrip(), use_tools=use_tools)
 
-                self.history.save(self.config.agent_name, self.answer_text)
+                # agent saves its own memory, direct answers are added to the same memory here
+                self.history.save(self.config.agent_name, self.answer_text, force=not use_tools)
                 if self.state.is_stopped:
                     return True
 
@@ -165,15 +214,19 @@ class ConversationManager:
             except Exception as e:
                 tr = traceback.format_exc()
                 print_text(state=self.state, text=f"Exception: {e.__class__.__name__} > {tr}")
+                if Deadline.current().degraded:
+                    print_text(state=self.state, text="No time left to try again.")
+                    break
                 sleep_sec = self.config.retry_settings["sleep_seconds_between_tries"]
                 print_text(state=self.state, text=f"Sleep and try again after: {sleep_sec} sec")
                 tries += 1
                 time.sleep(sleep_sec)
 
-    def _process(self, question: str = "") -> str:
-        stream = not self.state.is_quiet and not self.state.are_tools_enabled
+    def _process(self, question: str = "", use_tools: bool = None) -> str:
+        use_tools = self.state.are_tools_enabled if use_tools is None else use_tools
+        stream = not self.state.is_quiet
 
-        response = self.agent.ask_question(text=question, stream=stream)
+        response = self.agent.ask_question(text=question, stream=stream, use_tools=use_tools)
         self.answer_text = self.response.write_response(stream=stream, agent_response=response)
 
         self.response.respond(self.answer_text)
@@ -209,9 +262,13 @@ class ConversationManager:
         questions = self.config.settings.tasks[task_name]
         questions.insert(0, "quiet")
 
-        for question in questions:
-            print(question)
-            await self.question_answer(question=question)
+        self._task_name = task_name
+        try:
+            for question in questions:
+                print(question)
+                await self.question_answer(question=question)
+        finally:
+            self._task_name = None
         print_status("finished")
 
         self.state.llm_model = last_model
@@ -331,6 +388,13 @@ class ConversationManager:
         for name in tool_loader.available_tool_names():
             print(f"   - {name}")
 
+        cache_stats = self.tool_loader.cache_stats()
+        if cache_stats:
+            print("")
+            print("  Tool cache stats:")
+            for name, stats in cache_stats.items():
+                print(f"   - {name}: " + ", ".join(f"{key}: {value}" for key, value in stats.items()))
+
         print("")
         print("  Available tasks:")
         for name, commands in self.config.settings.tasks.items():
@@ -0,0 +1,137 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Iterable, Iterator, List, Optional, TextIO
+from langchain_core.output_parsers import StrOutputParser
+from .enrichers import estimate_tokens
+
+MAP_PROMPT = """You are given part {number} of a larger input that does not fit into one request.
+Answer the question using only this part. Keep everything that can be relevant for the final answer.
+If this part contains nothing relevant, answer with "Nothing relevant."
+
+Question: {question}
+
+Part {number}:
+```
+{chunk}
+```"""
+
+REDUCE_PROMPT = """Following are partial answers to the same question, each based on a different part of a larger input.
+Combine them into one complete answer to the question. Drop "Nothing relevant." answers and duplicated facts.
+
+Question: {question}
+
+{answers}"""
+
+
+class TextChunker:
+    """Splits streamed lines into chunks of roughly `chunk_tokens` tokens that overlap by `overlap_tokens`."""
+
+    def __init__(self, chunk_tokens: int = 6000, overlap_tokens: int = 200):
+        if overlap_tokens >= chunk_tokens:
+            raise ValueError("overlap_tokens must be smaller than chunk_tokens")
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+
+    def chunks(self, lines: Iterable[str]) -> Iterator[str]:
+        max_chars = self.chunk_tokens * 4
+        buffer: List[str] = []
+        buffer_chars = 0
+        has_new_text = False
+
+        for line in lines:
+            # hard-split lines that alone do not fit into a chunk
+            parts = [line[i:i + max_chars] for i in range(0, len(line), max_chars)] or [line]
+            for part in parts:
+                if buffer_chars + len(part) > max_chars and has_new_text:
+                    yield "".join(buffer)
+                    buffer = self._overlap(buffer)
+                    buffer_chars = sum(len(text) for text in buffer)
+                    has_new_text = False
+                buffer.append(part)
+                buffer_chars += len(part)
+                has_new_text = True
+
+        if has_new_text:
+            yield "".join(buffer)
+
+    def _overlap(self, buffer: List[str]) -> List[str]:
+        overlap: List[str] = []
+        tokens = 0
+        for text in reversed(buffer):
+            tokens += estimate_tokens(text)
+            if tokens > self.overlap_tokens:
+                break
+            overlap.insert(0, text)
+        return overlap
+
+
+class MapReduce:
+    """Answers a question about input larger than model context.
+
+    Chunks are answered concurrently by a bounded worker pool while input is still being read,
+    then partial answers are combined in batches until one answer is left.
+    """
+
+    def __init__(self, model: Any, max_workers: int = 4, reduce_batch: int = 5, progress: TextIO = None):
+        if reduce_batch < 2:
+            raise ValueError("reduce_batch must be at least 2")
+        self.chain = model | StrOutputParser()
+        self.max_workers = max_workers
+        self.reduce_batch = reduce_batch
+        self.progress = progress if progress is not None else sys.stderr
+
+    def run(self, question: str, chunks: Iterable[str]) -> str:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            partial_answers = self._map(executor, question, chunks)
+            level = 1
+            while len(partial_answers) > 1:
+                batches = [partial_answers[i:i + self.reduce_batch] for i in range(0, len(partial_answers), self.reduce_batch)]
+                self._print_progress(f"Reduce level {level}: combining {len(partial_answers)} answers in {len(batches)} batches")
+                futures = [executor.submit(self._reduce, question, batch) for batch in batches]
+                partial_answers = [future.result() for future in futures]
+                level += 1
+
+        return partial_answers[0] if partial_answers else ""
+
+    def _map(self, executor: ThreadPoolExecutor, question: str, chunks: Iterable[str]) -> List[str]:
+        # do not read input faster than workers can process it
+        in_flight = threading.BoundedSemaphore(self.max_workers * 2)
+        futures: List[Future] = []
+        done: List[int] = [0]
+        # number of chunks is known only after whole input was read
+        total: List[Optional[int]] = [None]
+        lock = threading.Lock()
+
+        def report():
+            if total[0] is None:
+                self._print_progress(f"Processed {done[0]} chunks, reading input")
+            else:
+                self._print_progress(f"Processed {done[0]}/{total[0]} chunks")
+
+        def process(number: int, chunk: str) -> str:
+            try:
+                answer = self.chain.invoke(MAP_PROMPT.format(number=number, question=question, chunk=chunk))
+            finally:
+                in_flight.release()
+            with lock:
+                done[0] += 1
+                report()
+            return answer
+
+        for number, chunk in enumerate(chunks, start=1):
+            in_flight.acquire()
+            futures.append(executor.submit(process, number, chunk))
+
+        with lock:
+            total[0] = len(futures)
+            report()
+
+        return [future.result() for future in futures]
+
+    def _reduce(self, question: str, answers: List[str]) -> str:
+        formatted = "\n\n".join(f"Partial answer {number}:\n{answer}" for number, answer in enumerate(answers, start=1))
+        return self.chain.invoke(REDUCE_PROMPT.format(question=question, answers=formatted))
+
+    def _print_progress(self, text: str):
+        print(text, file=self.progress, flush=True)
@@ -1,8 +1,9 @@
-from .enrichers import check_text_for_phrases, CurrentTime, Clipboard, LocalFile, LocalImage, PreParserInterface
+from .enrichers import check_text_for_phrases, CurrentTime, Clipboard, LocalFile, LocalImage, LocalDirectory, PreParserInterface
 from typing import List
 from .state import ApplicationState
 from .config import Configuration
 from .my_print import print_text
+from .deadline import Deadline
 
 
 class StateTransitionParser:
@@ -11,11 +12,19 @@ class StateTransitionParser:
         self.config: Configuration = config
 
         self.enrichers: List[PreParserInterface] = []
-        self.add_enricher(self.config.settings.pre_parsers.clipboard.enabled, Clipboard())
+        self.add_enricher(self.config.settings.pre_parsers.clipboard.enabled, Clipboard(watcher=self.config.clipboard))
         self.add_enricher(self.config.settings.pre_parsers.time.enabled, CurrentTime(timezone=self.config.prompt_replacements["timezone"]))
         self.add_enricher(self.config.settings.pre_parsers.file.enabled, LocalFile())
         self.add_enricher(self.config.settings.pre_parsers.image.enabled, LocalImage())
 
+        directory = self.config.settings.pre_parsers.directory
+        self.add_enricher(directory.enabled, LocalDirectory(
+            token_budget=directory.token_budget,
+            ignore=directory.ignore,
+            max_workers=directory.max_workers,
+            max_file_size=directory.max_file_size,
+        ))
+
     def add_enricher(self, enabled: bool, parser: PreParserInterface):
         if enabled:
             self.enrichers.append(parser)
@@ -24,7 +33,11 @@ class StateTransitionParser:
         improved_text = text
         was_changed = False
 
+        degraded = Deadline.current().degraded
         for enricher in self.enrichers:
+            if degraded and enricher.is_optional():
+                print_text(state=self.state, text=f"Skipping {enricher.name()} pre-parser, no time left.")
+                continue
             found_phrase, found = check_text_for_phrases(state=self.state, contains=True, phrases=enricher.phrases(), question=text)
             if not found:
                 continue
@@ -0,0 +1,121 @@
+import calendar
+import datetime
+import re
+from collections.abc import Iterable, Mapping
+from pydantic import BaseModel
+
+
+class WorkingHours(BaseModel):
+    """Part of the day that counts for free/busy, `availability:` in calendar config."""
+
+    start: datetime.time = datetime.time(9, 0)
+    end: datetime.time = datetime.time(18, 0)
+    # ISO weekdays, 1 is Monday
+    weekdays: list[int] = [1, 2, 3, 4, 5]
+    # full day events are mostly reminders and birthdays, they do not block time unless asked to
+    full_day_busy: bool = False
+
+
+Interval = tuple[datetime.datetime, datetime.datetime]
+
+
+def local_time(value: datetime.datetime, tz: datetime.tzinfo) -> datetime.datetime:
+    """Wall clock time in user time zone, floating times are kept as they are."""
+    return value.astimezone(tz).replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+def busy_intervals(events: Iterable[Mapping], hours: WorkingHours, tz: datetime.tzinfo) -> list[Interval]:
+    """Sorted, non-overlapping busy intervals in user wall clock time."""
+    intervals = sorted(
+        (local_time(event["start"], tz), local_time(event["end"], tz))
+        for event in events
+        if hours.full_day_busy or not event["full_day"]
+    )
+    merged: list[Interval] = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_slots(
+    busy: list[Interval],
+    day_from: datetime.date,
+    day_to: datetime.date,
+    hours: WorkingHours,
+    minutes: int = 30,
+    now: datetime.datetime = None,
+) -> dict[datetime.date, list[Interval]]:
+    """Gaps of at least `minutes` between busy intervals for every working day from `day_from` till `day_to`.
+
+    Days are walked in order and busy intervals with them, so it is one pass over both.
+    """
+    length = datetime.timedelta(minutes=minutes)
+    slots: dict[datetime.date, list[Interval]] = {}
+    index = 0
+    day = day_from
+    while day <= day_to:
+        start = datetime.datetime.combine(day, hours.start)
+        end = datetime.datetime.combine(day, hours.end)
+        if now is not None:
+            start = max(start, now)
+        # day whose working hours are over is neither free nor booked
+        if day.isoweekday() in hours.weekdays and start < end:
+            while index < len(busy) and busy[index][1] <= start:
+                index += 1
+
+            gaps: list[Interval] = []
+            cursor = start
+            position = index
+            while position < len(busy) and busy[position][0] < end:
+                if busy[position][0] > cursor:
+                    gaps.append((cursor, busy[position][0]))
+                cursor = max(cursor, busy[position][1])
+                position += 1
+            if cursor < end:
+                gaps.append((cursor, end))
+            slots[day] = [(gap_start, gap_end) for gap_start, gap_end in gaps if gap_end - gap_start >= length]
+        day += datetime.timedelta(days=1)
+    return slots
+
+
+def fully_booked(slots: dict[datetime.date, list[Interval]]) -> list[datetime.date]:
+    return [day for day, gaps in slots.items() if not gaps]
+
+
+def parse_minutes(text: str, default: int = 30) -> int:
+    """Slot length from '45', '45 min', '2 hours' or '1.5 hours', numbers of dates and day, week or month counts are skipped."""
+    text = re.sub(r"\d{4}-\d{2}-\d{2}|\d+\s*(?:days?|weeks?|months?)\b", " ", text.lower())
+    found = re.search(r"(\d+(?:\.\d+)?)\s*(hours?|hrs?|h\b)?", text)
+    if found is None:
+        return default
+    return round(float(found.group(1)) * (60 if found.group(2) else 1))
+
+
+def parse_period(text: str, today: datetime.date) -> tuple[datetime.date, datetime.date]:
+    """Inclusive day range for 'today', 'tomorrow', 'this/next week', 'this/next month', 'next N days',
+    'YYYY-MM-DD' or 'YYYY-MM-DD..YYYY-MM-DD'. Anything else is this week."""
+    text = text.lower()
+    dates = re.findall(r"\d{4}-\d{2}-\d{2}", text)
+    if dates:
+        first = datetime.date.fromisoformat(dates[0])
+        return first, datetime.date.fromisoformat(dates[-1])
+    if "tomorrow" in text:
+        tomorrow = today + datetime.timedelta(days=1)
+        return tomorrow, tomorrow
+    if "today" in text:
+        return today, today
+    days = re.search(r"(\d+)\s*days?", text)
+    if days:
+        return today, today + datetime.timedelta(days=max(int(days.group(1)), 1) - 1)
+    if "next month" in text:
+        first = (today.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+        return first, first.replace(day=calendar.monthrange(first.year, first.month)[1])
+    if "month" in text:
+        return today, today.replace(day=calendar.monthrange(today.year, today.month)[1])
+    sunday = today + datetime.timedelta(days=7 - today.isoweekday())
+    if "next week" in text:
+        return sunday + datetime.timedelta(days=1), sunday + datetime.timedelta(days=7)
+    return today, sunday
@@ -0,0 +1,101 @@
+import datetime
+import functools
+import re
+from typing import Optional
+import pytz
+
+WEEKDAYS: dict[str, int] = {
+    name: index for index, names in enumerate([
+        ("monday", "mon"), ("tuesday", "tue", "tues"), ("wednesday", "wed"), ("thursday", "thu", "thurs"),
+        ("friday", "fri"), ("saturday", "sat"), ("sunday", "sun"),
+    ]) for name in names
+}
+RELATIVE_DAYS: dict[str, int] = {
+    "now": 0, "today": 0, "current": 0, "tonight": 0,
+    "tomorrow": 1, "day after tomorrow": 2, "yesterday": -1,
+}
+# words that make text mean a different day depending on when it is asked
+RELATIVE_WORDS: set[str] = {word for text in RELATIVE_DAYS for word in text.split()} | set(WEEKDAYS) | {
+    "next", "this", "last", "coming", "week", "weekend", "month", "ago", "days",
+}
+ISO_DATE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
+WEEKDAY = re.compile(r"^(?:on |this |next |coming )?([a-z]+)$")
+
+
+def zone(timezone: Optional[str] = None) -> datetime.tzinfo:
+    """User time zone (`user.timezone`), system time zone when it is not set or not known."""
+    if timezone:
+        try:
+            return pytz.timezone(timezone)
+        except pytz.UnknownTimeZoneError:
+            pass
+    return datetime.datetime.now().astimezone().tzinfo
+
+
+def today(timezone: Optional[str] = None) -> datetime.date:
+    return datetime.datetime.now(zone(timezone)).date()
+
+
+def localize(value: datetime.datetime, timezone: Optional[str] = None) -> datetime.datetime:
+    """Naive wall clock time as time zone aware time in user time zone."""
+    tz = zone(timezone)
+    return tz.localize(value) if hasattr(tz, "localize") else value.replace(tzinfo=tz)
+
+
+def is_relative(text: Optional[str]) -> bool:
+    """True for empty text (date tools default to today) and text like 'tomorrow', 'friday' or 'next week'."""
+    if not text or not text.strip():
+        return True
+    return any(word in RELATIVE_WORDS for word in re.findall(r"[a-z]+", text.lower()))
+
+
+def resolve_date(text: Optional[str], timezone: Optional[str] = None) -> Optional[datetime.datetime]:
+    """Day that text refers to, as time zone aware start of that day. None when text is empty or not a date.
+
+    'today', 'tomorrow', 'now', 'YYYY-MM-DD' and weekdays ('friday', 'next monday') are resolved without dateparser,
+    it is imported only for free form text. Weekday means the coming one, today included, 'next' skips today.
+    """
+    if not text:
+        return None
+    return _resolve(" ".join(text.lower().strip(" .?!'\"").split()), timezone, today(timezone))
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve(text: str, timezone: Optional[str], current_day: datetime.date) -> Optional[datetime.datetime]:
+    day = fast_path(text, current_day)
+    if day is None:
+        day = parse_free_form(text, timezone)
+    if day is None:
+        return None
+    return localize(datetime.datetime.combine(day, datetime.time()), timezone)
+
+
+def fast_path(text: str, current_day: datetime.date) -> Optional[datetime.date]:
+    if text in RELATIVE_DAYS:
+        return current_day + datetime.timedelta(days=RELATIVE_DAYS[text])
+
+    iso = ISO_DATE.match(text)
+    if iso:
+        try:
+            return datetime.date(int(iso.group(1)), int(iso.group(2)), int(iso.group(3)))
+        except ValueError:
+            return None
+
+    weekday = WEEKDAY.match(text)
+    if weekday and weekday.group(1) in WEEKDAYS:
+        days = (WEEKDAYS[weekday.group(1)] - current_day.weekday()) % 7
+        if days == 0 and text.startswith("next "):
+            days = 7
+        return current_day + datetime.timedelta(days=days)
+    return None
+
+
+def parse_free_form(text: str, timezone: Optional[str]) -> Optional[datetime.date]:
+    # dateparser loads locale data on import, only pay for it when fast path did not match
+    import dateparser
+
+    settings = {"PREFER_DATES_FROM": "future", "RETURN_AS_TIMEZONE_AWARE": True}
+    if timezone in pytz.all_timezones_set:
+        settings["TIMEZONE"] = timezone
+    parsed = dateparser.parse(text, settings=settings)
+    return parsed.date() if parsed else None
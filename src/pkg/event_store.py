@@ -0,0 +1,231 @@
+import datetime
+import numpy
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, Optional
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# event dict fields kept as ids into the string table
+STRING_FIELDS: tuple[str, ...] = ("calendar", "name", "origin", "summary", "organizer", "description", "status")
+FIELDS: tuple[str, ...] = ("private", "start", "end", "full_day", "attendees") + STRING_FIELDS
+COLUMNS: tuple[str, ...] = ("start", "end", "start_zone", "end_zone", "private", "full_day", "attendees")
+
+
+def to_micros(value: datetime.datetime) -> int:
+    """Microseconds since epoch. Floating (naive) times are taken as UTC wall clock, same as query windows."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_micros(micros: int, zone: Optional[datetime.tzinfo]) -> datetime.datetime:
+    value = EPOCH + datetime.timedelta(microseconds=int(micros))
+    return value.replace(tzinfo=None) if zone is None else value.astimezone(zone)
+
+
+class StringTable:
+    """Every distinct string stored once, columns keep its id."""
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self.ids: dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def lookup(self, values: Iterable[str]) -> numpy.ndarray:
+        """Ids of values that are in the table, unknown values can not match anything."""
+        return numpy.array([self.ids[value] for value in values if value in self.ids], dtype=numpy.int32)
+
+
+class EventView(Mapping):
+    """Read-only event dict over one row of the store, fields are resolved only when read."""
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "EventStore", row: int):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, field: str) -> Any:
+        return self.store.field(self.row, field)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return f"EventView({dict(self)!r})"
+
+
+class EventStore(Sequence):
+    """Calendar events held column by column and sorted by start.
+
+    Strings (calendar names, organizers, summaries...) are interned, start and end are int64 microseconds
+    with an index into the time zone table, attendees are one flat id array with offsets.
+    Items are lazy `EventView`s, window and filter queries run on the arrays.
+    """
+
+    def __init__(self, events: Iterable[Mapping] = ()):
+        self.table = StringTable()
+        self.zones: list[Optional[datetime.tzinfo]] = []
+        zone_ids: dict[Optional[datetime.tzinfo], int] = {}
+
+        def zone_id(value: datetime.datetime) -> int:
+            index = zone_ids.get(value.tzinfo)
+            if index is None:
+                index = zone_ids[value.tzinfo] = len(self.zones)
+                self.zones.append(value.tzinfo)
+            return index
+
+        start, end, start_zone, end_zone, private, full_day = [], [], [], [], [], []
+        strings: dict[str, list[int]] = {field: [] for field in STRING_FIELDS}
+        attendees: list[int] = []
+        offsets: list[int] = [0]
+        for event in events:
+            start.append(to_micros(event["start"]))
+            end.append(to_micros(event["end"]))
+            start_zone.append(zone_id(event["start"]))
+            end_zone.append(zone_id(event["end"]))
+            private.append(bool(event["private"]))
+            full_day.append(bool(event["full_day"]))
+            for field in STRING_FIELDS:
+                strings[field].append(self.table.intern(event[field]))
+            attendees.extend(self.table.intern(attendee) for attendee in event["attendees"])
+            offsets.append(len(attendees))
+
+        self.start = numpy.array(start, dtype=numpy.int64)
+        self.end = numpy.array(end, dtype=numpy.int64)
+        self.start_zone = numpy.array(start_zone, dtype=numpy.int16)
+        self.end_zone = numpy.array(end_zone, dtype=numpy.int16)
+        self.private = numpy.array(private, dtype=bool)
+        self.full_day = numpy.array(full_day, dtype=bool)
+        self.strings: dict[str, numpy.ndarray] = {field: numpy.array(ids, dtype=numpy.int32) for field, ids in strings.items()}
+        self.attendees = numpy.array(attendees, dtype=numpy.int32)
+        self.attendee_offsets = numpy.array(offsets, dtype=numpy.int64)
+        self._sort()
+
+    @classmethod
+    def concat(cls, stores: list["EventStore"]) -> "EventStore":
+        """One store with events of all stores, string and zone tables are merged."""
+        if len(stores) <= 1:
+            return stores[0] if stores else cls()
+        merged = cls()
+        zone_ids: dict[Optional[datetime.tzinfo], int] = {}
+        columns: dict[str, list[numpy.ndarray]] = {name: [] for name in COLUMNS + STRING_FIELDS}
+        counts: list[numpy.ndarray] = []
+        for store in stores:
+            ids = numpy.array([merged.table.intern(value) for value in store.table.strings], dtype=numpy.int32)
+            zones = numpy.array([zone_ids.setdefault(zone, len(zone_ids)) for zone in store.zones], dtype=numpy.int16)
+            columns["start"].append(store.start)
+            columns["end"].append(store.end)
+            columns["start_zone"].append(zones[store.start_zone])
+            columns["end_zone"].append(zones[store.end_zone])
+            columns["private"].append(store.private)
+            columns["full_day"].append(store.full_day)
+            columns["attendees"].append(ids[store.attendees])
+            for field in STRING_FIELDS:
+                columns[field].append(ids[store.strings[field]])
+            counts.append(numpy.diff(store.attendee_offsets))
+
+        merged.zones = list(zone_ids)
+        for name in COLUMNS:
+            setattr(merged, name, numpy.concatenate([getattr(merged, name)] + columns[name]))
+        merged.strings = {field: numpy.concatenate([merged.strings[field]] + columns[field]) for field in STRING_FIELDS}
+        merged.attendee_offsets = numpy.concatenate([[0], numpy.cumsum(numpy.concatenate(counts))]).astype(numpy.int64)
+        merged._sort()
+        return merged
+
+    def _sort(self):
+        order = numpy.argsort(self.start, kind="stable")
+        counts = numpy.diff(self.attendee_offsets)[order]
+        offsets = numpy.concatenate([[0], numpy.cumsum(counts)]).astype(numpy.int64)
+        # position of every attendee in the old flat array, rows taken in new order
+        source = numpy.arange(offsets[-1]) - numpy.repeat(offsets[:-1], counts) + numpy.repeat(self.attendee_offsets[:-1][order], counts)
+        self.attendees = self.attendees[source]
+        self.attendee_offsets = offsets
+        for name in ("start", "end", "start_zone", "end_zone", "private", "full_day"):
+            setattr(self, name, getattr(self, name)[order])
+        self.strings = {field: ids[order] for field, ids in self.strings.items()}
+        # running maximum of end, events before the first one reaching window start can not overlap it
+        self.max_end = numpy.maximum.accumulate(self.end) if len(self.end) else self.end
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getitem__(self, row: int) -> EventView:
+        if isinstance(row, slice):
+            return [EventView(self, index) for index in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return EventView(self, row)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def field(self, row: int, field: str) -> Any:
+        if field == "start":
+            return from_micros(self.start[row], self.zones[self.start_zone[row]])
+        if field == "end":
+            return from_micros(self.end[row], self.zones[self.end_zone[row]])
+        if field == "private":
+            return bool(self.private[row])
+        if field == "full_day":
+            return bool(self.full_day[row])
+        if field == "attendees":
+            ids = self.attendees[self.attendee_offsets[row]:self.attendee_offsets[row + 1]]
+            return [self.table.strings[index] for index in ids]
+        if field in self.strings:
+            return self.table.strings[self.strings[field][row]]
+        raise KeyError(field)
+
+    def window(self, start: datetime.datetime, end: datetime.datetime) -> tuple[int, int]:
+        """Row range that holds every event overlapping [start, end]."""
+        return (
+            int(numpy.searchsorted(self.max_end, to_micros(start), side="left")),
+            int(numpy.searchsorted(self.start, to_micros(end), side="right")),
+        )
+
+    def filter(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        emails: Iterable[str] = (),
+        statuses: Iterable[str] = (),
+        ignore_summaries: Iterable[str] = (),
+    ) -> list[EventView]:
+        """Events overlapping the window that pass the filters, sorted by start.
+
+        Events with organizer or attendees must involve one of `emails`, events without both always pass.
+        """
+        lo, hi = self.window(start, end)
+        rows = slice(lo, hi)
+        mask = self.end[rows] >= to_micros(start)
+
+        emails, statuses, ignore_summaries = list(emails), list(statuses), list(ignore_summaries)
+        if statuses:
+            mask &= numpy.isin(self.strings["status"][rows], self.table.lookup(statuses))
+        if ignore_summaries:
+            mask &= ~numpy.isin(self.strings["summary"][rows], self.table.lookup(ignore_summaries))
+        if emails:
+            email_ids = self.table.lookup(emails)
+            organizer = self.strings["organizer"][rows]
+            offsets = self.attendee_offsets[lo:hi + 1]
+            # attendee matches per event from cumulative count of matching attendee ids
+            hits = numpy.concatenate([[0], numpy.cumsum(numpy.isin(self.attendees[offsets[0]:offsets[-1]], email_ids))])
+            attendee_found = hits[offsets[1:] - offsets[0]] > hits[offsets[:-1] - offsets[0]]
+            no_people = (organizer == self.table.ids.get("", -1)) & (offsets[1:] == offsets[:-1])
+            mask &= no_people | numpy.isin(organizer, email_ids) | attendee_found
+
+        return [EventView(self, lo + int(row)) for row in numpy.flatnonzero(mask)]
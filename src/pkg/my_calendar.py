@@ -1,31 +1,137 @@
 import requests
 import os
+import json
+import hashlib
 import zipfile
 import tempfile
 import icalendar
 import datetime
+import threading
+import multiprocessing
 import pytz
-import numpy
-import pickle
 import recurring_ical_events
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from ..state import ApplicationState as AppStatus
 from ..my_print import print_text
+from ..http_client import HttpClient
+from ..deadline import Deadline
+from .event_store import EventStore
+from .dates import localize, today
 from typing import Any
 
 
+# Bump when cached event format changes, older cache files are ignored.
+CACHE_VERSION = 2
+# Expanded occurrences are kept for this many query windows per calendar.
+MAX_CACHED_WINDOWS = 8
+
+
+def calendar_fields(calendar: dict) -> dict:
+    return {field: calendar[field] for field in ("private", "calendar_name", "name", "origin")}
+
+
+def expand_ics(ics: str | icalendar.Calendar, calendar: dict, start: datetime.datetime, end: datetime.datetime) -> EventStore:
+    """Occurrences of calendar events that overlap the window. Module level, so it can run in a worker process."""
+    data = ics if isinstance(ics, icalendar.Calendar) else icalendar.Calendar.from_ical(ics)
+    calendar_events: list[dict] = []
+    events = recurring_ical_events.of(data).between(start, end)
+    for event in events:
+        if event.is_broken or len(event.errors) > 0:
+            raise ValueError(f"Event is broken: {event.errors}")
+
+        attendee = event.get("ATTENDEE")
+        attendees = []
+        mail_prefix = "mailto:"
+        if attendee is not None:
+            if isinstance(attendee, icalendar.vCalAddress):
+                attendees.append(str(attendee).replace(mail_prefix, ""))
+            else:
+                for x in attendee:
+                    attendees.append(str(x).replace(mail_prefix, ""))
+
+        start = convert_to_datetime(event.get("DTSTART"), datetime.datetime.min.time())
+        end = convert_to_datetime(event.get("DTEND"), datetime.datetime.max.time())
+        if end is None:
+            end: datetime.datetime = start
+            end: datetime.datetime = datetime.datetime.combine(end, datetime.datetime.max.time())
+            end: datetime.datetime = end.replace(tzinfo=datetime.timezone.utc)
+        if start is None:
+            raise ValueError("Event start or end is None")
+
+        full_day = False
+        if start is not None and end is not None:
+            diff = end - start
+            full_day = diff.days > 1 or diff.seconds >= 86399
+
+        organizer = str(event.get("ORGANIZER")).replace("mailto:", "")
+        if organizer == "None":
+            organizer = ""
+
+        event_dict = {
+            "private": calendar["private"],
+            "calendar": calendar["calendar_name"],
+            "name": calendar["name"],
+            "origin": calendar["origin"],
+            "summary": str(event.get("SUMMARY")),
+            "start": start,
+            "end": end,
+            "full_day": full_day,
+            "organizer": organizer,
+            "attendees": attendees,
+            "description": str(event.get("DESCRIPTION")),
+            "status": str(event.get("STATUS")),
+        }
+        calendar_events.append(event_dict)
+    return EventStore(calendar_events)
+
+
+def parse_and_expand(ics: str, calendar: dict, start: datetime.datetime, end: datetime.datetime) -> tuple[icalendar.Calendar, EventStore]:
+    """Cold parse in a worker process, parsed calendar is sent back so later windows are expanded without parsing."""
+    data = icalendar.Calendar.from_ical(ics)
+    return data, expand_ics(data, calendar, start, end)
+
+
+def convert_to_datetime(date_value: icalendar.vDDDTypes, suffix_time_if_date: datetime.time) -> datetime.datetime:
+    datetime_value: datetime.datetime = date_value.dt if date_value is not None else None
+    if datetime_value and type(datetime_value) is datetime.date:
+        datetime_value: datetime.datetime = datetime.datetime.combine(datetime_value, suffix_time_if_date)
+        datetime_value: datetime.datetime = datetime_value.replace(tzinfo=datetime.timezone.utc)
+    return datetime_value
+
+
 class Calendar:
-    def __init__(self, state: AppStatus, options: dict):
+    def __init__(self, state: AppStatus, options: dict, http: HttpClient = None, timezone: str = None):
         self.state = state
+        # user.timezone, days of query windows are user's days
+        self.timezone: str = timezone
+        self.http: HttpClient = http or HttpClient()
         self.calendars: dict[str, Any] = options
         self.cache_enabled: bool = options['cache']['enabled'] == "Yes"
         self.cache_file_path: str = options['cache']['file']
         if self.cache_enabled and self.cache_file_path == "":
             raise ValueError("Cache file not specified")
 
-        self.events: list[dict] = []
+        self._events: EventStore = EventStore()
+        # source key -> {"fingerprint", "etag", "last_modified", "ics", "windows": {window: events}}
+        # only changed sources are parsed again
+        self.sources: dict[str, dict] = {}
+        self.sources_loaded: bool = False
+        self.cache_dirty: bool = False
+        # held by tools around get_events and filtering, calendar is shared by calendar tools
+        self.lock = threading.RLock()
+        # started on first cold parse of several calendars and kept for the life of calendar
+        self._pool: ProcessPoolExecutor | None = None
         self.min_time: datetime.time = datetime.datetime.min.time()
         self.max_time: datetime.time = datetime.datetime.max.time()
 
+    @property
+    def events(self) -> EventStore:
+        return self._events
+
+    @events.setter
+    def events(self, events: list[dict] | EventStore):
+        self._events = events if isinstance(events, EventStore) else EventStore(events)
+
     @staticmethod
     def get_files_by_prefix(directory_path: str, prefix: str) -> list[str]:
         files: list[str] = []
@@ -40,136 +146,220 @@ class Calendar:
         return sorted(files, key=lambda x: os.path.getctime(x), reverse=True)
 
     def load_ics_files(self):
+        url_calendars = [calendar for calendar in self.calendars["ics"] if calendar["type"] == "url"]
+        if url_calendars:
+            workers = min(len(url_calendars), int(self.calendars.get("fetch_workers", 4)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar") as pool:
+                for future in [pool.submit(Deadline.bind(self.fetch_url), calendar) for calendar in url_calendars]:
+                    future.result()
+
         for calendar in self.calendars["ics"]:
             if calendar["type"] == "url":
-                try:
-                    response = requests.get(calendar["url"])
-                    response.raise_for_status()
-                    calendar["ics"] = response.text
-                except requests.exceptions.RequestException as e:
-                    print(f"Error loading ICS file from URL: {e}")
-            elif calendar["type"] == "zip_dir":
+                continue
+            calendar["changed"] = False
+            if calendar["type"] == "zip_dir":
                 files = self.get_files_by_prefix(calendar["directory"], calendar["file"])
                 sorted_files = self.sort_files_by_creation_time(files)
                 if len(sorted_files) == 0:
                     print_text(state=self.state, text=f"No files found for calendar {calendar['name']}")
                     continue
-                ics_file_found = False
                 for file in sorted_files:
-                    print(f"Loading file: {file}")
-                    file_name, file_extension = os.path.splitext(file)
-                    if file_extension == ".zip":
-                        try:
-                            with zipfile.ZipFile(file_name+file_extension, 'r') as zip_file:
-                                file_list: list[str] = zip_file.namelist()
-                                if len(file_list) == 0:
-                                    raise ValueError(f"No files found inside zip: {zip_file}")
-
-                                with tempfile.TemporaryDirectory() as temp_dir:
-                                    for inside_zip_file in file_list:
-                                        if ics_file_found:
-                                            break
-                                        if not inside_zip_file.startswith(calendar["calendar_name"]):
-                                            continue
-                                        zip_file.extract(inside_zip_file, temp_dir)
-                                        target = os.path.join(temp_dir, inside_zip_file)
-                                        print(f"Extracting file: {inside_zip_file} into {target}")
-                                        with open(target, encoding='utf-8', mode='r') as extracted_file:
-                                            print("Reading")
-                                            calendar["ics"] = extracted_file.read()
-                                            print("Extracted")
-                                            ics_file_found = True
-                                            break
-                        except zipfile.BadZipfile as e:
-                            print(f"Error extracting ICS file from ZIP archive: {e}")
-                    elif file_extension == ".ics":
-                        if ics_file_found:
-                            break
-                        try:
-                            with open(file_name+file_extension, encoding='utf-8', mode='r') as file:
-                                calendar["ics"] = file.read()
-                                ics_file_found = True
-                        except UnicodeDecodeError as e:
-                            print(f"Error reading ICS file: {e}")
-                    else:
-                        raise ValueError(f"Unknown file extension: {file_extension}")
-                    if ics_file_found:
+                    fingerprint = self.file_fingerprint(file)
+                    if self.is_unchanged(calendar, fingerprint):
+                        break
+                    ics = self.read_ics_file(file, calendar["calendar_name"])
+                    if ics is not None:
+                        self.set_source(calendar, ics, fingerprint)
                         break
             else:
                 raise ValueError("Unknown calendar type")
 
-    def load_calendar_events(self) -> list[dict]:
-        calendar_events: list[dict] = []
+    @staticmethod
+    def read_ics_file(file: str, calendar_name: str) -> str | None:
+        """Reads ics file or the calendar member of a zip export straight from the archive."""
+        file_extension = os.path.splitext(file)[1]
+        if file_extension == ".zip":
+            try:
+                with zipfile.ZipFile(file, 'r') as zip_file:
+                    file_list: list[str] = zip_file.namelist()
+                    if len(file_list) == 0:
+                        raise ValueError(f"No files found inside zip: {file}")
+                    for inside_zip_file in file_list:
+                        if inside_zip_file.startswith(calendar_name):
+                            return zip_file.read(inside_zip_file).decode('utf-8')
+            except zipfile.BadZipfile as e:
+                print(f"Error extracting ICS file from ZIP archive: {e}")
+            return None
+        if file_extension == ".ics":
+            try:
+                with open(file, encoding='utf-8', mode='r') as f:
+                    return f.read()
+            except UnicodeDecodeError as e:
+                print(f"Error reading ICS file: {e}")
+                return None
+        raise ValueError(f"Unknown file extension: {file_extension}")
+
+    def fetch_url(self, calendar: dict):
+        """Downloads url calendar unless server says it is not modified. On error last good events stay in use."""
+        calendar["changed"] = False
+        source = self.sources.get(self.source_key(calendar), {})
+        headers = {}
+        if source.get("etag"):
+            headers["If-None-Match"] = source["etag"]
+        if source.get("last_modified"):
+            headers["If-Modified-Since"] = source["last_modified"]
+
+        kwargs = {}
+        timeout = calendar.get("timeout", self.calendars.get("timeout"))
+        if timeout:
+            kwargs["timeout"] = Deadline.current().cap(float(timeout))
+
+        try:
+            response = self.http.get(calendar["url"], headers=headers, **kwargs)
+            if response.status_code == 304:
+                return
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Error loading ICS file from URL: {e}")
+            return
+
+        calendar["etag"] = response.headers.get("ETag")
+        calendar["last_modified"] = response.headers.get("Last-Modified")
+        fingerprint = hashlib.sha256(response.content).hexdigest()
+        if self.is_unchanged(calendar, fingerprint):
+            # same content under new validators
+            source.update(etag=calendar["etag"], last_modified=calendar["last_modified"])
+            return
+        self.set_source(calendar, response.text, fingerprint)
+
+    @staticmethod
+    def source_key(calendar: dict) -> str:
+        if calendar["type"] == "url":
+            return f"url:{calendar['url']}"
+        return f"{calendar['type']}:{calendar.get('directory')}:{calendar.get('file')}:{calendar['calendar_name']}"
+
+    @staticmethod
+    def file_fingerprint(file: str) -> str:
+        stat = os.stat(file)
+        return f"{file}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def is_unchanged(self, calendar: dict, fingerprint: str) -> bool:
+        source = self.sources.get(self.source_key(calendar))
+        return source is not None and source["fingerprint"] == fingerprint
+
+    def set_source(self, calendar: dict, ics: str, fingerprint: str):
+        if self.is_unchanged(calendar, fingerprint):
+            return
+        calendar["ics"] = ics
+        calendar["fingerprint"] = fingerprint
+        calendar["changed"] = True
+
+    def load_calendar_events(self, start: datetime.datetime = None, end: datetime.datetime = None) -> EventStore:
+        expand: list[tuple[dict, dict]] = []
+        window_key: str = ""
         for calendar in self.calendars["ics"]:
-            print_text(state=self.state, text=f"Calendar: {calendar['name']} - {calendar['calendar_name']}")
-            calendar_data = icalendar.Calendar.from_ical(calendar["ics"])
-
-            earliest: datetime.datetime = None
-            last: datetime.datetime = None
-            for event in calendar_data.walk('VEVENT'):
-                start = self.convert_to_datetime(event.get("DTSTART"), self.min_time)
-                end = self.convert_to_datetime(event.get("DTEND"), self.max_time)
-                if earliest is None or (start is not None and start < earliest):
-                    earliest = start
-                if last is None or (end is not None and end > last):
-                    last = end
-
-            events = recurring_ical_events.of(calendar_data).between(earliest, last)
-            for event in events:
-                if event.is_broken or len(event.errors) > 0:
-                    raise ValueError(f"Event is broken: {event.errors}")
-
-                attendee = event.get("ATTENDEE")
-                attendees = []
-                mail_prefix = "mailto:"
-                if attendee is not None:
-                    if isinstance(attendee, icalendar.vCalAddress):
-                        attendees.append(str(attendee).replace(mail_prefix, ""))
-                    else:
-                        for x in attendee:
-                            attendees.append(str(x).replace(mail_prefix, ""))
-
-                start = self.convert_to_datetime(event.get("DTSTART"), self.min_time)
-                end = self.convert_to_datetime(event.get("DTEND"), self.max_time)
-                if end is None:
-                    end: datetime.datetime = start
-                    end: datetime.datetime = datetime.datetime.combine(end, datetime.datetime.max.time())
-                    end: datetime.datetime = end.replace(tzinfo=datetime.timezone.utc)
-                if start is None:
-                    raise ValueError("Event start or end is None")
-
-                full_day = False
-                if start is not None and end is not None:
-                    diff = end - start
-                    full_day = diff.days > 1 or diff.seconds >= 86399
-
-                organizer = str(event.get("ORGANIZER")).replace("mailto:", "")
-                if organizer == "None":
-                    organizer = ""
-
-                event_dict = {
-                    "private": calendar["private"],
-                    "calendar": calendar["calendar_name"],
-                    "name": calendar["name"],
-                    "origin": calendar["origin"],
-                    "summary": str(event.get("SUMMARY")),
-                    "start": start,
-                    "end": end,
-                    "full_day": full_day,
-                    "organizer": organizer,
-                    "attendees": attendees,
-                    "description": str(event.get("DESCRIPTION")),
-                    "status": str(event.get("STATUS")),
+            key = self.source_key(calendar)
+            if calendar.get("changed", True) and "ics" in calendar:
+                source = {
+                    "fingerprint": calendar.get("fingerprint"),
+                    "etag": calendar.get("etag"),
+                    "last_modified": calendar.get("last_modified"),
+                    "ics": calendar["ics"],
+                    "windows": {},
                 }
-                calendar_events.append(event_dict)
-        return calendar_events
+                # calendar without events needs no query window at all
+                source["empty"] = "BEGIN:VEVENT" not in source["ics"]
+                if "fingerprint" in calendar:
+                    self.sources[key] = source
+                    self.cache_dirty = True
+                    calendar.pop("ics", None)
+                    calendar["changed"] = False
+            elif key in self.sources:
+                source = self.sources[key]
+            else:
+                continue
+
+            if source["empty"]:
+                continue
+
+            if start is None or end is None:
+                start, end = self.window(days=int(self.calendars["days"]))
+            window_key = f"{start.isoformat()}/{end.isoformat()}"
+            expand.append((calendar, source))
+
+        missing = [(calendar, source) for calendar, source in expand if window_key not in source["windows"]]
+        if missing:
+            for (calendar, source), events in zip(missing, self.expand_calendars(missing, start, end)):
+                source["windows"][window_key] = events
+                if source is self.sources.get(self.source_key(calendar)):
+                    self.cache_dirty = True
+                while len(source["windows"]) > MAX_CACHED_WINDOWS:
+                    source["windows"].pop(next(iter(source["windows"])))
+
+        return EventStore.concat([source["windows"][window_key] for _, source in expand])
+
+    def window(self, day: datetime.date = None, days: int = 0) -> tuple[datetime.datetime, datetime.datetime]:
+        """From start of `day` (today by default) till end of day `days` later, days are in user time zone, bounds in UTC."""
+        day = day or today(self.timezone)
+        start = localize(datetime.datetime.combine(day, self.min_time), self.timezone)
+        end = localize(datetime.datetime.combine(day + datetime.timedelta(days=days), self.max_time), self.timezone)
+        return start.astimezone(pytz.UTC), end.astimezone(pytz.UTC)
+
+    def expand_calendars(self, sources: list[tuple[dict, dict]], start: datetime.datetime, end: datetime.datetime) -> list[EventStore]:
+        """Expands calendars, sources that were never parsed are parsed in worker processes.
+
+        Parsing is pure python and would block conversation for the sum of all calendars. Parsed calendars are kept
+        in sources, so other windows are expanded in this process without parsing again.
+        """
+        cold = [(calendar, source) for calendar, source in sources if source.get("data") is None]
+        pool = self.get_pool(len(cold))
+        futures = {}
+        if pool is not None:
+            for calendar, source in cold:
+                print_text(state=self.state, text=f"Calendar: {calendar['name']} - {calendar['calendar_name']}")
+                futures[id(source)] = pool.submit(parse_and_expand, source["ics"], calendar_fields(calendar), start, end)
+
+        expanded: list[EventStore] = []
+        for calendar, source in sources:
+            if id(source) in futures:
+                source["data"], events = futures[id(source)].result()
+                expanded.append(events)
+            else:
+                expanded.append(self.expand_calendar(calendar, source, start, end))
+        return expanded
+
+    def get_pool(self, sources: int) -> ProcessPoolExecutor | None:
+        """Worker pool for parsing this many sources, None when they are parsed here.
 
-    def convert_to_datetime(self, date_value: icalendar.vDDDTypes, suffix_time_if_date: datetime.time) -> datetime.datetime:
-        datetime_value: datetime.datetime = date_value.dt if date_value is not None else None
-        if datetime_value and type(datetime_value) is datetime.date:
-            datetime_value: datetime.datetime = datetime.datetime.combine(datetime_value, suffix_time_if_date)
-            datetime_value: datetime.datetime = datetime_value.replace(tzinfo=datetime.timezone.utc)
-        return datetime_value
+        Workers are spawned, forking a process that runs threads can deadlock. Daemon processes (tool running
+        in worker process) can not have children, they parse serially.
+        """
+        workers = min(sources, int(self.calendars.get("parse_workers", os.cpu_count() or 1)))
+        if workers <= 1 or multiprocessing.current_process().daemon:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=int(self.calendars.get("parse_workers", os.cpu_count() or 1)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def expand_calendar(self, calendar: dict, source: dict, start: datetime.datetime, end: datetime.datetime) -> EventStore:
+        """Occurrences of calendar events that overlap the window, recurring events are expanded only inside it."""
+        print_text(state=self.state, text=f"Calendar: {calendar['name']} - {calendar['calendar_name']}")
+        return expand_ics(self.parse_source(source), calendar_fields(calendar), start, end)
+
+    @staticmethod
+    def parse_source(source: dict) -> icalendar.Calendar:
+        # parsed once per source, expanding another window reuses it
+        if source.get("data") is None:
+            source["data"] = icalendar.Calendar.from_ical(source["ics"])
+        return source["data"]
 
     def remove_duplicates(self, dict_list: list[dict]) -> list[dict]:
         seen: set = set()
@@ -181,71 +371,86 @@ class Calendar:
                 unique_list.append(d)
         return unique_list
 
-    def filter_and_sort_events(self) -> list[dict]:
-        sort_by: str = "start"
-        days: int = int(self.calendars["days"])
-
-        filter_status: list[str] = self.calendars['filter_status']
-        ignore_names: list[str] = self.calendars['ignore_event_names']
-        filter_emails: list[str] = self.calendars["emails"]
-
-        filter_from_time: datetime.datetime = datetime.datetime.now()
-        filter_from_time: datetime.datetime = datetime.datetime.combine(filter_from_time.date(), self.min_time)
-
-        filter_till_time: datetime.datetime = filter_from_time + datetime.timedelta(days=days)
-        filter_till_time: datetime.datetime = datetime.datetime.combine(filter_till_time.date(), self.max_time)
-
-        filter_till_time: datetime.datetime = filter_till_time.replace(tzinfo=pytz.UTC)
-        filter_from_time: datetime.datetime = filter_from_time.replace(tzinfo=pytz.UTC)
-
-        filtered_events: list[dict] = []
-        for event in self.events:
-            email_found = len(filter_emails) == 0
-            if not email_found:
-                if event["organizer"] == '' and len(event["attendees"]) == 0:
-                    email_found = True
-                else:
-                    if event['organizer'] in filter_emails:
-                        email_found = True
-                    elif len(event['attendees']) > 0:
-                        intersection = numpy.intersect1d(filter_emails, event["attendees"])
-                        email_found = len(intersection) > 0
-            if not email_found:
-                continue
+    def filter_and_sort_events(self, start: datetime.datetime = None, end: datetime.datetime = None) -> list[dict]:
+        if start is None or end is None:
+            start, end = self.window(days=int(self.calendars["days"]))
 
-            if len(filter_status) > 0 and event['status'] not in filter_status:
-                continue
+        # store is sorted by start, so result needs no sorting
+        filtered_events = self.events.filter(
+            start,
+            end,
+            emails=self.calendars["emails"],
+            statuses=self.calendars['filter_status'],
+            ignore_summaries=self.calendars['ignore_event_names'],
+        )
+        return self.remove_duplicates(filtered_events)
 
-            if len(ignore_names) > 0 and event['summary'] in ignore_names:
-                continue
+    def get_events(self, start: datetime.datetime = None, end: datetime.datetime = None) -> EventStore:
+        """Events overlapping the window, by default from today for configured number of days."""
+        if self.cache_enabled and not self.sources_loaded:
+            self.load_cache()
+
+        self.load_ics_files()
+        self.events = self.load_calendar_events(start, end)
 
-            s = event["start"]
-            e = event["end"]
-            a = filter_from_time
-            b = filter_till_time
-            if s <= a <= e or s <= b <= e or a <= s <= b or a <= e <= b:
-                filtered_events.append(event)
+        if self.cache_enabled and self.cache_dirty:
+            self.save_cache()
+            self.cache_dirty = False
 
-        unique: list[dict] = self.remove_duplicates(filtered_events)
-        sorted_events: list[dict] = sorted(unique, key=lambda x: x[sort_by])
-        return sorted_events
+        return self.events
 
-    def get_events(self) -> list[dict]:
-        if self.cache_enabled and os.path.exists(self.cache_file_path):
-            with open(self.cache_file_path, mode='rb') as f:
-                self.events = pickle.load(f)
-                return self.events
+    def load_cache(self):
+        self.sources_loaded = True
+        try:
+            with open(self.cache_file_path, encoding='utf-8', mode='r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # missing, broken or old pickle cache, calendars are parsed again
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
 
-        self.load_ics_files()
-        self.events = self.load_calendar_events()
+        for key, source in data["sources"].items():
+            windows = {window: EventStore(self.event_from_json(event) for event in events) for window, events in source["windows"].items()}
+            self.sources[key] = {**source, "windows": windows}
 
-        if self.cache_enabled:
+    def save_cache(self):
+        data = {
+            "version": CACHE_VERSION,
+            "sources": {
+                key: {
+                    "fingerprint": source["fingerprint"],
+                    "etag": source["etag"],
+                    "last_modified": source["last_modified"],
+                    "ics": source["ics"],
+                    "empty": source["empty"],
+                    "windows": {
+                        window: [self.event_to_json(event) for event in events]
+                        for window, events in source["windows"].items()
+                    },
+                }
+                for key, source in self.sources.items()
+            },
+        }
+        directory = os.path.dirname(os.path.abspath(self.cache_file_path))
+        # write next to target and rename, readers never see half written file
+        with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', dir=directory, suffix=".tmp", delete=False) as f:
             try:
-                with open(self.cache_file_path, mode='wb') as f:
-                    pickle.dump(self.events, f)
-            except Exception as e:
-                if os.path.exists(self.cache_file_path):
-                    os.remove(self.cache_file_path)
-                raise e
+                json.dump(data, f)
+            except Exception:
+                f.close()
+                os.remove(f.name)
+                raise
+        os.replace(f.name, self.cache_file_path)
 
-        return self.events
+    @staticmethod
+    def event_to_json(event: dict) -> dict:
+        return {**event, "start": event["start"].isoformat(), "end": event["end"].isoformat()}
+
+    @staticmethod
+    def event_from_json(event: dict) -> dict:
+        return {
+            **event,
+            "start": datetime.datetime.fromisoformat(event["start"]),
+            "end": datetime.datetime.fromisoformat(event["end"]),
+        }
@@ -0,0 +1,112 @@
+import json
+from datetime import date, datetime, timedelta
+import pytz
+from unittest.mock import MagicMock
+from ..availability import WorkingHours, busy_intervals, free_slots, fully_booked, parse_minutes, parse_period
+from ..event_store import EventStore
+from ..my_calendar import Calendar
+from ...tools.my_calendar import CalendarAvailabilityTool
+
+MONDAY = date(2030, 1, 7)
+
+
+def make_event(day: date, start: str, end: str, full_day: bool = False, **fields) -> dict:
+    return {
+        "private": False, "calendar": "work", "name": "Work", "origin": "test", "summary": "Meeting",
+        "start": datetime.combine(day, datetime.strptime(start, "%H:%M").time()),
+        "end": datetime.combine(day, datetime.strptime(end, "%H:%M").time()),
+        "full_day": full_day, "organizer": "", "attendees": [], "description": "", "status": "CONFIRMED",
+        **fields,
+    }
+
+
+def test_busy_intervals_are_merged():
+    hours = WorkingHours()
+    events = [
+        make_event(MONDAY, "10:00", "11:00"),
+        make_event(MONDAY, "09:00", "10:30"),
+        make_event(MONDAY, "13:00", "14:00"),
+        make_event(MONDAY, "00:00", "23:59", full_day=True),
+    ]
+    busy = busy_intervals(events, hours, pytz.UTC)
+    assert [(start.strftime("%H:%M"), end.strftime("%H:%M")) for start, end in busy] == [("09:00", "11:00"), ("13:00", "14:00")]
+    assert len(busy_intervals(events, WorkingHours(full_day_busy=True), pytz.UTC)) == 1
+
+
+def test_free_slots_and_fully_booked_days():
+    hours = WorkingHours(start="09:00", end="17:00")
+    busy = busy_intervals([
+        make_event(MONDAY, "08:00", "09:30"),
+        make_event(MONDAY, "10:00", "16:30"),
+        make_event(MONDAY + timedelta(days=1), "09:00", "17:00"),
+        make_event(MONDAY + timedelta(days=2), "12:00", "12:30"),
+    ], hours, pytz.UTC)
+    slots = free_slots(busy, MONDAY, MONDAY + timedelta(days=6), hours, minutes=45)
+
+    assert list(slots) == [MONDAY + timedelta(days=i) for i in range(5)]
+    assert slots[MONDAY] == []
+    assert [(s.strftime("%H:%M"), e.strftime("%H:%M")) for s, e in slots[MONDAY + timedelta(days=2)]] == [("09:00", "12:00"), ("12:30", "17:00")]
+    assert fully_booked(slots) == [MONDAY, MONDAY + timedelta(days=1)]
+
+    later = free_slots(busy, MONDAY, MONDAY, hours, minutes=20, now=datetime.combine(MONDAY, datetime.min.time()) + timedelta(hours=16, minutes=35))
+    assert [(s.strftime("%H:%M"), e.strftime("%H:%M")) for s, e in later[MONDAY]] == [("16:35", "17:00")]
+
+
+def test_day_after_working_hours_is_not_fully_booked():
+    hours = WorkingHours(start="09:00", end="17:00")
+    evening = datetime.combine(MONDAY, datetime.min.time()) + timedelta(hours=18)
+    slots = free_slots([], MONDAY, MONDAY + timedelta(days=1), hours, now=evening)
+
+    assert list(slots) == [MONDAY + timedelta(days=1)]
+    assert fully_booked(slots) == []
+
+
+def test_parse_query():
+    assert parse_minutes("free 45 min this week") == 45
+    assert parse_minutes("free 2 hours next 3 days") == 120
+    assert parse_minutes("free 1.5 hours tomorrow") == 90
+    assert parse_minutes("free for 45 minutes in the next 2 weeks") == 45
+    assert parse_minutes("2 weeks, 45 minutes") == 45
+    assert parse_minutes("next 2 weeks") == 30
+    assert parse_minutes("free 1 hour next 3 months") == 60
+    assert parse_minutes("booked next month") == 30
+    assert parse_period("this week", MONDAY + timedelta(days=2)) == (MONDAY + timedelta(days=2), MONDAY + timedelta(days=6))
+    assert parse_period("next week", MONDAY) == (MONDAY + timedelta(days=7), MONDAY + timedelta(days=13))
+    assert parse_period("booked next month", date(2030, 12, 15)) == (date(2031, 1, 1), date(2031, 1, 31))
+    assert parse_period("next 3 days", MONDAY) == (MONDAY, MONDAY + timedelta(days=2))
+    assert parse_period("2030-01-02..2030-01-05", MONDAY) == (date(2030, 1, 2), date(2030, 1, 5))
+
+
+def test_availability_tool_respects_calendar_filters():
+    day = datetime.now().date() + timedelta(days=7 - datetime.now().isoweekday() + 1)
+    options = {
+        "ics": [], "cache": {"enabled": "No", "file": ""}, "days": 1, "filter_status": ["CONFIRMED"],
+        "ignore_event_names": ["Focus"], "emails": [], "availability": {"start": "09:00", "end": "12:00"},
+    }
+    calendar = Calendar(MagicMock(), options)
+    events = EventStore([
+        make_event(day, "09:00", "10:00"),
+        make_event(day, "10:00", "11:00", summary="Focus"),
+        make_event(day, "11:00", "12:00", status="CANCELLED"),
+    ])
+    calendar.load_calendar_events = MagicMock(return_value=events)
+    tool = CalendarAvailabilityTool(calendar=calendar)
+
+    assert json.loads(tool.run(f"free 60 {day.isoformat()}")) == {"minutes": 60, "free": {day.isoformat(): ["10:00-12:00"]}}
+    assert json.loads(tool.run(f"booked 150 {day.isoformat()}")) == {"fully_booked": [day.isoformat()], "working_days": 1, "minutes": 150}
+
+
+def test_availability_tool_uses_user_time_zone():
+    day = datetime.now().date() + timedelta(days=7 - datetime.now().isoweekday() + 1)
+    options = {
+        "ics": [], "cache": {"enabled": "No", "file": ""}, "days": 1, "filter_status": [],
+        "ignore_event_names": [], "emails": [], "availability": {"start": "09:00", "end": "12:00"},
+    }
+    calendar = Calendar(MagicMock(), options)
+    # 10:00 in Tokyo
+    meeting = make_event(day, "01:00", "02:00")
+    meeting["start"], meeting["end"] = pytz.UTC.localize(meeting["start"]), pytz.UTC.localize(meeting["end"])
+    calendar.load_calendar_events = MagicMock(return_value=EventStore([meeting]))
+    tool = CalendarAvailabilityTool(calendar=calendar, timezone="Asia/Tokyo")
+
+    assert json.loads(tool.run(f"free 60 {day.isoformat()}")) == {"minutes": 60, "free": {day.isoformat(): ["09:00-10:00", "11:00-12:00"]}}
@@ -0,0 +1,41 @@
+import sys
+from datetime import date, timedelta
+from unittest.mock import patch
+from .. import dates
+from ..dates import fast_path, resolve_date
+
+WEDNESDAY = date(2030, 1, 9)
+
+
+def test_fast_path_forms():
+    assert fast_path("today", WEDNESDAY) == WEDNESDAY
+    assert fast_path("now", WEDNESDAY) == WEDNESDAY
+    assert fast_path("tomorrow", WEDNESDAY) == WEDNESDAY + timedelta(days=1)
+    assert fast_path("2030-02-28", WEDNESDAY) == date(2030, 2, 28)
+    assert fast_path("2030-02-30", WEDNESDAY) is None
+    assert fast_path("friday", WEDNESDAY) == date(2030, 1, 11)
+    assert fast_path("monday", WEDNESDAY) == date(2030, 1, 14)
+    assert fast_path("wednesday", WEDNESDAY) == WEDNESDAY
+    assert fast_path("next wednesday", WEDNESDAY) == WEDNESDAY + timedelta(days=7)
+    assert fast_path("in two weeks", WEDNESDAY) is None
+
+
+def test_resolve_date_is_timezone_aware_and_skips_dateparser():
+    sys.modules.pop("dateparser", None)
+    with patch.object(dates, "today", return_value=WEDNESDAY):
+        resolved = resolve_date(" Tomorrow?", "Asia/Tokyo")
+        assert resolved.date() == date(2030, 1, 10)
+        assert resolved.hour == 0
+        assert resolved.utcoffset() == timedelta(hours=9)
+        assert resolve_date("Tomorrow", "Asia/Tokyo") is resolved
+        assert resolve_date("2030-01-20", "Europe/Riga").utcoffset() == timedelta(hours=2)
+        assert resolve_date("", "UTC") is None
+    assert "dateparser" not in sys.modules
+
+
+def test_free_form_text_falls_back_to_dateparser():
+    with patch.object(dates, "today", return_value=WEDNESDAY):
+        with patch("dateparser.parse", return_value=None) as parse:
+            assert resolve_date("some day maybe", "UTC") is None
+            parse.assert_called_once()
+    assert resolve_date("in 3 days", "UTC").date() == dates.today("UTC") + timedelta(days=3)
@@ -0,0 +1,72 @@
+import pytz
+from datetime import datetime, timedelta, timezone
+from ..event_store import EventStore
+
+DAY = datetime(2030, 1, 1, tzinfo=pytz.UTC)
+
+
+def make_event(summary: str, hours: float, length: float = 1, organizer: str = "", attendees: list = None, status: str = "CONFIRMED") -> dict:
+    return {
+        "private": False, "calendar": "work", "name": "Work", "origin": "google",
+        "summary": summary, "start": DAY + timedelta(hours=hours), "end": DAY + timedelta(hours=hours + length),
+        "full_day": False, "organizer": organizer, "attendees": attendees or [], "description": "", "status": status,
+    }
+
+
+def test_events_round_trip_sorted_by_start():
+    riga = pytz.timezone("Europe/Riga")
+    events = [
+        make_event("Late", 20, attendees=["a@example.com", "b@example.com"]),
+        {**make_event("Local", 9), "start": riga.localize(datetime(2030, 1, 1, 9)), "end": riga.localize(datetime(2030, 1, 1, 9, 30))},
+        {**make_event("Floating", 3), "start": datetime(2030, 1, 1, 3), "end": datetime(2030, 1, 1, 23, 59, 59, 999999)},
+        make_event("Early", 1, attendees=["c@example.com"]),
+    ]
+    store = EventStore(events)
+
+    assert len(store) == 4
+    assert [event["summary"] for event in store] == ["Early", "Floating", "Local", "Late"]
+    assert list(store) == sorted(events, key=lambda event: EventStore([event]).start[0])
+    assert store[2]["start"].tzinfo.zone == "Europe/Riga"
+    assert store[1]["end"] == datetime(2030, 1, 1, 23, 59, 59, 999999)
+    assert store[3]["attendees"] == ["a@example.com", "b@example.com"]
+    assert store.table.strings.count("work") == 1
+
+
+def test_filter_matches_linear_scan():
+    events = [make_event(f"event {i}", i * 7 % 50, i % 30, status="TENTATIVE" if i % 4 else "CONFIRMED") for i in range(200)]
+    store = EventStore(events)
+    for hours in range(0, 80, 5):
+        start, end = DAY + timedelta(hours=hours), DAY + timedelta(hours=hours + 3)
+        expected = sorted(
+            (e for e in events if e["start"] <= end and e["end"] >= start and e["status"] == "CONFIRMED"),
+            key=lambda x: x["start"],
+        )
+        assert store.filter(start, end, statuses=["CONFIRMED"]) == expected
+
+
+def test_filter_by_emails_and_names():
+    store = EventStore([
+        make_event("Mine", 1, organizer="me@example.com"),
+        make_event("Invited", 2, organizer="boss@example.com", attendees=["x@example.com", "me@example.com"]),
+        make_event("Not mine", 3, organizer="boss@example.com", attendees=["x@example.com"]),
+        make_event("Personal", 4),
+        make_event("Lunch", 5),
+    ])
+    events = store.filter(DAY, DAY + timedelta(days=1), emails=["me@example.com"], ignore_summaries=["Lunch", "Unknown"])
+    assert [event["summary"] for event in events] == ["Mine", "Invited", "Personal"]
+
+
+def test_concat_merges_tables():
+    home = EventStore([make_event("Gym", 5, attendees=["me@example.com"])])
+    work = EventStore([
+        {**make_event("Standup", 2), "start": datetime(2030, 1, 1, 2, tzinfo=timezone(timedelta(hours=2))), "name": "Office"},
+        make_event("Review", 8, attendees=["boss@example.com", "me@example.com"]),
+    ])
+    merged = EventStore.concat([home, EventStore(), work])
+
+    assert [event["summary"] for event in merged] == ["Standup", "Gym", "Review"]
+    assert merged[0]["name"] == "Office"
+    assert merged[0]["start"].utcoffset() == timedelta(hours=2)
+    assert merged[1]["attendees"] == ["me@example.com"]
+    assert merged[2]["attendees"] == ["boss@example.com", "me@example.com"]
+    assert len(EventStore.concat([])) == 0
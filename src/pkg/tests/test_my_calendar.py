@@ -1,8 +1,14 @@
+import json
+import zipfile
+import threading
+import time
 import pytest
 import pytz
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
-from src.pkg.my_calendar import Calendar
+from src.pkg.my_calendar import Calendar, CACHE_VERSION
+from src.http_client import HttpClient
 
 
 # Sample data for testing
@@ -49,3 +55,283 @@ def test_get_events(calendar: Calendar):
             mock_load_ics_files.assert_called_once()
             mock_load_calendar_events.assert_called_once()
             assert events == []
+
+
+ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:1
+SUMMARY:{summary}
+DTSTART:{day}T100000Z
+DTEND:{day}T110000Z
+{rule}END:VEVENT
+END:VCALENDAR
+"""
+
+
+def ics(summary: str, day: datetime = None, rule: str = "") -> str:
+    day = day or datetime.now()
+    return ICS.format(summary=summary, day=day.strftime("%Y%m%d"), rule=rule)
+
+
+def make_options(tmp_path, cache: bool = True) -> dict:
+    return {
+        "ics": [{
+            "type": "zip_dir", "directory": str(tmp_path), "file": "work", "calendar_name": "work",
+            "name": "Work", "private": False, "origin": "test",
+        }],
+        "cache": {"enabled": "Yes" if cache else "No", "file": str(tmp_path / "calendar_cache.json")},
+        "days": 1,
+        "filter_status": [],
+        "ignore_event_names": [],
+        "emails": [],
+    }
+
+
+def test_unchanged_sources_are_not_parsed_again(tmp_path):
+    ics_file = tmp_path / "work.ics"
+    ics_file.write_text(ics("Standup"))
+    calendar = Calendar(sample_state, make_options(tmp_path, cache=False))
+
+    with patch.object(Calendar, "expand_calendar", wraps=calendar.expand_calendar) as parse:
+        assert [event["summary"] for event in calendar.get_events()] == ["Standup"]
+        assert [event["summary"] for event in calendar.get_events()] == ["Standup"]
+        assert parse.call_count == 1
+
+        ics_file.write_text(ics("Planning meeting"))
+        assert [event["summary"] for event in calendar.get_events()] == ["Planning meeting"]
+        assert parse.call_count == 2
+
+
+def test_cache_file_is_versioned_json(tmp_path):
+    (tmp_path / "work.ics").write_text(ics("Standup"))
+    events = Calendar(sample_state, make_options(tmp_path)).get_events()
+
+    with open(tmp_path / "calendar_cache.json") as f:
+        assert json.load(f)["version"] == CACHE_VERSION
+
+    calendar = Calendar(sample_state, make_options(tmp_path))
+    with patch.object(Calendar, "expand_calendar") as parse:
+        assert calendar.get_events() == events
+        parse.assert_not_called()
+
+
+def test_old_pickle_cache_is_ignored(tmp_path):
+    (tmp_path / "work.ics").write_text(ics("Standup"))
+    (tmp_path / "calendar_cache.json").write_bytes(b"\x80\x04\x95not json")
+
+    events = Calendar(sample_state, make_options(tmp_path)).get_events()
+    assert [event["summary"] for event in events] == ["Standup"]
+
+
+def test_zip_export_is_read_without_extracting(tmp_path):
+    with zipfile.ZipFile(tmp_path / "work-takeout.zip", "w") as zip_file:
+        zip_file.writestr("home.ics", ics("Dinner"))
+        zip_file.writestr("work.ics", ics("Standup"))
+    calendar = Calendar(sample_state, make_options(tmp_path, cache=False))
+
+    with patch("tempfile.TemporaryDirectory") as temp_dir, patch.object(zipfile.ZipFile, "extract") as extract:
+        assert [event["summary"] for event in calendar.get_events()] == ["Standup"]
+        temp_dir.assert_not_called()
+        extract.assert_not_called()
+
+    with patch.object(zipfile, "ZipFile") as zip_file:
+        calendar.get_events()
+        zip_file.assert_not_called()
+
+
+def test_recurring_events_are_expanded_only_inside_window(tmp_path):
+    first_day = datetime.now() - timedelta(days=365 * 5)
+    (tmp_path / "work.ics").write_text(ics("Standup", day=first_day, rule="RRULE:FREQ=DAILY\n"))
+    calendar = Calendar(sample_state, make_options(tmp_path, cache=False))
+
+    events = calendar.get_events()
+    assert [event["start"].date() for event in events] == [datetime.now().date(), datetime.now().date() + timedelta(days=1)]
+
+    day = datetime.now().date() + timedelta(days=30)
+    events = calendar.get_events(*calendar.window(day=day))
+    assert [event["start"].date() for event in events] == [day]
+
+
+def test_expanded_windows_are_cached(tmp_path):
+    (tmp_path / "work.ics").write_text(ics("Standup", rule="RRULE:FREQ=WEEKLY\n"))
+    day = datetime.now().date() + timedelta(days=7)
+    calendar = Calendar(sample_state, make_options(tmp_path))
+    calendar.get_events()
+    calendar.get_events(*calendar.window(day=day))
+
+    calendar = Calendar(sample_state, make_options(tmp_path))
+    with patch.object(Calendar, "expand_calendar") as expand, patch.object(Calendar, "parse_source") as parse:
+        assert [event["start"].date() for event in calendar.get_events(*calendar.window(day=day))] == [day]
+        expand.assert_not_called()
+        parse.assert_not_called()
+
+
+def test_calendars_are_expanded_in_worker_processes(tmp_path):
+    options = make_options(tmp_path, cache=False)
+    options["ics"] = [{**options["ics"][0], "file": name, "calendar_name": name, "name": name} for name in ("work", "home", "team")]
+    for name in ("work", "home", "team"):
+        (tmp_path / f"{name}.ics").write_text(ics(f"{name} meeting", rule="RRULE:FREQ=DAILY\n"))
+
+    calendar = Calendar(sample_state, {**options, "parse_workers": 3})
+    with patch.object(Calendar, "expand_calendar") as expand:
+        events = calendar.get_events()
+        expand.assert_not_called()
+    assert sorted(event["summary"] for event in events) == ["home meeting"] * 2 + ["team meeting"] * 2 + ["work meeting"] * 2
+    assert events == Calendar(sample_state, {**options, "parse_workers": 1}).get_events()
+
+    # parsed calendars came back from workers, next window is expanded here and pool is kept for later cold parses
+    pool = calendar._pool
+    day = datetime.now().date() + timedelta(days=10)
+    with patch("icalendar.Calendar.from_ical") as parse:
+        assert len(calendar.get_events(*calendar.window(day=day))) == 3
+        parse.assert_not_called()
+    assert calendar._pool is pool
+    calendar.close()
+
+
+def test_calendars_are_parsed_serially_in_daemon_process(tmp_path):
+    options = make_options(tmp_path, cache=False)
+    options["ics"] = [{**options["ics"][0], "file": name, "calendar_name": name, "name": name} for name in ("work", "home")]
+    for name in ("work", "home"):
+        (tmp_path / f"{name}.ics").write_text(ics(f"{name} meeting"))
+
+    calendar = Calendar(sample_state, {**options, "parse_workers": 2})
+    with patch("multiprocessing.current_process", return_value=MagicMock(daemon=True)):
+        assert len(calendar.get_events()) == 2
+    assert calendar._pool is None
+
+
+def test_filter_and_sort_events_uses_filters_and_window(tmp_path):
+    calendar = Calendar(sample_state, {**make_options(tmp_path, cache=False), "emails": ["me@example.com"], "ignore_event_names": ["Lunch"]})
+    day = datetime(2030, 1, 1, tzinfo=pytz.UTC)
+
+    def event(summary: str, hour: int, organizer: str = "", attendees: list = None) -> dict:
+        return {
+            "summary": summary, "start": day + timedelta(hours=hour), "end": day + timedelta(hours=hour + 1),
+            "description": "", "organizer": organizer, "attendees": attendees or [], "status": "CONFIRMED",
+            "private": False, "calendar": "work", "name": "Work", "origin": "test", "full_day": False,
+        }
+
+    calendar.events = [
+        event("Review", 15, attendees=["other@example.com", "me@example.com"]),
+        event("Standup", 9, organizer="me@example.com"),
+        event("Lunch", 12),
+        event("Other team", 10, organizer="other@example.com"),
+        event("Tomorrow", 30),
+        event("Standup", 9, organizer="me@example.com"),
+    ]
+    events = calendar.filter_and_sort_events(*calendar.window(day=day.date()))
+    assert [e["summary"] for e in events] == ["Standup", "Review"]
+
+    calendar.events = [event("Focus", 8)]
+    assert [e["summary"] for e in calendar.filter_and_sort_events(*calendar.window(day=day.date()))] == ["Focus"]
+
+
+class CalendarHandler(BaseHTTPRequestHandler):
+    requests_log: list = []
+
+    def do_GET(self):
+        CalendarHandler.requests_log.append(self.path)
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.path.startswith("/slow"):
+            time.sleep(1)
+        body = ics(self.path.strip("/")).encode()
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    CalendarHandler.requests_log = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CalendarHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def url_options(tmp_path, urls: list[str]) -> dict:
+    options = make_options(tmp_path, cache=False)
+    options["ics"] = [
+        {"type": "url", "url": url, "calendar_name": url, "name": url, "private": False, "origin": "test"}
+        for url in urls
+    ]
+    return options
+
+
+def test_url_calendars_are_fetched_concurrently_and_conditionally(tmp_path, server):
+    urls = [f"{server}/slow.ics", f"{server}/slower.ics", f"{server}/home.ics"]
+    calendar = Calendar(sample_state, url_options(tmp_path, urls))
+
+    started = time.monotonic()
+    assert sorted(event["summary"] for event in calendar.get_events()) == ["home.ics", "slow.ics", "slower.ics"]
+    assert time.monotonic() - started < 1.8
+
+    with patch.object(Calendar, "expand_calendars") as parse:
+        assert len(calendar.get_events()) == 3
+        parse.assert_not_called()
+    assert len(CalendarHandler.requests_log) == 6
+
+
+def test_url_timeout_keeps_last_good_events(tmp_path, server):
+    options = url_options(tmp_path, [f"{server}/slow.ics"])
+    calendar = Calendar(sample_state, options, http=HttpClient(retries=0))
+    assert len(calendar.get_events()) == 1
+
+    # new content makes server send full body, which is too slow now
+    calendar.sources[Calendar.source_key(options["ics"][0])]["etag"] = None
+    options["timeout"] = 0.2
+    assert [event["summary"] for event in calendar.get_events()] == ["slow.ics"]
+
+
+TZID_ICS = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:1
+SUMMARY:Early call
+DTSTART;TZID=Europe/Riga:20300115T003000
+DTEND;TZID=Europe/Riga:20300115T010000
+END:VEVENT
+BEGIN:VEVENT
+UID:2
+SUMMARY:Late call
+DTSTART;TZID=America/Los_Angeles:20300115T200000
+DTEND;TZID=America/Los_Angeles:20300115T210000
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def test_window_days_are_in_user_time_zone(tmp_path):
+    calendar = Calendar(sample_state, make_options(tmp_path, cache=False), timezone="Asia/Tokyo")
+    start, end = calendar.window(day=datetime(2030, 1, 15).date(), days=1)
+    assert start == datetime(2030, 1, 14, 15, tzinfo=pytz.UTC)
+    assert end == datetime(2030, 1, 16, 14, 59, 59, 999999, tzinfo=pytz.UTC)
+
+    with patch("src.pkg.my_calendar.today", return_value=datetime(2030, 1, 15).date()) as today:
+        assert calendar.window()[0] == start
+        today.assert_called_once_with("Asia/Tokyo")
+
+
+@pytest.mark.parametrize("timezone, summary", [("Europe/Riga", "Early call"), ("America/Los_Angeles", "Late call")])
+def test_calendar_events_tool_keeps_events_near_midnight_in_user_zone(tmp_path, timezone, summary):
+    from src.tools.my_calendar import CalendarEventTool
+
+    (tmp_path / "work.ics").write_text(TZID_ICS)
+    calendar = Calendar(sample_state, make_options(tmp_path, cache=False), timezone=timezone)
+    tool = CalendarEventTool(calendar=calendar, timezone=timezone)
+
+    output = json.loads(tool.run("2030-01-15"))
+    assert f"Event: {summary}" in output
+    assert "Date: 2030-01-15 " in output
+    assert f"Event: {summary}" not in json.loads(tool.run("2030-01-14"))
@@ -16,6 +16,10 @@ class Agent(BaseModel):
     agent_type: str = "conversational-react-description"
     max_iterations: int = 4
     tools_enabled: bool = True
+    tool_workers: int = 4
+    tool_timeout: float = 60
+    prefetch: bool = False
+    verbose: bool = False
 
 
 class Phrases(BaseModel):
@@ -32,9 +36,66 @@ class PreParser(BaseModel):
     enabled: bool = True
 
 
+class ClipboardPreParser(PreParser):
+    poll_interval: float = 0.5
+
+
+class DirectoryPreParser(PreParser):
+    enabled: bool = False
+    token_budget: int = 8000
+    max_workers: int = 8
+    max_file_size: int = 262144
+    ignore: List[str] = [".git", "__pycache__", "node_modules", ".venv", "venv", "*.pyc", "*.lock", "*.min.js"]
+
+
 class Tool(BaseModel):
     enabled: bool = False
     config_file: str = None
+    # seconds tool result is reused. 0 disables cache, None uses tool default.
+    cache_ttl: int = None
+    # seconds expired result is still returned while it is refreshed in background.
+    cache_stale_ttl: int = 0
+    cache_size: int = 128
+    # hard timeout in seconds, None uses agent.tool_timeout.
+    timeout: float = None
+    # "inline", "thread" or "process", None uses tool default. Inline runs in agent thread without timeout, for cheap local tools.
+    # Process workers are killed on timeout, use only for tools that do not change app state.
+    isolation: str = None
+    memory_limit_mb: int = None
+
+
+class Http(BaseModel):
+    timeout: float = 10
+    connect_timeout: float = 3.05
+    host_timeouts: Dict[str, float] = {}
+    retries: int = 2
+    backoff_factor: float = 0.5
+    pool_size: int = 10
+
+
+class Routing(BaseModel):
+    enabled: bool = False
+    top_k: int = 4
+    always: List[str] = ["end_conversation", "set_use_tools"]
+    min_score: float = 0
+    embeddings_model: str = None
+    skip_agent: bool = False
+    tool_score: float = 2.0
+    tool_phrases: List[str] = []
+    classifier_model: str = None
+
+
+class Deadlines(BaseModel):
+    turn_seconds: float = None
+    degrade_seconds: float = 5
+    tasks: Dict[str, float] = {}
+
+
+class Stdin(BaseModel):
+    chunk_tokens: int = 6000
+    overlap_tokens: int = 200
+    max_workers: int = 4
+    reduce_batch: int = 5
 
 
 class User(BaseModel):
@@ -75,10 +136,11 @@ class IOOutputConfig(BaseModel):
 
 
 class PreParsers(BaseModel):
-    clipboard: PreParser
+    clipboard: ClipboardPreParser
     time: PreParser
     file: PreParser
     image: PreParser
+    directory: DirectoryPreParser = DirectoryPreParser()
 
 
 class Tools(BaseModel):
@@ -115,3 +177,7 @@ class Settings(BaseModel):
     pre_parsers: PreParsers = None
     tools: Tools = None
     tasks: Dict[str, List[str]] = []
+    stdin: Stdin = Stdin()
+    http: Http = Http()
+    routing: Routing = Routing()
+    deadline: Deadlines = Deadlines()
@@ -41,6 +41,18 @@ class ApplicationState:
         )
         return str(hash(attributes))
 
+    def get_agent_hash(self) -> str:
+        """Hash of state that agent is built from. Input, output and verbosity changes do not need new agent."""
+        attributes = (
+            self.is_new_memory,
+            self.llm_model,
+            self.are_tools_enabled,
+            self.llm_agent_type,
+            self.temperature,
+            ";".join(self.prompts),
+        )
+        return str(hash(attributes))
+
     def set_llm_model(self, llm: str):
         if llm not in self.config.settings.models:
             raise ValueError(f"Model {llm} definition not found")
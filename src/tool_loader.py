@@ -1,21 +1,35 @@
+import importlib.util
+import os
+import threading
 import yaml
-from langchain.agents import load_tools
 from langchain_core.tools import BaseTool
-from langchain_community.utilities.bing_search import BingSearchAPIWrapper
-from langchain_community.tools.bing_search.tool import BingSearchResults
 from langchain.memory import ConversationBufferMemory
-from langchain_community.utilities import SerpAPIWrapper
 from .tools import state as state_tools
 from .tools import storygen as storygen_tools
 from .tools import news as news_tools
 from .tools import datetime as datetime_tools
-from .tools import my_calendar as calendar_tools
 from .config import Configuration
 from .state import ApplicationState
-from .tools.weather import WeatherTool
-from .pkg.my_calendar import Calendar
+from .my_print import print_text
+from .tools.lazy import LazyTool
+from .tools.cache import CachedTool, ToolResultCache
+from .tools.executor import ISOLATION_INLINE, ISOLATION_PROCESS, ISOLATION_THREAD, IsolatedTool, ToolExecutor
+from .tools.prefetch import PrefetchedTool, ToolPrefetcher
 from typing import Any, Dict, List, Union, Optional
 
+# Cache TTL in seconds for tools that do not set `cache_ttl` in config.
+DEFAULT_CACHE_TTL: Dict[str, int] = {
+    "wttr_weather": 1800,
+}
+# Tools that only read or switch app state return right away, worker pool and timeout are not worth it for them.
+# Tools that do not set `isolation` in config and are not listed here run in worker thread.
+DEFAULT_ISOLATION: Dict[str, str] = {
+    name: ISOLATION_INLINE for name in (
+        "enable_disable_tools", "end_conversation", "change_model", "available_models",
+        "output_switch", "input_switch", "date_time_tool", "clear_memory",
+    )
+}
+
 
 class ToolLoader:
     def __init__(self, config: Configuration, state: ApplicationState):
@@ -23,6 +37,9 @@ class ToolLoader:
         self.config = config
         self.memory: ConversationBufferMemory = None
         self.tools: List[BaseTool] = []
+        self.caches: Dict[str, ToolResultCache] = {}
+        self.executor: ToolExecutor = ToolExecutor(max_workers=self.config.settings.agent.tool_workers)
+        self.prefetcher: Optional[ToolPrefetcher] = ToolPrefetcher() if self.config.settings.agent.prefetch else None
 
     def set_memory(self, memory: ConversationBufferMemory):
         self.memory = memory
@@ -48,27 +65,70 @@ class ToolLoader:
 
     def _add_tools_based_on_config(self):
         tool_config_methods = {
-            "bing_search": lambda: self.add_tool(self._get_bing_search_tool()),
-            "bing_news": lambda: self.add_tool(self._get_bing_news_tool()),
-            "wttr_weather": lambda: self.add_tool(self._get_weather_tool()),
-            "ics_calendar": lambda: self.add_tool(self._get_calendar_tool()),
-            "enable_disable_tools": lambda: self.add_tool(state_tools.SetToolUsage(state=self.state)),
-            "end_conversation": lambda: self.add_tool(state_tools.EndConversation(state=self.state)),
-            "change_model": lambda: self.add_tool(state_tools.SwitchModel(state=self.state, config=self.config)),
-            "available_models": lambda: self.add_tool(state_tools.RetrieveModels(config=self.config)),
-            "output_switch": lambda: self.add_tool(state_tools.SwitchOutputMethod(state=self.state)),
-            "input_switch": lambda: self.add_tool(state_tools.SwitchInputMethod(state=self.state)),
-            "date_time_tool": lambda: self.add_tool(datetime_tools.TimeTool()),
-            "clear_memory": lambda: self.add_tool(state_tools.ResetChat(state=self.state)),
-            "wikipedia": lambda: self.tools.extend(load_tools(['wikipedia'])),
-            "google_search": lambda: self.tools.extend(load_tools(["serpapi"])) if self.config.api_keys["serpapi"] else None,
-            "wolfram_alpha": lambda: self.tools.extend(load_tools(['wolfram-alpha'])),
-            "storygen": lambda: self.add_tool(storygen_tools.MakeStorygenStory(state=self.state)),
+            "bing_search": self._get_bing_search_tool,
+            "bing_news": self._get_bing_news_tool,
+            "wttr_weather": self._get_weather_tool,
+            "ics_calendar": self._get_calendar_tool,
+            "enable_disable_tools": lambda: state_tools.SetToolUsage(state=self.state),
+            "end_conversation": lambda: state_tools.EndConversation(state=self.state),
+            "change_model": lambda: state_tools.SwitchModel(state=self.state, config=self.config),
+            "available_models": lambda: state_tools.RetrieveModels(config=self.config),
+            "output_switch": lambda: state_tools.SwitchOutputMethod(state=self.state),
+            "input_switch": lambda: state_tools.SwitchInputMethod(state=self.state),
+            "date_time_tool": lambda: datetime_tools.TimeTool(),
+            "clear_memory": lambda: state_tools.ResetChat(state=self.state),
+            "wikipedia": self._get_wikipedia_tool,
+            "google_search": self._get_google_search_tool,
+            "wolfram_alpha": self._get_wolfram_alpha_tool,
+            "storygen": lambda: storygen_tools.MakeStorygenStory(state=self.state),
         }
 
         for name in self.available_tool_names():
             if name in tool_config_methods:
-                tool_config_methods[name]()
+                tools = tool_config_methods[name]()
+                for tool in tools if isinstance(tools, list) else [tools]:
+                    if tool is not None:
+                        self.add_tool(self._wrap_tool(name, tool))
+
+    def _wrap_tool(self, name: str, tool: BaseTool) -> BaseTool:
+        tool_config = self.config.settings.tools.get(name)
+        isolation = tool_config.isolation or DEFAULT_ISOLATION.get(name, ISOLATION_THREAD)
+        # decided once here, process isolated tools are built now to find out if they can be sent to a worker
+        if isolation == ISOLATION_PROCESS and not IsolatedTool.can_run_in_process(tool):
+            print_text(state=self.state, text=f"Tool {name} can not be sent to a worker process, it runs in a thread.")
+            isolation = ISOLATION_THREAD
+        tool = IsolatedTool.wrap(
+            tool,
+            executor=self.executor,
+            timeout=tool_config.timeout if tool_config.timeout is not None else self.config.settings.agent.tool_timeout,
+            isolation=isolation,
+            memory_limit_mb=tool_config.memory_limit_mb,
+        )
+
+        ttl = tool_config.cache_ttl if tool_config.cache_ttl is not None else DEFAULT_CACHE_TTL.get(name, 0)
+        if ttl > 0:
+            cache = ToolResultCache(ttl=ttl, stale_ttl=tool_config.cache_stale_ttl, max_size=tool_config.cache_size)
+            self.caches[tool.name] = cache
+            tool = CachedTool.wrap(tool, cache, timezone=self.config.settings.user.timezone)
+
+        if self.prefetcher is not None:
+            tool = PrefetchedTool.wrap(tool, self.prefetcher)
+        return tool
+
+    def prefetch(self, question: str, names: Optional[List[str]] = None) -> List[str]:
+        """Starts tool calls that question will most likely need. Returns started calls.
+
+        `names` limits prefetch to tools the agent was routed to, None means all tools.
+        """
+        if self.prefetcher is None:
+            return []
+        tools = [tool.tool if isinstance(tool, PrefetchedTool) else tool for tool in self.get_tools()]
+        if names is not None:
+            tools = [tool for tool in tools if tool.name in names]
+        return self.prefetcher.prefetch(question, tools)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        return {name: cache.stats() for name, cache in self.caches.items()}
 
     def call_tool(self, name: str, param: str = None) -> tuple[str, str]:
         for tool in self.get_tools():
@@ -100,32 +160,112 @@ class ToolLoader:
         ]
         return [tool_name for tool_name in tools_names if self._is_tool_enabled(tool_name)]
 
+    # Tools below are stubs. Heavy imports and construction happen on first tool call (see LazyTool).
+    # Missing keys and packages are checked here, so a tool that can not work is not offered to the agent at all.
+
     def _get_bing_search_tool(self) -> BaseTool:
         if self.config.api_keys["bing"] is not None:
-            bing_api = BingSearchAPIWrapper(
-                bing_subscription_key=self.config.api_keys["bing"],
-                bing_search_url=self.config.urls["bing"]["search"],
-            )
-            return BingSearchResults(api_wrapper=bing_api)
+            from langchain_community.tools.bing_search.tool import BingSearchResults
+
+            def factory() -> BaseTool:
+                from langchain_community.utilities.bing_search import BingSearchAPIWrapper
+                bing_api = BingSearchAPIWrapper(
+                    bing_subscription_key=self.config.api_keys["bing"],
+                    bing_search_url=self.config.urls["bing"]["search"],
+                )
+                return BingSearchResults(api_wrapper=bing_api)
+
+            return LazyTool.of(BingSearchResults, factory)
 
     def _get_bing_news_tool(self) -> BaseTool:
         if self.config.api_keys["bing"] is not None and self.config.urls["bing"]["news"]:
-            return news_tools.NewsRetrievalTool(
+            return LazyTool.of(news_tools.NewsRetrievalTool, lambda: news_tools.NewsRetrievalTool(
                 bing_search_url=self.config.urls["bing"]["news"],
                 subscription_key=self.config.api_keys["bing"],
-            )
+                http=self.config.http,
+            ))
 
     def _get_weather_tool(self) -> BaseTool:
-        return WeatherTool(config=self.config)
+        from .tools.weather import WeatherTool
+        return LazyTool.of(WeatherTool, lambda: WeatherTool(config=self.config))
 
-    def _get_calendar_tool(self) -> BaseTool:
+    def _get_calendar_tool(self) -> List[BaseTool]:
         calendar_config_file = self.config.settings.tools.ics_calendar.config_file
-        try:
-            with open(calendar_config_file, "r") as file:
-                calendar_options = yaml.safe_load(file)
-                calendar = Calendar(state=self.state, options=calendar_options)
-                return calendar_tools.CalendarEventTool(calendar=calendar)
-        except FileNotFoundError:
+        if not calendar_config_file or not os.path.exists(calendar_config_file):
             print(f"File {calendar_config_file} not found, skipping calendar tool...")
+            return []
+
+        # tool classes do not import icalendar, Calendar itself is imported by the factory
+        from .tools import my_calendar as calendar_tools
+
+        # both calendar tools share one Calendar, so events are loaded and cached once
+        calendars = []
+        lock = threading.Lock()
+        timezone = self.config.settings.user.timezone
+
+        def get_calendar():
+            with lock:
+                if not calendars:
+                    from .pkg.my_calendar import Calendar
+                    with open(calendar_config_file, "r") as file:
+                        calendar_options = yaml.safe_load(file)
+                    calendars.append(Calendar(state=self.state, options=calendar_options, http=self.config.http, timezone=timezone))
+                return calendars[0]
+
+        return [
+            LazyTool.of(calendar_tools.CalendarEventTool, lambda: calendar_tools.CalendarEventTool(calendar=get_calendar(), timezone=timezone)),
+            LazyTool.of(
+                calendar_tools.CalendarAvailabilityTool,
+                lambda: calendar_tools.CalendarAvailabilityTool(calendar=get_calendar(), timezone=timezone),
+            ),
+        ]
+
+    def _get_wikipedia_tool(self) -> BaseTool:
+        if not self._is_installed("wikipedia", "wikipedia"):
+            return None
+
+        from langchain_community.tools.wikipedia.tool import WikipediaQueryRun
+
+        def factory() -> BaseTool:
+            from langchain_community.utilities.wikipedia import WikipediaAPIWrapper
+            return WikipediaQueryRun(api_wrapper=WikipediaAPIWrapper())
+
+        return LazyTool.of(WikipediaQueryRun, factory)
+
+    def _get_google_search_tool(self) -> BaseTool:
+        if not self.config.api_keys["serpapi"] or not self._is_installed("google_search", "serpapi"):
             return None
 
+        # LangChain builds this one as a plain Tool, there is no class to take name and description from
+        name = "Search"
+        description = "Google search through SerpApi. Use it for current events and recent facts. Input should be a search query."
+
+        def factory() -> BaseTool:
+            from langchain_core.tools import Tool
+            from langchain_community.utilities.serpapi import SerpAPIWrapper
+            search = SerpAPIWrapper(serpapi_api_key=self.config.api_keys["serpapi"])
+            return Tool(name=name, description=description, func=search.run, coroutine=search.arun)
+
+        return LazyTool(name=name, description=description, factory=factory)
+
+    def _get_wolfram_alpha_tool(self) -> BaseTool:
+        if not self.config.api_keys["wolfram_alpha"]:
+            print("WOLFRAM_ALPHA_APPID is not set, skipping wolfram_alpha tool...")
+            return None
+        if not self._is_installed("wolfram_alpha", "wolframalpha"):
+            return None
+
+        from langchain_community.tools.wolfram_alpha.tool import WolframAlphaQueryRun
+
+        def factory() -> BaseTool:
+            from langchain_community.utilities.wolfram_alpha import WolframAlphaAPIWrapper
+            return WolframAlphaQueryRun(api_wrapper=WolframAlphaAPIWrapper(wolfram_alpha_appid=self.config.api_keys["wolfram_alpha"]))
+
+        return LazyTool.of(WolframAlphaQueryRun, factory)
+
+    @staticmethod
+    def _is_installed(tool_name: str, package: str) -> bool:
+        if importlib.util.find_spec(package) is None:
+            print(f"Package {package} is not installed, skipping {tool_name} tool...")
+            return False
+        return True
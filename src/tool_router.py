@@ -0,0 +1,147 @@
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from langchain_core.embeddings import Embeddings
+from langchain_core.tools import BaseTool
+
+STOPWORDS: Set[str] = {
+    "a", "an", "and", "any", "are", "as", "at", "be", "but", "by", "can", "do", "does", "for", "from", "get",
+    "has", "have", "how", "i", "if", "in", "input", "into", "is", "it", "its", "like", "me", "my", "not",
+    "of", "on", "or", "output", "please", "should", "that", "the", "this", "to", "tool", "use", "used",
+    "useful", "using", "was", "what", "when", "where", "which", "who", "will", "with", "you", "your",
+}
+
+
+def terms(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower().replace("_", " "))
+    return [word[:-1] if len(word) > 3 and word.endswith("s") else word for word in words if word not in STOPWORDS and len(word) > 1]
+
+
+class ToolRouter:
+    """Picks the k tools most relevant for a question, so agent prompt carries only their descriptions.
+
+    Keyword score is IDF weighted overlap of question words with tool name and description words.
+    With embeddings, cosine similarity of question and tool description is added on top.
+    """
+
+    NAME_WEIGHT = 2.0
+    EMBEDDING_WEIGHT = 2.0
+
+    def __init__(self, top_k: int = 4, always: List[str] = None, embeddings: Optional[Callable[[], Embeddings]] = None, min_score: float = 0.0):
+        self.top_k = top_k
+        self.always: Set[str] = set(always or [])
+        self.min_score = min_score
+        self._embeddings_factory = embeddings
+        self._embeddings: Optional[Embeddings] = None
+        self._index_key: Tuple[str, ...] = ()
+        self._weights: Dict[str, Dict[str, float]] = {}
+        self._idf: Dict[str, float] = {}
+        self._vectors: Dict[str, List[float]] = {}
+
+    def scores(self, question: str, tools: List[BaseTool]) -> Dict[str, float]:
+        self._build_index(tools)
+        question_terms = set(terms(question))
+        scores = {
+            tool.name: sum(self._weights[tool.name].get(term, 0.0) * self._idf.get(term, 0.0) for term in question_terms)
+            for tool in tools
+        }
+        if self._vectors:
+            try:
+                query = self._embeddings.embed_query(question)
+            except Exception:
+                self._disable_embeddings()
+            else:
+                for name, vector in self._vectors.items():
+                    scores[name] += self.EMBEDDING_WEIGHT * self._cosine(query, vector)
+        return scores
+
+    def select(self, question: str, tools: List[BaseTool]) -> List[BaseTool]:
+        """Returns tools in their original order. When nothing matches, all tools are kept."""
+        scores = self.scores(question, tools)
+        ranked = sorted((name for name, score in scores.items() if score > self.min_score), key=lambda name: -scores[name])
+        if not ranked:
+            return tools
+        selected = set(ranked[:self.top_k]) | self.always
+        return [tool for tool in tools if tool.name in selected]
+
+    def _build_index(self, tools: List[BaseTool]):
+        key = tuple(tool.name for tool in tools)
+        if key == self._index_key:
+            return
+        self._index_key = key
+
+        self._weights = {}
+        document_frequency: Dict[str, int] = {}
+        for tool in tools:
+            weights: Dict[str, float] = {term: 1.0 for term in terms(tool.description)}
+            weights.update({term: self.NAME_WEIGHT for term in terms(tool.name)})
+            self._weights[tool.name] = weights
+            for term in weights:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        self._idf = {term: math.log(1 + len(tools) / count) for term, count in document_frequency.items()}
+
+        self._vectors = {}
+        if self._embeddings_factory is not None:
+            try:
+                if self._embeddings is None:
+                    self._embeddings = self._embeddings_factory()
+                vectors = self._embeddings.embed_documents([f"{tool.name}: {tool.description}" for tool in tools])
+                self._vectors = dict(zip(key, vectors))
+            except Exception:
+                self._disable_embeddings()
+
+    def _disable_embeddings(self):
+        # embedding server is optional, keyword scoring keeps working without it
+        self._embeddings_factory = None
+        self._embeddings = None
+        self._vectors = {}
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return dot / norm if norm else 0.0
+
+
+class ToolNeedClassifier:
+    """Decides if question plausibly needs tools at all, so tool-free questions can skip the agent.
+
+    Cheap checks go first: configured phrases, then ToolRouter score of the best matching tool.
+    Questions that pass neither are asked to optional small `model`. Without model they are tool-free.
+    """
+
+    PROMPT = (
+        "Available tools: {tools}.\n"
+        "Does answering the question below need one of these tools (live data, calendar, weather, news, "
+        "search or changing assistant settings)? Answer only yes or no.\n"
+        "Question: {question}"
+    )
+
+    def __init__(self, router: ToolRouter, threshold: float = 2.0, phrases: List[str] = None, model: Optional[Callable[[], Any]] = None):
+        self.router = router
+        self.threshold = threshold
+        self.phrases: Set[str] = {phrase.lower() for phrase in phrases or []}
+        self._model_factory = model
+        self._model = None
+
+    def needs_tools(self, question: str, tools: List[BaseTool]) -> bool:
+        if not tools:
+            return False
+        words = set(re.findall(r"[a-z0-9]+", question.lower()))
+        if any(phrase in question.lower() if " " in phrase else phrase in words for phrase in self.phrases):
+            return True
+        if max(self.router.scores(question, tools).values()) >= self.threshold:
+            return True
+        if self._model_factory is None:
+            return False
+        return self._ask_model(question, tools)
+
+    def _ask_model(self, question: str, tools: List[BaseTool]) -> bool:
+        try:
+            if self._model is None:
+                self._model = self._model_factory()
+            answer = self._model.invoke(self.PROMPT.format(tools=", ".join(tool.name for tool in tools), question=question))
+        except Exception:
+            # when in doubt let the agent decide
+            return True
+        return str(getattr(answer, "content", answer)).strip().lower().startswith("yes")
@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple, Union
+from pydantic import PrivateAttr
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
+from langchain_core.tools import BaseTool
+from ..pkg import dates
+
+
+def normalize_input(tool_input: Union[str, Dict[str, Any], None]) -> str:
+    """Cache key for tool input. ' today ', 'today' and {'tool_input': 'today'} are the same call.
+
+    Only whitespace is collapsed, case is kept because search queries and file names can be case-sensitive.
+    """
+    if isinstance(tool_input, dict):
+        if len(tool_input) == 1:
+            return normalize_input(next(iter(tool_input.values())))
+        return json.dumps({key: normalize_input(value) for key, value in tool_input.items()}, sort_keys=True)
+    if tool_input is None:
+        return ""
+    return " ".join(str(tool_input).split())
+
+
+def cache_key(tool_input: Union[str, Dict[str, Any], None], timezone: Optional[str] = None) -> str:
+    """Input that depends on current day ('today', 'friday', empty input defaulting to today) is keyed by day too,
+    so results cached before midnight are not served after it."""
+    key = normalize_input(tool_input)
+    if dates.is_relative(key):
+        return f"{key}@{dates.today(timezone).isoformat()}"
+    return key
+
+
+def is_cacheable(value: str) -> bool:
+    """Empty results and error observations are not cached, next call tries again."""
+    if not value.strip():
+        return False
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return True
+    return bool(parsed) and not (isinstance(parsed, dict) and "error" in parsed)
+
+
+class ToolResultCache:
+    """Bounded LRU of tool results. Entries are fresh for `ttl` seconds and can be served stale for `stale_ttl` more."""
+
+    def __init__(self, ttl: float, stale_ttl: float = 0, max_size: int = 128):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.hits: int = 0
+        self.stale_hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[Optional[str], bool]:
+        """Returns (value, is_stale). Value is None on miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry[0]
+                if age <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], False
+                if age <= self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return entry[1], True
+                del self._entries[key]
+            self.misses += 1
+            return None, False
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def start_refresh(self, key: str) -> bool:
+        """Marks key as being refreshed. Returns False if refresh is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        requests = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / requests, 2) if requests else 0.0,
+            "size": len(self._entries),
+        }
+
+
+class CachedTool(BaseTool):
+    """Wraps any tool with ToolResultCache. Stale results are returned immediately and refreshed in background."""
+
+    tool: BaseTool
+    cache: ToolResultCache
+    # user.timezone, day of relative inputs is taken in it
+    timezone: Optional[str] = None
+    _refresh_threads: Dict[str, threading.Thread] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def wrap(cls, tool: BaseTool, cache: ToolResultCache, timezone: Optional[str] = None) -> "CachedTool":
+        return cls(name=tool.name, description=tool.description, tool=tool, cache=cache, timezone=timezone)
+
+    def _run(self, tool_input: str = "", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        key = cache_key(tool_input, self.timezone)
+        value, is_stale = self.cache.get(key)
+        if value is not None:
+            if is_stale:
+                self._refresh_in_background(key, tool_input)
+            return value
+
+        value = str(self.tool.run(tool_input, callbacks=run_manager.get_child() if run_manager else None))
+        if is_cacheable(value):
+            self.cache.set(key, value)
+        return value
+
+    async def _arun(self, tool_input: str = "", run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        key = cache_key(tool_input, self.timezone)
+        value, is_stale = self.cache.get(key)
+        if value is not None:
+            if is_stale:
+                self._refresh_in_background(key, tool_input)
+            return value
+
+        value = str(await self.tool.arun(tool_input, callbacks=run_manager.get_child() if run_manager else None))
+        if is_cacheable(value):
+            self.cache.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key: str, tool_input: str):
+        if not self.cache.start_refresh(key):
+            return
+
+        def refresh():
+            try:
+                value = str(self.tool.run(tool_input))
+                if is_cacheable(value):
+                    self.cache.set(key, value)
+            except Exception:
+                # keep serving stale value, next call past stale_ttl will surface the error
+                pass
+            finally:
+                self.cache.end_refresh(key)
+                self._refresh_threads.pop(key, None)
+
+        thread = threading.Thread(target=refresh, name=f"refresh-{self.name}", daemon=True)
+        self._refresh_threads[key] = thread
+        thread.start()
@@ -1,7 +1,7 @@
 import time
 from typing import Optional
 from langchain.tools import BaseTool
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
 
 
 class TimeTool(BaseTool):
@@ -14,6 +14,9 @@ class TimeTool(BaseTool):
         return_value: str = "AI: "+time.strftime("%H:%M:%S")
         return return_value
 
+    async def _arun(self, location: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(location)
+
 
 class DateTool(BaseTool):
     """Tool that gets current date."""
@@ -25,6 +28,9 @@ class DateTool(BaseTool):
         return_value: str = "AI: "+time.strftime("%Y-%m-%d")
         return return_value
 
+    async def _arun(self, location: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(location)
+
 
 class DateTimeTool(BaseTool):
     """Tool that gets current date and time."""
@@ -39,6 +45,9 @@ class DateTimeTool(BaseTool):
         return_value: str = "AI: Current date and time is: " + time.strftime("%Y-%m-%d %H:%M:%S")
         return return_value
 
+    async def _arun(self, timezone: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(timezone)
+
 
 class TextTool(BaseTool):
     """Tool that shows text."""
@@ -54,3 +63,6 @@ class TextTool(BaseTool):
         current_struct_time: time.struct_time = time.localtime(current_time)
         return_value: str = "AI: Current date and time is: " + time.strftime("%Y-%m-%d %H:%M:%S", current_struct_time)
         return return_value
+
+    async def _arun(self, timezone: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(timezone)
@@ -0,0 +1,200 @@
+import asyncio
+import functools
+import json
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
+from langchain_core.tools import BaseTool, ToolException
+from .lazy import LazyTool
+from ..deadline import Deadline
+
+ISOLATION_INLINE = "inline"
+ISOLATION_THREAD = "thread"
+ISOLATION_PROCESS = "process"
+ISOLATIONS = (ISOLATION_INLINE, ISOLATION_THREAD, ISOLATION_PROCESS)
+
+
+class ToolTimeoutError(Exception):
+    pass
+
+
+class ToolProcessError(Exception):
+    pass
+
+
+def _run_in_child(func: Callable[[], Any], connection, memory_limit_mb: Optional[int]):
+    if memory_limit_mb:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        connection.send((True, str(func())))
+    except BaseException as e:
+        connection.send((False, f"{e.__class__.__name__}: {e}"))
+    finally:
+        connection.close()
+
+
+def _run_tool(tool: BaseTool, tool_input: str) -> str:
+    return tool.run(tool_input)
+
+
+class ToolExecutor:
+    """Runs tool calls in a bounded thread pool or in worker processes with hard timeouts.
+
+    Threads can not be killed, so a timed out thread keeps running in background while the agent moves on.
+    Its pool is replaced then, so abandoned calls never take worker slots from the next tool calls.
+    Process workers are spawned, not forked, forking the app would copy locks held by its other threads.
+    They start a fresh interpreter, so use them for slow tools. Workers are killed on timeout and can have a memory limit.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.pool = self._new_pool()
+        self.abandoned: int = 0
+        self._pool_lock = threading.Lock()
+        self._process_slots = threading.BoundedSemaphore(max_workers)
+
+    def _new_pool(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+
+    def run_in_thread(self, func: Callable[[], Any], timeout: Optional[float]) -> Any:
+        with self._pool_lock:
+            pool = self.pool
+        future = pool.submit(Deadline.bind(func))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            if not future.cancel():
+                self._abandon(pool)
+            raise ToolTimeoutError(f"did not finish in {timeout} seconds")
+
+    def _abandon(self, pool: ThreadPoolExecutor):
+        # queued calls of old pool still run, its threads exit when their calls return
+        with self._pool_lock:
+            self.abandoned += 1
+            if self.pool is pool:
+                self.pool = self._new_pool()
+                pool.shutdown(wait=False)
+
+    def run_in_process(self, func: Callable[[], Any], timeout: Optional[float], memory_limit_mb: Optional[int] = None) -> str:
+        """func is pickled to the worker, use module level functions and picklable arguments (see `can_pickle`)."""
+        context = multiprocessing.get_context("spawn")
+        with self._process_slots:
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_run_in_child, args=(func, sender, memory_limit_mb))
+            process.start()
+            sender.close()
+            try:
+                if not receiver.poll(timeout):
+                    process.kill()
+                    raise ToolTimeoutError(f"did not finish in {timeout} seconds, worker process killed")
+                try:
+                    ok, value = receiver.recv()
+                except EOFError:
+                    process.join()
+                    raise ToolProcessError(f"worker process exited with code {process.exitcode}")
+                if not ok:
+                    raise ToolProcessError(f"failed with {value}")
+                return value
+            finally:
+                receiver.close()
+                process.join(timeout=1)
+
+    @staticmethod
+    def can_pickle(value: Any) -> bool:
+        try:
+            pickle.dumps(value)
+            return True
+        except Exception:
+            return False
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class IsolatedTool(BaseTool):
+    """Runs wrapped tool through ToolExecutor. Timeouts, worker crashes and tools that could not be built become error observations for the agent."""
+
+    tool: BaseTool
+    executor: ToolExecutor
+    timeout: Optional[float] = None
+    isolation: str = ISOLATION_THREAD
+    memory_limit_mb: Optional[int] = None
+
+    @classmethod
+    def wrap(cls, tool: BaseTool, executor: ToolExecutor, timeout: Optional[float], isolation: str = ISOLATION_THREAD, memory_limit_mb: Optional[int] = None) -> BaseTool:
+        """Inline tools are returned as they are, they run in the agent thread without timeout."""
+        if isolation not in ISOLATIONS:
+            raise ValueError(f"Unknown tool isolation: {isolation}")
+        if isolation == ISOLATION_INLINE:
+            return tool
+        return cls(
+            name=tool.name,
+            description=tool.description,
+            tool=tool,
+            executor=executor,
+            timeout=timeout,
+            isolation=isolation,
+            memory_limit_mb=memory_limit_mb,
+        )
+
+    @staticmethod
+    def can_run_in_process(tool: BaseTool) -> bool:
+        """Worker process gets the built tool pickled. Lazy tools are built for the check, tools that are not
+        available pass, their calls report it."""
+        try:
+            tool = tool.load() if isinstance(tool, LazyTool) else tool
+        except ToolException:
+            return True
+        return ToolExecutor.can_pickle(tool)
+
+    @property
+    def uses_process(self) -> bool:
+        return self.isolation == ISOLATION_PROCESS
+
+    def _run(self, tool_input: str = "", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        callbacks = run_manager.get_child() if run_manager else None
+        timeout = Deadline.current().cap(self.timeout)
+        try:
+            if self.uses_process:
+                return self._run_in_process(tool_input, timeout)
+            return str(self.executor.run_in_thread(lambda: self.tool.run(tool_input, callbacks=callbacks), timeout))
+        except ToolTimeoutError as e:
+            return self._error("timeout", str(e))
+        except ToolProcessError as e:
+            return self._error("failed", str(e))
+        except ToolException as e:
+            return self._error("unavailable", f"is not available ({e.__cause__ or e})")
+
+    async def _arun(self, tool_input: str = "", run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        timeout = Deadline.current().cap(self.timeout)
+        try:
+            if self.uses_process:
+                return await asyncio.to_thread(self._run_in_process, tool_input, timeout)
+            # coroutines can be really cancelled, unlike threads
+            callbacks = run_manager.get_child() if run_manager else None
+            return str(await asyncio.wait_for(self.tool.arun(tool_input, callbacks=callbacks), timeout=timeout))
+        except asyncio.TimeoutError:
+            return self._error("timeout", f"did not finish in {timeout} seconds")
+        except ToolTimeoutError as e:
+            return self._error("timeout", str(e))
+        except ToolProcessError as e:
+            return self._error("failed", str(e))
+        except ToolException as e:
+            return self._error("unavailable", f"is not available ({e.__cause__ or e})")
+
+    def _run_in_process(self, tool_input: str, timeout: Optional[float]) -> str:
+        # build in parent, worker gets the ready tool
+        tool = self.tool.load() if isinstance(self.tool, LazyTool) else self.tool
+        return self.executor.run_in_process(functools.partial(_run_tool, tool, tool_input), timeout, self.memory_limit_mb)
+
+    def _error(self, error: str, message: str) -> str:
+        return json.dumps({
+            "error": error,
+            "tool": self.name,
+            "message": f"Tool {self.name} {message}. Answer without this tool or try again later.",
+        })
@@ -0,0 +1,50 @@
+import threading
+from typing import Callable, Optional, Type
+from pydantic import PrivateAttr
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
+from langchain_core.tools import BaseTool, ToolException
+
+
+class LazyTool(BaseTool):
+    """Tool stub that carries name and description for agent prompt.
+
+    Real tool is imported and built by `factory` on first call, so tools that conversation never uses cost nothing.
+    """
+
+    factory: Callable[[], Optional[BaseTool]] = None
+    _tool: Optional[BaseTool] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def of(cls, tool_class: Type[BaseTool], factory: Callable[[], Optional[BaseTool]]) -> "LazyTool":
+        return cls(
+            name=tool_class.model_fields["name"].default,
+            description=tool_class.model_fields["description"].default,
+            factory=factory,
+        )
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._tool is not None
+
+    def load(self) -> BaseTool:
+        if self._tool is None:
+            with self._lock:
+                if self._tool is None:
+                    try:
+                        tool = self.factory()
+                    except ToolException:
+                        raise
+                    except Exception as e:
+                        # e.g. pydantic ValidationError for a missing key, agent gets it as tool error
+                        raise ToolException(f"Tool {self.name} is not available: {e}") from e
+                    if tool is None:
+                        raise ToolException(f"Tool {self.name} is not available.")
+                    self._tool = tool
+        return self._tool
+
+    def _run(self, tool_input: str = "", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        return self.load().run(tool_input, callbacks=run_manager.get_child() if run_manager else None)
+
+    async def _arun(self, tool_input: str = "", run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return await self.load().arun(tool_input, callbacks=run_manager.get_child() if run_manager else None)
@@ -1,10 +1,11 @@
-from typing import Optional, List
-from datetime import datetime
-import dateparser
+from typing import Any, Optional, List
+from datetime import datetime, timedelta
+import asyncio
 import json
 from langchain.tools import BaseTool
-from langchain_core.callbacks import CallbackManagerForToolRun
-from ..pkg.my_calendar import Calendar
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
+from ..pkg import availability
+from ..pkg.dates import resolve_date, today, zone
 
 
 class CalendarEventTool(BaseTool):
@@ -19,32 +20,96 @@ class CalendarEventTool(BaseTool):
         "A JSON string representing a weather."
     )
 
-    calendar: Calendar = None
+    # pkg.my_calendar.Calendar, not imported here so tool stubs do not load icalendar
+    calendar: Any = None
+    # user.timezone, dates like 'today' are resolved in it
+    timezone: Optional[str] = None
 
     def _run(self, date: Optional[str] = "Today", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
-        self.calendar.get_events()
-        events = self.calendar.filter_and_sort_events()
+        filter_date: Optional[datetime] = resolve_date(date, self.timezone)
 
-        now: datetime = datetime.now()
+        # recurring events are expanded only for the asked day
+        start, end = self.calendar.window(day=filter_date.date()) if filter_date else (None, None)
+        with self.calendar.lock:
+            self.calendar.get_events(start, end)
+            events = self.calendar.filter_and_sort_events(start, end)
+
+        tz = zone(self.timezone)
+        now: datetime = datetime.now(tz)
         current_time: str = now.strftime("%Y-%m-%d %H:%M")
         output: List[str] = [f"Current time is {current_time}", "Here are calendar events:"]
 
-        filter_date: Optional[datetime] = dateparser.parse(date) if date else None
-
         found = False
         for event in events:
-            event_date = event["start"].strftime("%Y-%m-%d")
+            # timed events are shown on user's day, full day and floating events on their own date
+            local = event
+            if not event["full_day"] and event["start"].tzinfo is not None:
+                local = {**event, "start": event["start"].astimezone(tz), "end": event["end"].astimezone(tz)}
+            event_date = local["start"].strftime("%Y-%m-%d")
             if filter_date and filter_date.strftime("%Y-%m-%d") != event_date:
                 continue
 
             found = True
             output.append("")
-            output.append(f"Date: {event_date} {'(Today)' if now.date() == event['start'].date() else ''}")
+            output.append(f"Date: {event_date} {'(Today)' if now.date() == local['start'].date() else ''}")
             output.append(f"Event: {event['summary'].replace(',', ' ')}")
-            output.append(f"Time: {event['start'].strftime('%H:%M')} - {event['end'].strftime('%H:%M')}")
+            output.append(f"Time: {local['start'].strftime('%H:%M')} - {local['end'].strftime('%H:%M')}")
             output.append(f"Calendar: {event['calendar'] if event['calendar'].lower() != event['name'].lower() else event['name']}")
 
         if not found:
             output.append("No events, there is nothing planned.")
 
         return json.dumps(output)
+
+    async def _arun(self, date: Optional[str] = "Today", run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        # downloading and parsing calendars is slow, keep it off the event loop
+        return await asyncio.to_thread(self._run, date)
+
+
+class CalendarAvailabilityTool(BaseTool):
+    """Tool for finding free time and fully booked days in calendar."""
+
+    name: str = "calendar_availability"
+    description: str = (
+        "Use this tool to find free time slots or fully booked days in calendar. "
+        "Input is mode, optional slot length and period, for example "
+        "'free 45 min this week', 'free 2 hours tomorrow', 'booked next month' or 'free 2030-01-02..2030-01-05'. "
+        "Periods: today, tomorrow, this week, next week, this month, next month, next N days or dates. "
+        "Returns compact JSON with free slots per day or list of fully booked days."
+    )
+
+    calendar: Any = None
+    timezone: Optional[str] = None
+
+    def _run(self, query: Optional[str] = "free this week", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        query = query or "free this week"
+        tz = zone(self.timezone)
+        # free slots are in user wall clock time
+        now: datetime = datetime.now(tz).replace(tzinfo=None)
+        hours = availability.WorkingHours(**(self.calendar.calendars.get("availability") or {}))
+        minutes = availability.parse_minutes(query)
+        day_from, day_to = availability.parse_period(query, today(self.timezone))
+
+        # one day margin for floating events, they are stored as if they were UTC
+        start, end = self.calendar.window(day=day_from - timedelta(days=1), days=(day_to - day_from).days + 2)
+        with self.calendar.lock:
+            self.calendar.get_events(start, end)
+            busy = availability.busy_intervals(self.calendar.filter_and_sort_events(start, end), hours, tz)
+        slots = availability.free_slots(busy, day_from, day_to, hours, minutes, now=now)
+
+        if "book" in query.lower() or "busy" in query.lower():
+            return json.dumps({
+                "fully_booked": [day.isoformat() for day in availability.fully_booked(slots)],
+                "working_days": len(slots),
+                "minutes": minutes,
+            })
+        return json.dumps({
+            "minutes": minutes,
+            "free": {
+                day.isoformat(): [f"{start:%H:%M}-{end:%H:%M}" for start, end in gaps]
+                for day, gaps in slots.items() if gaps
+            },
+        })
+
+    async def _arun(self, query: Optional[str] = "free this week", run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return await asyncio.to_thread(self._run, query)
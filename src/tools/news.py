@@ -1,6 +1,8 @@
-from typing import Optional, Dict, List
-from langchain_core.callbacks import CallbackManagerForToolRun
+from typing import Optional, Dict, List, Tuple
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
 from langchain_core.tools import BaseTool
+from pydantic import Field
+from ..http_client import HttpClient
 import json
 import requests
 
@@ -23,6 +25,7 @@ class NewsRetrievalTool(BaseTool):
     results_count: int = 10
     bing_search_url: str
     subscription_key: str
+    http: HttpClient = Field(default_factory=HttpClient)
 
     def _run(
         self,
@@ -38,7 +41,21 @@ class NewsRetrievalTool(BaseTool):
         Returns:
             A JSON string representing a list of news articles.
         """
+        url, headers, search_parameters = self._request(search_query)
+        response = self.http.get(url, headers=headers, params=search_parameters)
+        return self._format(response)
 
+    async def _arun(
+        self,
+        search_query: str,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> str:
+        """Retrieve the latest news articles asynchronously. See `_run`."""
+        url, headers, search_parameters = self._request(search_query)
+        response = await self.http.aget(url, headers=headers, params=search_parameters)
+        return self._format(response)
+
+    def _request(self, search_query: str) -> Tuple[str, Dict[str, str], Dict[str, str]]:
         search_parameters: Dict[str, str] = {
             'mkt': 'en-US',
             'cc': 'Germany',
@@ -63,7 +80,10 @@ class NewsRetrievalTool(BaseTool):
         url: str = f"{self.bing_search_url}{url_suffix}"
 
         headers = {'Ocp-Apim-Subscription-Key': self.subscription_key}
-        response = requests.get(url, headers=headers, params=search_parameters)
+        return url, headers, search_parameters
+
+    @staticmethod
+    def _format(response: requests.Response) -> str:
         response.raise_for_status()
         news_articles: dict = json.loads(response.text)
 
@@ -0,0 +1,134 @@
+import asyncio
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+from pydantic import BaseModel
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
+from langchain_core.tools import BaseTool
+from ..enrichers import check_text_for_phrases
+from .cache import normalize_input
+from ..deadline import Deadline
+
+
+class PrefetchRule(BaseModel):
+    tool: str
+    phrases: Set[str]
+    input: str = ""
+    # agent inputs that give the same result as `input`
+    aliases: Set[str] = set()
+    # input used instead of `input` when this phrase is in the question
+    input_phrases: Dict[str, str] = {}
+
+    def input_for(self, question: str) -> Tuple[str, Set[str]]:
+        phrase, found = check_text_for_phrases(None, question, set(self.input_phrases), contains=True)
+        if found:
+            tool_input = self.input_phrases[phrase]
+            return tool_input, {_key(tool_input)}
+        return self.input, {_key(self.input)} | {_key(alias) for alias in self.aliases}
+
+
+DEFAULT_PREFETCH_RULES: List[PrefetchRule] = [
+    PrefetchRule(
+        tool="weather",
+        phrases={"weather", "rain", "raining", "temperature", "forecast", "sunny", "umbrella", "jacket"},
+        input="today",
+        aliases={"now", "current"},
+        input_phrases={"tomorrow": "tomorrow"},
+    ),
+    PrefetchRule(
+        tool="calendar_events",
+        # 'today' or 'tomorrow' alone is not enough, they are in weather, news and plenty of other questions
+        phrases={"calendar", "meeting", "meetings", "event", "events", "schedule", "agenda", "appointment", "appointments"},
+        input="today",
+        aliases={"now"},
+        input_phrases={"tomorrow": "tomorrow"},
+    ),
+    PrefetchRule(
+        tool="get_news",
+        phrases={"news", "headlines", "happening"},
+        input="trendingtopics",
+    ),
+]
+
+
+def _key(tool_input) -> str:
+    # rules are about dates, 'Today' from the agent is the same call as prefetched 'today'
+    return normalize_input(tool_input).lower()
+
+
+def _words(question: str) -> str:
+    # check_text_for_phrases splits on whitespace, so "weather?" would not match "weather"
+    return re.sub(r"[^\w\s]", " ", question)
+
+
+class ToolPrefetcher:
+    """Starts likely tool calls in background as soon as question is known.
+
+    When agent then calls the same tool with an equivalent input it gets prefetched result,
+    so tool latency is hidden behind the first LLM round-trip.
+    """
+
+    def __init__(self, rules: List[PrefetchRule] = None, max_workers: int = 3):
+        self.rules: List[PrefetchRule] = rules if rules is not None else DEFAULT_PREFETCH_RULES
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._prefetched: Dict[str, Tuple[Set[str], Future]] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, question: str, tools: List[BaseTool]) -> List[str]:
+        """Starts prefetch for tools matched by question phrases. Results of previous question are dropped."""
+        question = _words(question)
+        tools_by_name = {tool.name: tool for tool in tools}
+        started: List[str] = []
+        with self._lock:
+            self._prefetched.clear()
+            for rule in self.rules:
+                tool = tools_by_name.get(rule.tool)
+                if tool is None or rule.tool in self._prefetched:
+                    continue
+                _, found = check_text_for_phrases(None, question, rule.phrases, contains=True)
+                if not found:
+                    continue
+                tool_input, accepted_inputs = rule.input_for(question)
+                self._prefetched[rule.tool] = (accepted_inputs, self.pool.submit(Deadline.bind(tool.run), tool_input))
+                started.append(f"{rule.tool}({tool_input})")
+        return started
+
+    def take(self, name: str, tool_input) -> Optional[Future]:
+        """Returns prefetched call for this tool and input, if there is one."""
+        with self._lock:
+            prefetched = self._prefetched.get(name)
+            if prefetched is None or _key(tool_input) not in prefetched[0]:
+                return None
+            del self._prefetched[name]
+            return prefetched[1]
+
+
+class PrefetchedTool(BaseTool):
+    """Returns prefetched result when there is one, otherwise calls wrapped tool."""
+
+    tool: BaseTool
+    prefetcher: ToolPrefetcher
+
+    @classmethod
+    def wrap(cls, tool: BaseTool, prefetcher: ToolPrefetcher) -> "PrefetchedTool":
+        return cls(name=tool.name, description=tool.description, tool=tool, prefetcher=prefetcher)
+
+    def _run(self, tool_input: str = "", run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
+        future = self.prefetcher.take(self.name, tool_input)
+        if future is not None:
+            try:
+                return str(future.result())
+            except Exception:
+                # prefetch failed, call tool the usual way so agent sees real error
+                pass
+        return str(self.tool.run(tool_input, callbacks=run_manager.get_child() if run_manager else None))
+
+    async def _arun(self, tool_input: str = "", run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        future = self.prefetcher.take(self.name, tool_input)
+        if future is not None:
+            try:
+                return str(await asyncio.wrap_future(future))
+            except Exception:
+                pass
+        return str(await self.tool.arun(tool_input, callbacks=run_manager.get_child() if run_manager else None))
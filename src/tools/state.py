@@ -1,5 +1,5 @@
 from typing import Optional
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 from ..state import ApplicationState
 from ..config import Configuration
@@ -15,6 +15,9 @@ class EndConversation(BaseTool):
         self.state.is_stopped = True
         return "AI: Exit"
 
+    async def _arun(self, model: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(model)
+
 
 class RetrieveModels(BaseTool):
     name: str = "get_models"
@@ -29,6 +32,9 @@ class RetrieveModels(BaseTool):
         models.extend(synonym for options in self.config.settings.models.values() for synonym in options.synonyms)
         return "AI: "+str(models)
 
+    async def _arun(self, model: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(model)
+
 
 class SwitchModel(BaseTool):
     name: str = "switch_model"
@@ -49,6 +55,9 @@ class SwitchModel(BaseTool):
                 return f"Changed to {model}"
         return f"AI: Not changed. Given model does not exist: '{model}'"
 
+    async def _arun(self, model: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(model)
+
 
 class ResetChat(BaseTool):
     name: str = "reset_chat"
@@ -62,6 +71,9 @@ class ResetChat(BaseTool):
         self.state.is_new_memory = True
         return "AI: Cleared this conversation."
 
+    async def _arun(self, something: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(something)
+
 
 class SwitchInputMethod(BaseTool):
     name: str = "use_input_method"
@@ -77,6 +89,9 @@ class SwitchInputMethod(BaseTool):
         self.state.set_input_model(input_model)
         return f"AI: Input changed to {input_model}"
 
+    async def _arun(self, method: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(method)
+
 
 class SwitchOutputMethod(BaseTool):
     name: str = "use_output_method"
@@ -94,6 +109,9 @@ class SwitchOutputMethod(BaseTool):
         self.state.set_output_model(output_model)
         return f"AI: Output changed to {output_model}"
 
+    async def _arun(self, method: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(method)
+
 
 class SetToolUsage(BaseTool):
     name: str = "set_use_tools"
@@ -108,3 +126,6 @@ class SetToolUsage(BaseTool):
     def _run(self, use_tools: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         self.state.use_tools = use_tools.lower() == "yes"
         return "AI: Set to use tools." if self.state.use_tools else "Set to not use tools."
+
+    async def _arun(self, use_tools: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        return self._run(use_tools)
@@ -1,8 +1,9 @@
 from typing import Optional
-from langchain_core.callbacks import CallbackManagerForToolRun
+from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
 from langchain_core.tools import BaseTool
 import asyncio
 import os
+import subprocess
 
 
 class MakeStorygenStory(BaseTool):
@@ -18,27 +19,34 @@ class MakeStorygenStory(BaseTool):
     def _run(self, prompt: str, run_manager: Optional[CallbackManagerForToolRun] = None) -> str:
         print(f"Running {self.name} with prompt: {prompt}")
 
-        cmd = ["storygen", "story", "create", prompt]
+        proc = subprocess.run(self._command(prompt), capture_output=True, env=self._env())
+        return self._result(proc.stdout, proc.stderr)
 
-        env = {
+    async def _arun(self, prompt: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None) -> str:
+        print(f"Running {self.name} with prompt: {prompt}")
+
+        proc = await asyncio.create_subprocess_exec(
+            *self._command(prompt),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._env(),
+        )
+        stdout, stderr = await proc.communicate()
+        return self._result(stdout, stderr)
+
+    @staticmethod
+    def _command(prompt: str) -> list[str]:
+        return ["storygen", "story", "create", prompt]
+
+    @staticmethod
+    def _env() -> dict[str, str]:
+        return {
             **os.environ,
             "HOME": os.path.expanduser("~"),
         }
-        async def run_async_subprocess():
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env,
-            )
-            stdout, stderr = await proc.communicate()
-            return stdout, stderr, proc.returncode
-
-        # Get the current event loop (works even if one is running)
-        #stdout, stderr, returncode = asyncio.run(run_async_subprocess())
-        loop = asyncio.get_event_loop()
-        stdout, stderr, returncode = loop.run_until_complete(run_async_subprocess())
 
+    @staticmethod
+    def _result(stdout: bytes, stderr: bytes) -> str:
         output = stdout.decode()
         print(f"STDOUT: {output}")
         if stderr:
@@ -49,7 +57,3 @@ class MakeStorygenStory(BaseTool):
         file = output.split(": ")[-1]
 
         return f"Story audio file created successfully in {file}"
-
-    async def _arun(self, *args, **kwargs):
-        """Use the tool asynchronously. Not implemented."""
-        raise NotImplementedError
@@ -0,0 +1,35 @@
+import time
+from typing import Optional
+from langchain_core.agents import AgentActionMessageLog, AgentFinish
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool
+from src.agent_executor import ParallelAgentExecutor
+
+
+class SleepTool(BaseTool):
+    name: str = "sleep"
+    description: str = "Sleeps."
+
+    def _run(self, seconds: Optional[str] = "0", run_manager=None) -> str:
+        time.sleep(float(seconds))
+        return f"slept {seconds}"
+
+
+def plan(inputs):
+    if inputs["intermediate_steps"]:
+        return AgentFinish({"output": ", ".join(step[1] for step in inputs["intermediate_steps"])}, "")
+    return [
+        AgentActionMessageLog(tool="sleep", tool_input="0.5", log="", message_log=[AIMessage(content="")]),
+        AgentActionMessageLog(tool="sleep", tool_input="0.6", log="", message_log=[AIMessage(content="")]),
+    ]
+
+
+def test_tool_calls_of_one_step_run_in_parallel():
+    executor = ParallelAgentExecutor(agent=RunnableLambda(plan), tools=[SleepTool()], max_parallel_tools=2)
+
+    started = time.monotonic()
+    result = executor.invoke({"input": "sleep twice"})
+
+    assert result["output"] == "slept 0.5, slept 0.6"
+    assert time.monotonic() - started < 1.0
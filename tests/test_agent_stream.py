@@ -0,0 +1,81 @@
+import threading
+import pytest
+from langchain_core.agents import AgentAction
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from src.agent_stream import AgentStream, REACT_ANSWER_PREFIXES
+
+
+def test_streams_only_text_after_answer_prefix():
+    model = GenericFakeChatModel(messages=iter([AIMessage(content="Thought: Do I need to use a tool? No\nAI: It is sunny today.")]))
+    stream = AgentStream(prefixes=REACT_ANSWER_PREFIXES)
+
+    tokens = list(stream.run(lambda callbacks: model.invoke("weather?", config={"callbacks": callbacks}, stream=True)))
+
+    assert "".join(tokens) == "It is sunny today."
+    assert len(tokens) > 1
+
+
+def test_reports_steps_and_falls_back_to_whole_output():
+    steps = []
+    stream = AgentStream(prefixes=REACT_ANSWER_PREFIXES, on_step=steps.append)
+
+    def invoke(callbacks):
+        callbacks[0].on_agent_action(AgentAction(tool="weather", tool_input="today", log=""))
+        return {"output": "Sunny"}
+
+    assert list(stream.run(invoke)) == [{"output": "Sunny"}]
+    assert steps == ["-> weather(today)"]
+
+
+def test_agent_errors_are_raised_in_caller():
+    def invoke(callbacks):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        list(AgentStream(prefixes=[""]).run(invoke))
+
+
+def turn(handler: AgentStream, text: str, tool_calls: list) -> None:
+    handler.on_llm_start({}, [])
+    for call in tool_calls:
+        chunk = AIMessageChunk(content="", tool_call_chunks=[{"name": call["name"], "args": "{}", "id": call["id"], "index": 0}])
+        handler.on_llm_new_token("", chunk=ChatGenerationChunk(message=chunk))
+    for word in text.split(" "):
+        handler.on_llm_new_token(word + " ", chunk=ChatGenerationChunk(message=AIMessageChunk(content=word + " ")))
+
+
+def test_text_of_tool_calls_is_not_answer():
+    def invoke(callbacks):
+        handler = callbacks[0]
+        turn(handler, "Checking the weather.", [{"name": "weather", "id": "1"}])
+        handler.on_agent_action(AgentAction(tool="weather", tool_input="today", log=""))
+        turn(handler, "It is sunny.", [])
+        return {"output": "It is sunny."}
+
+    steps = []
+    stream = AgentStream(prefixes=[""], on_step=steps.append)
+    tokens = list(stream.run(invoke))
+
+    assert "".join(tokens).strip() == "It is sunny."
+    assert len(tokens) > 1
+    assert steps == ["-> weather(today)"]
+
+
+def test_tool_calling_answer_is_streamed_before_llm_ends():
+    stream = AgentStream(prefixes=[""])
+    first_token = threading.Event()
+
+    def invoke(callbacks):
+        handler = callbacks[0]
+        turn(handler, "It is sunny.", [])
+        # consumer gets tokens while LLM call is still running, before on_llm_end
+        assert first_token.wait(timeout=5)
+        return {"output": "It is sunny."}
+
+    tokens = []
+    for token in stream.run(invoke):
+        tokens.append(token)
+        first_token.set()
+    assert "".join(tokens).strip() == "It is sunny."
@@ -0,0 +1,23 @@
+import icalendar
+import pytest
+from benchmarks.ics_generator import CalendarSpec, generate_ics
+from benchmarks.calendar_benchmark import run
+
+
+def test_generated_calendar_parses():
+    spec = CalendarSpec(events=50, rrule_ratio=0.5, attendees=2, timezones=["UTC", "Europe/Riga"])
+    ics = generate_ics(spec, name="work")
+    assert ics == generate_ics(spec, name="work")
+    events = icalendar.Calendar.from_ical(ics).walk("VEVENT")
+    assert len(events) == 50
+    assert any("RRULE" in event for event in events)
+
+
+@pytest.mark.parametrize("parse_workers", [1, 2])
+def test_benchmark_reports_cold_warm_and_hot_runs(parse_workers):
+    result = run(CalendarSpec(events=30, span_days=14), calendars=2, repeat=1, parse_workers=parse_workers)
+    assert set(result) == {"generate_seconds", "cold", "warm", "hot"}
+    assert "save_cache" in result["cold"] and "load_cache" not in result["hot"]
+    assert result["cold"]["get_events"] >= result["cold"]["load_calendar_events"]
+    assert result["cold"]["events"] == result["warm"]["events"] == result["hot"]["events"]
+    assert result["hot"]["tool_today"] >= 0
@@ -0,0 +1,82 @@
+import time
+import unittest
+from unittest.mock import patch
+import pyperclip
+from src.clipboard import ClipboardWatcher
+
+
+class TestClipboardWatcher(unittest.TestCase):
+    def test_paste_is_served_from_snapshot(self):
+        with patch('pyperclip.paste', return_value="copied text") as mock_paste:
+            watcher = ClipboardWatcher(poll_interval=60)
+            self.assertEqual(watcher.paste(), "copied text")
+            self.assertEqual(watcher.paste(), "copied text")
+            self.assertEqual(mock_paste.call_count, 1)
+            self.assertEqual(watcher.generation, 1)
+            watcher.stop()
+
+    def test_generation_changes_only_with_content(self):
+        watcher = ClipboardWatcher(poll_interval=60)
+        with patch('pyperclip.paste', side_effect=["a", "a", "b"]):
+            watcher._refresh()
+            watcher._refresh()
+            self.assertEqual(watcher.generation, 1)
+            watcher._refresh()
+            self.assertEqual(watcher.generation, 2)
+
+    def test_sequence_counter_skips_reads(self):
+        watcher = ClipboardWatcher(poll_interval=60)
+        watcher._sequence = lambda: 7
+        with patch('pyperclip.paste', return_value="a") as mock_paste:
+            watcher._refresh()
+            watcher._refresh()
+            self.assertEqual(mock_paste.call_count, 1)
+
+    def test_fresh_read_bypasses_stale_snapshot(self):
+        watcher = ClipboardWatcher(poll_interval=60)
+        with patch('pyperclip.paste', side_effect=["old", "new"]) as mock_paste:
+            self.assertEqual(watcher.paste(), "old")
+            self.assertEqual(watcher.paste(), "old")
+            self.assertEqual(watcher.paste(fresh=True), "new")
+            self.assertEqual(mock_paste.call_count, 2)
+
+    def test_watcher_backs_off_and_retries_after_errors(self):
+        calls = []
+
+        def paste():
+            calls.append(1)
+            if len(calls) < 3:
+                raise pyperclip.PyperclipException("busy")
+            return "back"
+
+        with patch('pyperclip.paste', side_effect=paste):
+            watcher = ClipboardWatcher(poll_interval=0.01, max_backoff=0.05)
+            watcher.start()
+            for _ in range(200):
+                if watcher.generation:
+                    break
+                time.sleep(0.01)
+            watcher.stop()
+        self.assertEqual(watcher.generation, 1)
+        self.assertEqual(watcher.paste(), "back")
+
+    def test_paused_watcher_does_not_poll(self):
+        with patch('pyperclip.paste', return_value="a") as mock_paste:
+            watcher = ClipboardWatcher(poll_interval=0.01)
+            watcher.start()
+            watcher.pause()
+            time.sleep(0.05)
+            calls = mock_paste.call_count
+            time.sleep(0.05)
+            self.assertEqual(mock_paste.call_count, calls)
+            watcher.stop()
+
+    def test_unavailable_clipboard_raises(self):
+        with patch('pyperclip.paste', side_effect=pyperclip.PyperclipException("no clipboard")):
+            watcher = ClipboardWatcher(poll_interval=60)
+            with self.assertRaises(pyperclip.PyperclipException):
+                watcher.paste()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import json
+import time
+import httpx
+from concurrent.futures import ThreadPoolExecutor
+from src.deadline import Deadline
+from src.http_client import HttpClient
+from src.llm_provider import DeadlineTimeout, LanguageModelProvider
+from src.tools.executor import IsolatedTool, ToolExecutor
+from tests.test_tools import SlowTool
+from tests.test_llm_agent import agent, state  # noqa: F401 fixtures
+
+
+def test_unbounded_outside_of_turn():
+    deadline = Deadline.current()
+    assert not deadline.is_bounded
+    assert deadline.cap(10) == 10
+    assert not deadline.degraded
+
+
+def test_cap_and_degrade():
+    with Deadline.start(seconds=3, degrade_seconds=5) as deadline:
+        assert Deadline.current() is deadline
+        assert deadline.cap(10) <= 3
+        assert deadline.cap(1) == 1
+        assert deadline.cap(None) <= 3
+        assert deadline.degraded
+        assert not deadline.expired
+    assert not Deadline.current().is_bounded
+
+
+def test_bind_carries_deadline_to_threads():
+    with Deadline.start(seconds=30) as deadline:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(Deadline.bind(Deadline.current)).result() is deadline
+            assert pool.submit(Deadline.current).result() is not deadline
+
+
+def test_tool_timeout_is_capped_by_deadline():
+    tool = IsolatedTool.wrap(SlowTool(), executor=ToolExecutor(max_workers=1), timeout=60)
+    with Deadline.start(seconds=0.3):
+        started = time.monotonic()
+        assert json.loads(tool.run("5"))["error"] == "timeout"
+    assert time.monotonic() - started < 2
+
+
+def test_http_timeouts_are_capped_by_deadline():
+    http = HttpClient(timeout=10, connect_timeout=3)
+    assert http.timeout_for("http://example.com") == (3, 10)
+    with Deadline.start(seconds=1):
+        connect, read = http.timeout_for("http://example.com")
+        assert connect <= 1 and read <= 1
+
+
+def test_llm_request_timeout_is_capped_by_deadline(state):
+    state.config.api_keys["openai"] = "test"
+    model = LanguageModelProvider(config=state.config, state=state).create_model(state.llm_model_options, 0.0)
+    assert httpx.Timeout(model.root_client.timeout).read == 600
+    with Deadline.start(seconds=2):
+        timeout = httpx.Timeout(model.root_client.timeout)
+        assert timeout.read <= 2 and timeout.connect <= 2
+    assert DeadlineTimeout(30, connect=5).connect == 5
+
+
+def test_anthropic_model_is_built_for_deadline_length(state):
+    state.config.api_keys["anthropic"] = "test"
+    options = state.llm_model_options.model_copy(update={"provider": "anthropic", "model": "claude-3-5-haiku-latest"})
+    provider = LanguageModelProvider(config=state.config, state=state)
+    assert provider.create_model(options, 0.0).default_request_timeout == 600
+    with Deadline.start(seconds=20):
+        assert provider.create_model(options, 0.0).default_request_timeout == 20
+
+
+def test_models_are_rebuilt_when_deadline_length_changes(agent):
+    with Deadline.start(seconds=20):
+        agent.reload()
+        first = agent.model
+    with Deadline.start(seconds=20):
+        agent.reload()
+        assert agent.model is first
+    with Deadline.start(seconds=60):
+        agent.reload()
+        assert agent.model is not first
+
+
+def test_streamed_answer_stops_at_deadline(agent):
+    def tokens():
+        while True:
+            time.sleep(0.05)
+            yield "token "
+
+    with Deadline.start(seconds=0.3) as deadline:
+        started = time.monotonic()
+        streamed = list(agent._until_deadline(tokens(), deadline))
+    assert streamed
+    assert time.monotonic() - started < 1
+
+
+def test_agent_time_limit_is_set_on_turn_copy(agent):
+    agent.reload()
+    assert agent._turn_agent(Deadline.current()) is agent.agent
+
+    with Deadline.start(seconds=30, degrade_seconds=5) as deadline:
+        executor = agent._turn_agent(deadline)
+    assert executor is not agent.agent
+    assert 0 < executor.max_execution_time <= 25
+    assert executor.memory is agent.agent.memory
+    assert agent.agent.max_execution_time is None
@@ -1,8 +1,10 @@
 import unittest
 import os
+import tempfile
 from typing import List
+from unittest.mock import patch
 from src.state import ApplicationState
-from src.enrichers import check_text_for_phrases
+from src.enrichers import check_text_for_phrases, estimate_tokens, LocalDirectory
 from src.config import Configuration
 from src.settings import Settings
 from src.app import App
@@ -36,5 +38,88 @@ class TestCheckTextForPhrases(unittest.TestCase):
             self.assertEqual(found, case["expected"])
 
 
+class TestLocalDirectory(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = self.temp_dir.name
+        self._write("weather.py", "def weather():\n    return 'sunny weather'\n")
+        self._write("calendar.py", "def events():\n    return []\n" * 50)
+        self._write("node_modules/lib.js", "weather weather weather")
+        self._write(".gitignore", "secret.txt\n")
+        self._write("secret.txt", "weather password")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relative_path: str, content: str):
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(content)
+
+    def test_directory_is_ranked_and_ignored(self):
+        enricher = LocalDirectory(ignore=["node_modules"])
+        found, question = enricher.parse(f"explain weather in {self.root}")
+        self.assertTrue(found)
+        self.assertIn("## File: weather.py", question)
+        self.assertNotIn("lib.js", question)
+        self.assertNotIn("## File: secret.txt", question)
+        self.assertLess(question.index("weather.py"), question.index("calendar.py"))
+
+    def test_token_budget(self):
+        enricher = LocalDirectory(token_budget=60)
+        found, question = enricher.parse(f"explain weather in {self.root}")
+        self.assertTrue(found)
+        self.assertIn("weather.py", question)
+        self.assertNotIn("calendar.py", question)
+        self.assertIn("omitted", question)
+
+    def test_glob(self):
+        enricher = LocalDirectory()
+        found, question = enricher.parse(f"explain {self.root}/*.py")
+        self.assertTrue(found)
+        self.assertIn("weather.py", question)
+        self.assertNotIn("## File: secret.txt", question)
+
+    def test_unchanged_files_are_cached(self):
+        enricher = LocalDirectory()
+        enricher.parse(f"explain {self.root}")
+        cached = dict(enricher._stats)
+        with patch("builtins.open", wraps=open) as opened:
+            found, question = enricher.parse(f"explain {self.root}")
+        read = [call.args[0] for call in opened.call_args_list if call.args[1:] == ("rb",)]
+        self.assertTrue(found)
+        self.assertIn("weather.py", question)
+        self.assertEqual(read, [])
+        self.assertEqual(cached, dict(enricher._stats))
+
+        self._write("weather.py", "def weather():\n    return 'rainy weather'\n")
+        with patch("builtins.open", wraps=open) as opened:
+            enricher.parse(f"explain {self.root}")
+        read = [call.args[0] for call in opened.call_args_list if call.args[1:] == ("rb",)]
+        self.assertEqual(read, [os.path.join(self.root, "weather.py")])
+
+    def test_cache_is_bounded(self):
+        enricher = LocalDirectory(max_cached_files=2)
+        enricher.parse(f"explain {self.root}")
+        self.assertLessEqual(len(enricher._contents), 2)
+        self.assertLessEqual(len(enricher._stats), 2)
+
+    def test_roots_and_sentence_punctuation(self):
+        enricher = LocalDirectory()
+        with patch.object(LocalDirectory, "find_files") as find_files:
+            for question in ["what is 10 / 2 in these files", "list files in /", f"files in {os.path.expanduser('~')}", "files /*"]:
+                self.assertEqual(enricher.parse(question), (False, question))
+            find_files.assert_not_called()
+
+        found, question = enricher.parse(f"what is in {self.root}.")
+        self.assertTrue(found)
+        self.assertIn("weather.py", question)
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("abcde"), 2)
+
+
 if __name__ == '__main__':
     unittest.main()
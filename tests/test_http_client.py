@@ -0,0 +1,52 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.http_client import HttpClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    requests_count = 0
+
+    def do_GET(self):
+        FlakyHandler.requests_count += 1
+        status = 503 if FlakyHandler.requests_count == 1 else 200
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpClient(unittest.TestCase):
+    def setUp(self):
+        FlakyHandler.requests_count = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retries_server_errors(self):
+        client = HttpClient(retries=2, backoff_factor=0)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(FlakyHandler.requests_count, 2)
+
+    def test_async_get(self):
+        client = HttpClient(retries=2, backoff_factor=0)
+        response = asyncio.run(client.aget(self.url))
+        self.assertEqual(response.text, "ok")
+
+    def test_host_timeouts(self):
+        client = HttpClient(timeout=10, connect_timeout=1, host_timeouts={"wttr.in": 3})
+        self.assertEqual(client.timeout_for("https://wttr.in/Berlin?format=j1"), (1, 3))
+        self.assertEqual(client.timeout_for("https://example.com/"), (1, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import Mock
+from langchain_openai import ChatOpenAI
+from src.config import Configuration
+from src.llm_agent import LargeLanguageModelAgent
+from src.settings import Settings
+from src.state import ApplicationState
+from src.tools.datetime import TimeTool
+
+
+@pytest.fixture
+def state() -> ApplicationState:
+    settings = Settings(
+        agent={"prompts": []},
+        user={"location": "Riga"},
+        phrases={phrase: [] for phrase in ["exit", "with_tools", "no_tools", "run_once", "clear_memory", "quiet", "verbose"]},
+        models={"first": {"provider": "openai", "model": "gpt-4o"}, "second": {"provider": "openai", "model": "gpt-4o-mini"}},
+        io_input={"text": {"provider": "text"}},
+        io_output={"write": {"provider": "text"}},
+        prompts={},
+        history={"enabled": False},
+    )
+    return ApplicationState(Configuration(settings))
+
+
+@pytest.fixture
+def agent(state) -> LargeLanguageModelAgent:
+    provider = Mock()
+    provider.get_model.side_effect = lambda: ChatOpenAI(api_key="test", model=state.llm_model_options.model)
+    tool_loader = Mock()
+    tool_loader.get_tools.return_value = [TimeTool()]
+    return LargeLanguageModelAgent(config=state.config, state=state, function_provider=tool_loader, provider=provider)
+
+
+def test_agent_hash_ignores_io_and_verbosity(state):
+    agent_hash = state.get_agent_hash()
+    state.is_quiet = True
+    state.set_output_model("speak")
+    state.is_hotkey_enabled = False
+    assert state.get_agent_hash() == agent_hash
+
+    state.set_llm_model("second")
+    assert state.get_agent_hash() != agent_hash
+
+
+def test_built_agents_and_models_are_reused(agent, state):
+    agent.reload()
+    first = agent.agent
+
+    state.set_llm_model("second")
+    agent.reload()
+    assert agent.agent is not first
+
+    state.set_llm_model("first")
+    agent.reload()
+    assert agent.agent is first
+    assert agent.llm_provider.get_model.call_count == 2
+
+
+def test_verbosity_is_applied_without_rebuild(agent, state):
+    state.config.settings.agent.verbose = True
+    agent.reload()
+    executor = agent.agent
+    assert executor.verbose
+
+    state.is_quiet = True
+    agent.apply_verbosity()
+    assert agent.agent is executor
+    assert not executor.verbose
+    assert not executor.return_intermediate_steps
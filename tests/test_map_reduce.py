@@ -0,0 +1,54 @@
+import io
+import pytest
+from langchain_core.runnables import RunnableLambda
+from src.map_reduce import MapReduce, TextChunker
+
+
+def test_small_input_is_single_chunk():
+    chunker = TextChunker(chunk_tokens=100, overlap_tokens=10)
+    lines = ["line one\n", "line two\n"]
+    assert list(chunker.chunks(lines)) == ["line one\nline two\n"]
+
+
+def test_chunks_overlap_and_cover_input():
+    chunker = TextChunker(chunk_tokens=10, overlap_tokens=3)
+    lines = [f"line {i:03}\n" for i in range(20)]
+    chunks = list(chunker.chunks(iter(lines)))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.splitlines()[0] in previous
+    assert all(any(line in chunk for chunk in chunks) for line in lines)
+
+
+def test_long_line_is_split():
+    chunker = TextChunker(chunk_tokens=5, overlap_tokens=1)
+    chunks = list(chunker.chunks(["x" * 50]))
+    assert "".join(chunks) == "x" * 50
+
+
+def test_invalid_overlap():
+    with pytest.raises(ValueError):
+        TextChunker(chunk_tokens=10, overlap_tokens=10)
+
+
+def test_map_reduce_is_hierarchical():
+    prompts = []
+
+    def model(prompt: str) -> str:
+        prompts.append(prompt)
+        return "partial" if prompt.startswith("You are given part") else "combined"
+
+    progress = io.StringIO()
+    map_reduce = MapReduce(model=RunnableLambda(model), max_workers=2, reduce_batch=2, progress=progress)
+    answer = map_reduce.run(question="summarize", chunks=iter(["a", "b", "c", "d", "e"]))
+
+    assert answer == "combined"
+    map_prompts = [prompt for prompt in prompts if prompt.startswith("You are given part")]
+    assert len(map_prompts) == 5
+    # 5 -> 3 -> 2 -> 1
+    assert len(prompts) - len(map_prompts) == 6
+    assert "Processed 5/5 chunks" in progress.getvalue()
+    denominators = {line.split("/")[1] for line in progress.getvalue().splitlines() if line.startswith("Processed") and "/" in line}
+    assert denominators == {"5 chunks"}
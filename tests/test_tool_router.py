@@ -0,0 +1,90 @@
+from src.tool_router import ToolNeedClassifier, ToolRouter, terms
+from src.tools.datetime import TimeTool
+from src.tools.my_calendar import CalendarEventTool
+from src.tools.news import NewsRetrievalTool
+from src.tools.state import EndConversation, SetToolUsage, SwitchModel, RetrieveModels, ResetChat
+from src.tools.weather import WeatherTool
+
+
+class FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0] if "umbrella" in text or "weather" in text else [0.0, 1.0]
+
+
+def all_tools():
+    return [
+        EndConversation(), SetToolUsage(), SwitchModel(), RetrieveModels(), ResetChat(),
+        TimeTool(), WeatherTool(), CalendarEventTool(), NewsRetrievalTool(bing_search_url="", subscription_key=""),
+    ]
+
+
+def test_terms():
+    assert terms("What's the weather in Riga tomorrow?") == ["weather", "riga", "tomorrow"]
+    assert terms("switch_model") == ["switch", "model"]
+
+
+def test_select_keeps_relevant_tools_and_always_included():
+    router = ToolRouter(top_k=2, always=["end_conversation"])
+
+    names = [tool.name for tool in router.select("will it be warm weather tomorrow?", all_tools())]
+    assert "weather" in names
+    assert "end_conversation" in names
+    assert len(names) <= 3
+
+    names = [tool.name for tool in router.select("switch model to gpt4", all_tools())]
+    assert "switch_model" in names
+
+
+def test_select_keeps_all_tools_when_nothing_matches():
+    router = ToolRouter(top_k=2)
+    tools = all_tools()
+    assert router.select("xyzzy", tools) == tools
+
+
+def test_embeddings_add_to_keyword_score():
+    router = ToolRouter(top_k=1, embeddings=FakeEmbeddings)
+    names = [tool.name for tool in router.select("do I need an umbrella", all_tools())]
+    assert names == ["weather"]
+
+
+def test_failing_embeddings_fall_back_to_keywords():
+    def broken():
+        raise ConnectionError("no embedding server")
+
+    router = ToolRouter(top_k=1, embeddings=broken)
+    names = [tool.name for tool in router.select("latest news", all_tools())]
+    assert names == ["get_news"]
+
+
+class FakeModel:
+    def __init__(self, answer):
+        self.answer = answer
+        self.questions = []
+
+    def invoke(self, prompt):
+        self.questions.append(prompt)
+        return self.answer
+
+
+def test_tool_free_questions_skip_agent():
+    classifier = ToolNeedClassifier(router=ToolRouter(), phrases=["look up"])
+
+    assert not classifier.needs_tools("tell me a joke", all_tools())
+    assert classifier.needs_tools("what is the weather tomorrow", all_tools())
+    assert classifier.needs_tools("please look up this", all_tools())
+    assert not classifier.needs_tools("what is the weather tomorrow", [])
+
+
+def test_small_model_decides_unclear_questions():
+    model = FakeModel("Yes.")
+    classifier = ToolNeedClassifier(router=ToolRouter(), model=lambda: model)
+
+    assert classifier.needs_tools("do I need a jacket", all_tools())
+    assert "do I need a jacket" in model.questions[0]
+
+    model.answer = "no"
+    assert not classifier.needs_tools("tell me a joke", all_tools())
+    assert len(model.questions) == 2
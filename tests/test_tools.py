@@ -0,0 +1,258 @@
+import asyncio
+import json
+import time
+import pytest
+import subprocess
+import sys
+import threading
+from datetime import date
+from typing import Optional
+from unittest.mock import Mock, patch
+from langchain_core.tools import BaseTool, ToolException
+from src.tools.lazy import LazyTool
+from src.tools.cache import CachedTool, ToolResultCache, cache_key, is_cacheable, normalize_input
+from src.tools.executor import IsolatedTool, ToolExecutor
+from src.tools.prefetch import DEFAULT_PREFETCH_RULES, PrefetchedTool, PrefetchRule, ToolPrefetcher
+from src.tools.state import EndConversation
+from src.tools.datetime import TimeTool
+from src.tools.storygen import MakeStorygenStory
+from src.state import ApplicationState
+
+
+class EchoTool(BaseTool):
+    name: str = "echo"
+    description: str = "Echoes input."
+    calls: int = 0
+
+    def _run(self, text: Optional[str] = "", run_manager=None) -> str:
+        self.calls += 1
+        return f"echo {text}"
+
+
+def test_lazy_tool_builds_on_first_call():
+    built = []
+
+    def factory() -> BaseTool:
+        built.append(True)
+        return EchoTool()
+
+    tool = LazyTool.of(EchoTool, factory)
+    assert tool.name == "echo"
+    assert tool.description == "Echoes input."
+    assert not tool.is_loaded
+    assert built == []
+
+    assert tool.run("a") == "echo a"
+    assert asyncio.run(tool.arun("b")) == "echo b"
+    assert tool.is_loaded
+    assert len(built) == 1
+
+
+def test_lazy_tool_unavailable():
+    tool = LazyTool(name="missing", description="Missing tool.", factory=lambda: None)
+    with pytest.raises(ToolException):
+        tool.run("a")
+
+
+def test_lazy_tool_factory_error_is_tool_error():
+    def factory() -> BaseTool:
+        raise ValueError("WOLFRAM_ALPHA_APPID missing")
+
+    tool = LazyTool(name="broken", description="Broken tool.", factory=factory)
+    with pytest.raises(ToolException, match="WOLFRAM_ALPHA_APPID missing"):
+        tool.run("a")
+
+    isolated = IsolatedTool.wrap(tool, executor=ToolExecutor(max_workers=1), timeout=5)
+    error = json.loads(isolated.run("a"))
+    assert error["error"] == "unavailable"
+    assert "WOLFRAM_ALPHA_APPID missing" in error["message"]
+
+
+def test_tool_stubs_do_not_import_calendar_libraries():
+    code = (
+        "import sys; from src.tool_loader import ToolLoader; from src.tools import my_calendar, weather; "
+        "print(sorted(m for m in ('icalendar', 'recurring_ical_events', 'numpy') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_normalize_input():
+    assert normalize_input(" today ") == "today"
+    assert normalize_input({"tool_input": "New  York"}) == "New York"
+    assert normalize_input("Apple") != normalize_input("apple")
+    assert normalize_input(None) == ""
+    assert normalize_input({"b": "X", "a": "y"}) == '{"a": "y", "b": "X"}'
+
+
+def test_relative_inputs_are_keyed_by_day():
+    with patch("src.pkg.dates.today", return_value=date(2030, 1, 9)):
+        assert cache_key("tomorrow") == "tomorrow@2030-01-09"
+        assert cache_key(None) == "@2030-01-09"
+        assert cache_key("next friday") == "next friday@2030-01-09"
+        assert cache_key("2030-01-10") == "2030-01-10"
+        assert cache_key("python asyncio") == "python asyncio"
+    with patch("src.pkg.dates.today", return_value=date(2030, 1, 10)):
+        assert cache_key("tomorrow") == "tomorrow@2030-01-10"
+
+
+def test_errors_and_empty_results_are_not_cached():
+    results = iter(["", json.dumps({"error": "timeout"}), "[]", "sunny"])
+    tool = CachedTool.wrap(EchoTool(), ToolResultCache(ttl=60))
+    tool.tool = Mock(spec=BaseTool)
+    tool.tool.run.side_effect = lambda *args, **kwargs: next(results)
+
+    assert [tool.run("2030-01-10") for _ in range(5)] == ["", '{"error": "timeout"}', "[]", "sunny", "sunny"]
+    assert tool.tool.run.call_count == 4
+    assert is_cacheable("sunny") and not is_cacheable(" ") and not is_cacheable('{"error": "failed"}')
+
+
+def test_cached_tool_hits_and_expiry():
+    echo = EchoTool()
+    cache = ToolResultCache(ttl=60, max_size=2)
+    tool = CachedTool.wrap(echo, cache)
+
+    assert tool.run("a") == "echo a"
+    assert tool.run(" a ") == "echo a"
+    assert echo.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+    tool.run("b")
+    tool.run("c")
+    assert cache.stats()["size"] == 2
+    tool.run("a")
+    assert echo.calls == 4
+
+
+def test_cached_tool_stale_while_revalidate():
+    echo = EchoTool()
+    cache = ToolResultCache(ttl=60, stale_ttl=60)
+    tool = CachedTool.wrap(echo, cache)
+    tool.run("a")
+
+    with patch("src.tools.cache.time.monotonic", return_value=time.monotonic() + 90):
+        assert tool.run("a") == "echo a"
+        for thread in list(tool._refresh_threads.values()):
+            thread.join()
+
+    assert echo.calls == 2
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_expired_entry_is_miss():
+    cache = ToolResultCache(ttl=1)
+    cache.set("a", "value")
+    with patch("src.tools.cache.time.monotonic", return_value=time.monotonic() + 5):
+        assert cache.get("a") == (None, False)
+
+
+def test_state_tools_run_async():
+    state = Mock(spec=ApplicationState)
+    assert asyncio.run(EndConversation(state=state).arun("now")) == "AI: Exit"
+    assert state.is_stopped is True
+    assert asyncio.run(TimeTool().arun("Berlin")).startswith("AI: ")
+
+
+def test_storygen_runs_subprocess_async():
+    tool = MakeStorygenStory()
+    with patch.object(MakeStorygenStory, "_command", return_value=["echo", "2025/04/11 20:10:11 mp3: mp3/story.mp3"]):
+        assert asyncio.run(tool.arun("dragons")) == "Story audio file created successfully in mp3/story.mp3"
+        assert tool.run("dragons") == "Story audio file created successfully in mp3/story.mp3"
+
+
+class SlowTool(BaseTool):
+    name: str = "slow"
+    description: str = "Sleeps."
+
+    def _run(self, seconds: str = "0", run_manager=None) -> str:
+        time.sleep(float(seconds))
+        return "done"
+
+
+def test_isolated_tool_timeout_returns_error_observation():
+    executor = ToolExecutor(max_workers=2)
+    tool = IsolatedTool.wrap(SlowTool(), executor=executor, timeout=0.2)
+
+    assert tool.run("0") == "done"
+    observation = json.loads(tool.run("2"))
+    assert observation["error"] == "timeout"
+    assert observation["tool"] == "slow"
+
+    observation = json.loads(asyncio.run(tool.arun("2")))
+    assert observation["error"] == "timeout"
+    executor.shutdown()
+
+
+def test_abandoned_call_does_not_hold_worker():
+    executor = ToolExecutor(max_workers=1)
+    tool = IsolatedTool.wrap(SlowTool(), executor=executor, timeout=0.2)
+
+    assert json.loads(tool.run("1"))["error"] == "timeout"
+    assert executor.abandoned == 1
+    started = time.monotonic()
+    assert tool.run("0") == "done"
+    assert time.monotonic() - started < 0.5
+    executor.shutdown()
+
+
+def test_inline_tools_are_not_wrapped():
+    echo = EchoTool()
+    assert IsolatedTool.wrap(echo, executor=ToolExecutor(max_workers=1), timeout=1, isolation="inline") is echo
+    with pytest.raises(ValueError):
+        IsolatedTool.wrap(echo, executor=ToolExecutor(max_workers=1), timeout=1, isolation="fork")
+
+
+def test_process_isolation_kills_worker():
+    executor = ToolExecutor(max_workers=1)
+    # spawned worker starts a fresh interpreter, first call has time for that
+    tool = IsolatedTool.wrap(SlowTool(), executor=executor, timeout=60, isolation="process")
+
+    assert tool.run("0") == "done"
+    tool.timeout = 3
+    started = time.monotonic()
+    assert json.loads(tool.run("30"))["error"] == "timeout"
+    assert time.monotonic() - started < 10
+
+
+def test_unpicklable_tool_can_not_run_in_process():
+    echo = EchoTool()
+    assert IsolatedTool.can_run_in_process(echo)
+    echo.metadata = {"lock": threading.Lock()}
+    assert not IsolatedTool.can_run_in_process(echo)
+    assert not IsolatedTool.can_run_in_process(LazyTool.of(EchoTool, lambda: echo))
+
+    def broken():
+        raise ImportError("no module")
+
+    # not available tool keeps process isolation, its calls report the error
+    assert IsolatedTool.can_run_in_process(LazyTool.of(EchoTool, broken))
+
+
+def test_prefetched_result_is_served_to_agent_call():
+    echo = EchoTool()
+    rules = [PrefetchRule(tool="echo", phrases={"weather"}, input="today", aliases={"now"}, input_phrases={"tomorrow": "tomorrow"})]
+    prefetcher = ToolPrefetcher(rules=rules)
+    tool = PrefetchedTool.wrap(echo, prefetcher)
+
+    assert prefetcher.prefetch("What is the weather?", [echo]) == ["echo(today)"]
+    assert tool.run("Now") == "echo today"
+    assert echo.calls == 1
+    # prefetched result is used only once
+    assert tool.run("today") == "echo today"
+    assert echo.calls == 2
+
+    assert prefetcher.prefetch("weather tomorrow", [echo]) == ["echo(tomorrow)"]
+    # different input is not answered with prefetched result
+    assert tool.run("today") == "echo today"
+    assert prefetcher.prefetch("tell me a joke", [echo]) == []
+
+
+def test_calendar_prefetch_needs_calendar_words():
+    calendar = Mock(spec=BaseTool)
+    calendar.name = "calendar_events"
+    prefetcher = ToolPrefetcher(rules=DEFAULT_PREFETCH_RULES)
+
+    assert prefetcher.prefetch("What should I cook today?", [calendar]) == []
+    assert prefetcher.prefetch("Any news for tomorrow?", [calendar]) == []
+    assert prefetcher.prefetch("Do I have meetings tomorrow?", [calendar]) == ["calendar_events(tomorrow)"]